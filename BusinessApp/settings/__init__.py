@@ -0,0 +1,25 @@
+"""
+Django settings for BusinessApp project.
+
+DJANGO_SETTINGS_MODULE=BusinessApp.settings.dev or BusinessApp.settings.prod
+selects the profile directly. With DJANGO_SETTINGS_MODULE=BusinessApp.settings,
+DJANGO_PROFILE selects it instead: "dev" (default) or "prod". Both build on
+BusinessApp.settings.base.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "")
+if settings_module.startswith(f"{__name__}."):
+    DJANGO_PROFILE = settings_module.removeprefix(f"{__name__}.")
+else:
+    DJANGO_PROFILE = os.environ.get("DJANGO_PROFILE", "dev")
+
+if DJANGO_PROFILE == "dev":
+    from BusinessApp.settings.dev import *  # noqa: F401, F403
+elif DJANGO_PROFILE == "prod":
+    from BusinessApp.settings.prod import *  # noqa: F401, F403
+else:
+    raise ImproperlyConfigured(f"Unknown DJANGO_PROFILE: {DJANGO_PROFILE}")
@@ -0,0 +1,276 @@
+"""
+Django settings shared by the dev and prod profiles of BusinessApp.
+
+Generated by 'django-admin startproject' using Django 5.0.4.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.0/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.0/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ["SECRET_KEY"]
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "phonenumber_field",
+    "BusinessApp",
+    "cards",
+]
+
+MIDDLEWARE = [
+    "cards.middleware.RequestTimingMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "cards.middleware.UploadLimitMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "BusinessApp.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "cards.timing.TimedDjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "BusinessApp.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+
+DATABASES = {
+    "default": {
+        "ENGINE": "mysql.connector.django",
+        "NAME": os.environ["MYSQL_DATABASE"],
+        "USER": os.environ["MYSQL_USER"],
+        "PASSWORD": os.environ["MYSQL_PASSWORD"],
+        "HOST": os.environ["DB_HOST"],
+        "PORT": os.environ["DB_PORT"],
+        "OPTIONS": {"auth_plugin": "mysql_native_password"},
+        "TEST": {"NAME": "mysql_test"},
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.0/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.0/howto/static-files/
+
+STATIC_URL = "static/"
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+
+MEDIA_URL = "media/"
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+WHITELISTED_IMAGE_TYPES = {
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+    "png": "image/png",
+}
+
+WHITELISTED_VCARD_TYPES = {
+    "vcf": "text/vcard",
+}
+
+AUTH_USER_MODEL = "cards.CustomUser"
+
+DOMAIN = os.environ["DOMAIN"]
+
+CEREMEO_URL = os.environ["CEREMEO_URL"]
+
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get("SESSION_MODE", "db")]
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+CEREMEO_OUTBOX_BATCH_SIZE = int(os.environ.get("CEREMEO_OUTBOX_BATCH_SIZE", 50))
+CEREMEO_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("CEREMEO_OUTBOX_MAX_ATTEMPTS", 8))
+CEREMEO_OUTBOX_RETRY_BACKOFF = int(os.environ.get("CEREMEO_OUTBOX_RETRY_BACKOFF", 30))
+CEREMEO_OUTBOX_LEASE = int(os.environ.get("CEREMEO_OUTBOX_LEASE", 60))
+
+CEREMEO_CONNECT_TIMEOUT = float(os.environ.get("CEREMEO_CONNECT_TIMEOUT", 3.05))
+CEREMEO_READ_TIMEOUT = float(os.environ.get("CEREMEO_READ_TIMEOUT", 10))
+CEREMEO_POOL_CONNECTIONS = int(os.environ.get("CEREMEO_POOL_CONNECTIONS", 4))
+CEREMEO_POOL_MAXSIZE = int(os.environ.get("CEREMEO_POOL_MAXSIZE", 16))
+CEREMEO_MAX_RETRIES = int(os.environ.get("CEREMEO_MAX_RETRIES", 3))
+CEREMEO_RETRY_BACKOFF = float(os.environ.get("CEREMEO_RETRY_BACKOFF", 0.5))
+CEREMEO_RETRY_STATUSES = (429, 503)
+
+CEREMEO_CIRCUIT_FAILURE_THRESHOLD = int(
+    os.environ.get("CEREMEO_CIRCUIT_FAILURE_THRESHOLD", 5)
+)
+CEREMEO_CIRCUIT_RESET_TIMEOUT = int(os.environ.get("CEREMEO_CIRCUIT_RESET_TIMEOUT", 30))
+CEREMEO_STATS_WINDOW = int(os.environ.get("CEREMEO_STATS_WINDOW", 300))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+CEREMEO_BULK_URL = os.environ.get("CEREMEO_BULK_URL")
+CEREMEO_COALESCE_WINDOW = int(os.environ.get("CEREMEO_COALESCE_WINDOW", 10))
+
+CARDS_ASYNC_FUNNEL = os.environ.get("CARDS_ASYNC_FUNNEL", "0") == "1"
+
+CARDS_THUMBNAIL_SIZES = (96, 192, 384)
+CARDS_THUMBNAIL_FORMATS = {"jpeg": "jpg", "webp": "webp"}
+CARDS_THUMBNAIL_QUALITY = 85
+
+CARDS_IMAGE_EXECUTOR_WORKERS = int(os.environ.get("CARDS_IMAGE_EXECUTOR_WORKERS", 0))
+CARDS_IMAGE_EXECUTOR_MAX_PENDING = int(
+    os.environ.get("CARDS_IMAGE_EXECUTOR_MAX_PENDING", 2 * CARDS_IMAGE_EXECUTOR_WORKERS)
+)
+CARDS_IMAGE_EXECUTOR_TIMEOUT = float(os.environ.get("CARDS_IMAGE_EXECUTOR_TIMEOUT", 30))
+CARDS_IMAGE_EXECUTOR_RETRY_AFTER = int(
+    os.environ.get("CARDS_IMAGE_EXECUTOR_RETRY_AFTER", 5)
+)
+
+CARDS_QR_CACHE_TIMEOUT = int(
+    os.environ.get("CARDS_QR_CACHE_TIMEOUT", 60 * 60 * 24 * 30)
+)
+CARDS_QR_MAX_AGE = int(os.environ.get("CARDS_QR_MAX_AGE", 60 * 60 * 24 * 365))
+CARDS_QR_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+CARDS_QR_SIZES = (128, 256, 512, 1024)
+
+CARDS_EXPORT_FORMATS = {
+    "vcf": "text/vcard",
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+CARDS_EXPORT_CHUNK_SIZE = int(os.environ.get("CARDS_EXPORT_CHUNK_SIZE", 2000))
+
+CARDS_VCARD_MAX_AGE = int(os.environ.get("CARDS_VCARD_MAX_AGE", 60 * 60))
+CARDS_SENDFILE_BACKEND = os.environ.get("CARDS_SENDFILE_BACKEND")
+CARDS_SENDFILE_ACCEL_PREFIX = os.environ.get(
+    "CARDS_SENDFILE_ACCEL_PREFIX", "/protected/"
+)
+
+CARDS_VCARD_MAX_UPLOAD_SIZE = int(
+    os.environ.get("CARDS_VCARD_MAX_UPLOAD_SIZE", 2 * 1024 * 1024)
+)
+CARDS_VCARD_MAX_CONTACTS = int(os.environ.get("CARDS_VCARD_MAX_CONTACTS", 5000))
+
+CARDS_PHOTO_MAX_UPLOAD_SIZE = int(
+    os.environ.get("CARDS_PHOTO_MAX_UPLOAD_SIZE", 2 * 1024 * 1024)
+)
+CARDS_UPLOAD_FIELD_LIMITS = {
+    "user_photo": CARDS_PHOTO_MAX_UPLOAD_SIZE,
+    "vcard": CARDS_VCARD_MAX_UPLOAD_SIZE,
+}
+CARDS_UPLOAD_MAX_REQUEST_SIZE = sum(CARDS_UPLOAD_FIELD_LIMITS.values()) + 64 * 1024
+CARDS_UPLOAD_IMAGE_FIELDS = ("user_photo",)
+CARDS_UPLOAD_MAX_IMAGE_DIMENSIONS = (4096, 4096)
+
+CARDS_CARD_CACHE_TIMEOUT = int(os.environ.get("CARDS_CARD_CACHE_TIMEOUT", 5 * 60))
+CARDS_CARD_CACHE_LOCAL_TIMEOUT = float(
+    os.environ.get("CARDS_CARD_CACHE_LOCAL_TIMEOUT", 5)
+)
+CARDS_CARD_CACHE_LOCAL_SIZE = int(os.environ.get("CARDS_CARD_CACHE_LOCAL_SIZE", 1024))
+
+CARDS_FUNNEL_COOKIE_NAME = "cards_funnel"
+CARDS_FUNNEL_TOKEN_MAX_AGE = int(
+    os.environ.get("CARDS_FUNNEL_TOKEN_MAX_AGE", 60 * 60 * 24)
+)
+
+CARDS_SERVER_TIMING = os.environ.get("CARDS_SERVER_TIMING", "1") == "1"
+CARDS_METRICS_ALLOWED_IPS = [
+    ip for ip in os.environ.get("CARDS_METRICS_ALLOWED_IPS", "").split(",") if ip
+]
+CARDS_METRICS_TOKEN = os.environ.get("CARDS_METRICS_TOKEN")
+CARDS_METRICS_DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
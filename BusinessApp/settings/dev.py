@@ -0,0 +1,31 @@
+"""
+Development profile: debug mode and the Django Debug Toolbar.
+"""
+
+import os
+
+from BusinessApp.settings.base import *  # noqa: F401, F403
+from BusinessApp.settings.base import INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = os.environ.get("DEBUG", "1") != "0"
+
+INSTALLED_APPS = [*INSTALLED_APPS, "debug_toolbar"]
+
+MIDDLEWARE = [*MIDDLEWARE]
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("django.contrib.auth.middleware.AuthenticationMiddleware") + 1,
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+)
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
+
+def show_toolbar(_request) -> bool:
+    from django.conf import settings
+
+    return settings.DEBUG
+
+
+DEBUG_TOOLBAR_CONFIG = {"SHOW_TOOLBAR_CALLBACK": show_toolbar}
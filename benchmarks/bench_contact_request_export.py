@@ -0,0 +1,79 @@
+"""
+Check that the contact request export streams in flat memory.
+
+Fills a throwaway test database with received contact requests and consumes
+the export stream for each format at several table sizes, recording the
+peak Python memory while streaming. The script exits with status 1 when
+the peak grows more than --max-growth times between the smallest and the
+largest table.
+
+    python -m benchmarks.bench_contact_request_export --rows 50000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_contact_request_lookup import fill_contact_requests
+from benchmarks.common import setup_django, benchmark_database
+
+
+def consume_export(lead, export_format: str) -> dict[str, float]:
+    from cards.services import stream_contact_requests_export
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    exported_bytes = sum(
+        len(chunk)
+        for chunk in stream_contact_requests_export(
+            lead=lead, export_format=export_format
+        )
+    )
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ms": elapsed * 1000,
+        "mib": exported_bytes / 2**20,
+        "peak_kib": peak / 1024,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--max-growth", type=float, default=1.5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from BusinessApp import settings
+
+    checkpoints = sorted({min(5_000, args.rows), args.rows})
+    peaks = {export_format: [] for export_format in settings.CARDS_EXPORT_FORMATS}
+
+    with benchmark_database():
+        lead = get_user_model().objects.create(username="benchmark-lead")
+        filled = 0
+        for checkpoint in checkpoints:
+            fill_contact_requests(lead, filled, checkpoint, args.batch_size)
+            filled = checkpoint
+            for export_format in settings.CARDS_EXPORT_FORMATS:
+                result = consume_export(lead, export_format)
+                peaks[export_format].append(result["peak_kib"])
+                print(
+                    f"{checkpoint:>9,} rows {export_format:<7}"
+                    + "  ".join(f"{key}={value:10.2f}" for key, value in result.items())
+                )
+
+    growth = max(values[-1] / values[0] for values in peaks.values())
+    print(
+        f"peak memory growth {checkpoints[0]:,} -> {checkpoints[-1]:,}: {growth:.2f}x"
+    )
+    return 0 if growth <= args.max_growth else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Regression benchmark for ContactRequest phone number lookups.
+
+Fills a throwaway test database up to --rows contact requests and times the
+first-step duplicate check at several table sizes. With the
+contact_phone_lead_step_idx index the lookup time stays flat; the script
+exits with status 1 when it grows more than --max-growth times.
+
+    python -m benchmarks.bench_contact_request_lookup --rows 1000000
+"""
+
+import argparse
+import random
+import sys
+
+from benchmarks.common import setup_django, benchmark_database, measure, format_row
+
+
+def fill_contact_requests(lead, start: int, stop: int, batch_size: int) -> None:
+    from cards.models import ContactRequest
+
+    for batch_start in range(start, stop, batch_size):
+        ContactRequest.objects.bulk_create(
+            [
+                ContactRequest(
+                    lead=lead,
+                    phone_number=f"+48{500000000 + index}",
+                    form_step=index % 4 + 1,
+                )
+                for index in range(batch_start, min(batch_start + batch_size, stop))
+            ],
+            batch_size=batch_size,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.exceptions import ValidationError
+    from cards.models import ContactRequest
+    from cards.validators import validate_phone_number_for_contact_request
+
+    checkpoints = sorted({min(10_000, args.rows), min(100_000, args.rows), args.rows})
+    randomizer = random.Random(args.seed)
+    results = []
+
+    with benchmark_database():
+        lead = get_user_model().objects.create(username="benchmark-lead")
+        filled = 0
+        for checkpoint in checkpoints:
+            fill_contact_requests(lead, filled, checkpoint, args.batch_size)
+            filled = checkpoint
+
+            def lookup():
+                phone = f"+48{500000000 + randomizer.randrange(filled * 2)}"
+                try:
+                    validate_phone_number_for_contact_request(phone)
+                except ValidationError:
+                    pass
+
+            result = measure(lookup, repeat=args.lookups)
+            results.append(result)
+            print(format_row(f"{checkpoint:,} rows", result))
+
+        print(ContactRequest.objects.filter(phone_number="+48500000001").explain())
+
+    growth = results[-1]["mean_ms"] / results[0]["mean_ms"]
+    print(
+        f"lookup time growth {checkpoints[0]:,} -> {checkpoints[-1]:,}: {growth:.2f}x"
+    )
+    return 0 if growth <= args.max_growth else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
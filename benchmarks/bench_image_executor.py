@@ -0,0 +1,107 @@
+"""
+Measure card creation bursts with image work inline vs in the process pool.
+
+Each simulated request thread squares a photo, renders its thumbnails and its
+QR code, the CPU-bound part of CreateCardView.post. A probe thread meanwhile
+times a light request-sized task to show how much the burst starves the
+other request workers.
+
+    python -m benchmarks.bench_image_executor --requests 64 --threads 16 --workers 4
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from PIL import Image
+
+from benchmarks.common import setup_django
+
+
+def create_card_images(image: Image.Image, card_number: int) -> None:
+    from BusinessApp import settings
+    from cards.executors import run_cpu_bound
+    from cards.images import render_square_jpeg, render_thumbnails, render_qr_code
+
+    square_image, _ = run_cpu_bound(render_square_jpeg, image)
+    run_cpu_bound(
+        render_thumbnails,
+        square_image,
+        settings.CARDS_THUMBNAIL_SIZES,
+        tuple(settings.CARDS_THUMBNAIL_FORMATS),
+        settings.CARDS_THUMBNAIL_QUALITY,
+    )
+    run_cpu_bound(render_qr_code, f"https://example.com/card/{card_number}/")
+
+
+def light_request() -> None:
+    sum(range(20000))
+
+
+def probe(stop: threading.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        light_request()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def run_burst(args, workers: int) -> dict[str, float]:
+    from BusinessApp import settings
+    from cards.executors import get_image_executor, shutdown_image_executor
+
+    image = Image.effect_noise((args.width, args.height), 64).convert("RGB")
+    with patch.object(settings, "CARDS_IMAGE_EXECUTOR_WORKERS", workers), patch.object(
+        settings, "CARDS_IMAGE_EXECUTOR_MAX_PENDING", args.threads
+    ):
+        if get_image_executor() is not None:
+            for _ in range(workers):
+                create_card_images(image, 0)
+
+        stop, latencies = threading.Event(), []
+        probe_thread = threading.Thread(target=probe, args=(stop, latencies))
+        probe_thread.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as request_threads:
+            list(
+                request_threads.map(
+                    lambda number: create_card_images(image, number),
+                    range(args.requests),
+                )
+            )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        probe_thread.join()
+        shutdown_image_executor()
+
+    latencies.sort()
+    return {
+        "cards_per_s": args.requests / elapsed,
+        "probe_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "probe_p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=1200)
+    args = parser.parse_args()
+
+    setup_django()
+    for name, workers in [("inline", 0), (f"pool[{args.workers}]", args.workers)]:
+        result = run_burst(args, workers)
+        print(
+            f"{name:<10} cards_per_s={result['cards_per_s']:8.2f}  "
+            f"probe_p50_ms={result['probe_p50_ms']:8.3f}  "
+            f"probe_p99_ms={result['probe_p99_ms']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
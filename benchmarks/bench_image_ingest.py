@@ -0,0 +1,104 @@
+"""
+Compare CPU time and peak memory per photo upload before and after ImageIngest.
+
+The legacy path reproduces the pre-ingest pipeline: the form field opens and
+verifies the image, the format validator reads the whole upload to sniff it,
+and size validation, dimension lookup, resizing and the thumbnail source each
+reopen or decode it. The ingest path runs the current form, validators and
+services. Thumbnail resizing itself is identical in both and left out.
+
+    python -m benchmarks.bench_image_ingest --width 400 --height 600
+"""
+
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+import magic
+from PIL import Image
+
+from benchmarks.common import setup_django
+
+
+def make_upload(width: int, height: int, quality: int):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    output = BytesIO()
+    Image.effect_noise((width, height), 64).convert("RGB").save(
+        output, format="JPEG", quality=quality
+    )
+    return SimpleUploadedFile("photo.jpg", output.getvalue(), "image/jpeg")
+
+
+def legacy_pipeline(upload) -> None:
+    image = Image.open(upload)
+    image.verify()
+    upload.seek(0)
+    magic.Magic(mime=True).from_buffer(upload.read()[:2048])
+    upload.seek(0)
+    Image.open(upload).size
+    upload.seek(0)
+    width, height = Image.open(upload).size
+    upload.seek(0)
+    decoded = Image.open(upload).convert("RGB")
+    square = decoded.resize((min(width, height), min(width, height)))
+    output = BytesIO()
+    square.save(output, format="JPEG")
+    output.seek(0)
+    Image.open(output).convert("RGB")
+
+
+def ingest_pipeline(upload) -> None:
+    from django.contrib.auth import get_user_model
+    from cards.forms import IngestImageField
+    from cards.images import get_image_ingest
+    from cards.services import resize_image_to_square, get_image_dimensions
+    from cards.validators import validate_user_photo
+
+    upload = IngestImageField().to_python(upload)
+    validate_user_photo(upload)
+    width, height = get_image_dimensions(uploaded_image=upload)
+    if width != height:
+        upload = resize_image_to_square(
+            uploaded_image=upload, user=get_user_model()(username="benchmark")
+        )
+    get_image_ingest(upload).decode()
+
+
+def run(pipeline, args) -> dict[str, float]:
+    pipeline(make_upload(args.width, args.height, args.quality))
+    cpu_times, peaks = [], []
+    for _ in range(args.repeat):
+        upload = make_upload(args.width, args.height, args.quality)
+        tracemalloc.start()
+        start = time.process_time()
+        pipeline(upload)
+        cpu_times.append(time.process_time() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "cpu_ms": sum(cpu_times) / len(cpu_times) * 1000,
+        "peak_kib": max(peaks) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--width", type=int, default=400)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--quality", type=int, default=95)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    for name, pipeline in [("legacy", legacy_pipeline), ("ingest", ingest_pipeline)]:
+        result = run(pipeline, args)
+        print(
+            f"{name:<8} cpu_ms={result['cpu_ms']:8.3f}  "
+            f"peak_kib={result['peak_kib']:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
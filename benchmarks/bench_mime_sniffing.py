@@ -0,0 +1,77 @@
+"""
+Per-call latency of MIME sniffing in the upload validators.
+
+Compares building a libmagic handle per call and sniffing a slice of the
+fully read upload (the previous validators) with the cached per-process
+handle fed only the header bytes, for uploads of --size-kib KiB. Uploads
+above FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk, as Django does.
+
+    python -m benchmarks.bench_mime_sniffing --size-kib 2048
+"""
+
+import argparse
+import tracemalloc
+
+import magic
+
+from benchmarks.common import format_row, measure, setup_django
+
+
+def make_vcard_upload(size_kib: int):
+    from django.conf import settings
+    from django.core.files.uploadedfile import (
+        SimpleUploadedFile,
+        TemporaryUploadedFile,
+    )
+
+    note = b"x" * max(size_kib * 1024 - 100, 0)
+    content = (
+        b"BEGIN:VCARD\r\nVERSION:3.0\r\nN:Kowalski;Jan\r\nTEL:+48600100200\r\n"
+        b"NOTE:" + note + b"\r\nEND:VCARD\r\n"
+    )
+    if len(content) <= settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+        return SimpleUploadedFile("contact.vcf", content, "text/vcard")
+    upload = TemporaryUploadedFile("contact.vcf", "text/vcard", len(content), None)
+    upload.write(content)
+    upload.seek(0)
+    return upload
+
+
+def legacy_sniff(upload) -> str:
+    upload.seek(0)
+    content = upload.read()
+    return magic.Magic(mime=True).from_buffer(content[:2048])
+
+
+def cached_sniff(upload) -> str:
+    from cards.sniffing import read_file_header, sniff_mime_type
+
+    return sniff_mime_type(read_file_header(upload))
+
+
+def peak_kib(sniff, upload) -> float:
+    tracemalloc.start()
+    sniff(upload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-kib", type=int, default=2048)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    upload = make_vcard_upload(args.size_kib)
+    print(f"{args.size_kib} KiB upload, {args.repeat} calls")
+    for name, sniff in [("legacy", legacy_sniff), ("cached", cached_sniff)]:
+        sniff(upload)
+        result = measure(lambda: sniff(upload), args.repeat)
+        result["peak_kib"] = peak_kib(sniff, upload)
+        print(format_row(name, result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Per-request overhead of the request timing instrumentation.
+
+Times the first contact request step GET through the full middleware stack
+with RequestTimingMiddleware, the query timer and the timed template backend
+enabled, with all three switched off, and enabled again to show the noise.
+
+    python -m benchmarks.bench_request_timing --repeat 2000
+"""
+
+import argparse
+
+from benchmarks.common import benchmark_database, format_row, measure, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from cards.models import BusinessCard
+    from cards.timing import record_query
+
+    setup_test_environment()
+    untimed = override_settings(
+        MIDDLEWARE=[
+            middleware
+            for middleware in settings.MIDDLEWARE
+            if middleware != "cards.middleware.RequestTimingMiddleware"
+        ],
+        TEMPLATES=[
+            {
+                **settings.TEMPLATES[0],
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+            }
+        ],
+    )
+    with benchmark_database():
+        from django.db import connection
+
+        business_card = BusinessCard.objects.create(
+            name_and_surname="Jan Kowalski",
+            company="Firma",
+            phone_number="+48600100200",
+            email="jan@example.com",
+            user=get_user_model().objects.create(username="jan"),
+        )
+        url = reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        print(f"first step GET, {args.repeat} requests")
+        for name in ("timed", "untimed", "timed"):
+            if name == "untimed":
+                untimed.enable()
+                connection.execute_wrappers.remove(record_query)
+            client = Client()
+            client.get(url)
+            print(format_row(name, measure(lambda: client.get(url), args.repeat)))
+            if name == "untimed":
+                untimed.disable()
+                connection.execute_wrappers.append(record_query)
+
+
+if __name__ == "__main__":
+    main()
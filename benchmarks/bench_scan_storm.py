@@ -0,0 +1,272 @@
+"""
+Trade-show scan storm against the contact request funnel.
+
+Sends --visitors visitors, --concurrency at a time, through every step of
+the funnel of --hot-cards cards: the four funnel URLs are requested with GET
+and POSTed to in order, through the full middleware stack. Ceremeo is
+replaced by the local stub from run_ceremeo_stub with --ceremeo-latency and
+--ceremeo-error-rate, and an outbox drainer delivers leads to it while the
+storm runs. Reports throughput, p50/p95/p99 latency and database queries
+per funnel step (from the Server-Timing header), and the outbox state once
+the storm is over. Visitors and cards are picked from --seed.
+
+    python -m benchmarks.bench_scan_storm --visitors 2000 --concurrency 16
+"""
+
+import argparse
+import queue
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from unittest.mock import patch
+
+from benchmarks.common import benchmark_database, format_row, setup_django
+
+EXPECTED_STATUS = {"GET": 200, "POST": 302}
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def visit_funnel(
+    card_id: uuid.UUID, visitor: int
+) -> list[tuple[str, float, int, bool]]:
+    from django.db import connection
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client(raise_request_exception=False)
+    url = reverse("upload_phone_num", kwargs={"card_id": card_id})
+    posts = [
+        {"phone_number": f"+48600{visitor:06d}"},
+        {
+            "name_and_surname": "Anna Nowak",
+            "email": f"visitor{visitor}@example.com",
+            "company_or_contact_place": "Targi",
+        },
+        {"contact_topic": "Oferta"},
+        None,
+    ]
+    samples = []
+    for data in posts:
+        for method in ("GET", "POST") if data is not None else ("GET",):
+            start = time.perf_counter()
+            if method == "GET":
+                response = client.get(url)
+            else:
+                response = client.post(url, data=data)
+            duration = time.perf_counter() - start
+            queries = SERVER_TIMING_QUERIES.search(response.get("Server-Timing", ""))
+            samples.append(
+                (
+                    f"{method} {response.resolver_match.url_name}",
+                    duration,
+                    int(queries.group(1)) if queries else 0,
+                    response.status_code == EXPECTED_STATUS[method],
+                )
+            )
+            if response.status_code != EXPECTED_STATUS[method]:
+                connection.close()
+                return samples
+        if data is not None:
+            url = response.url
+    connection.close()
+    return samples
+
+
+def drain_outbox(stop: threading.Event, batch_size: int) -> Counter:
+    from django.db import DatabaseError, connection
+
+    from cards.services import deliver_pending_ceremeo_payloads
+
+    totals = Counter()
+    while True:
+        try:
+            sent, failed = deliver_pending_ceremeo_payloads(batch_size=batch_size)
+        except DatabaseError:
+            totals["drain_errors"] += 1
+            time.sleep(0.05)
+            continue
+        totals["sent"] += sent
+        totals["failed"] += failed
+        if sent + failed == 0:
+            if stop.is_set():
+                break
+            time.sleep(0.05)
+    connection.close()
+    return totals
+
+
+def summarize(
+    samples: list[tuple[str, float, int, bool]]
+) -> dict[str, dict[str, float]]:
+    durations, queries, errors = defaultdict(list), defaultdict(list), Counter()
+    for step, duration, query_count, ok in samples:
+        durations[step].append(duration)
+        queries[step].append(query_count)
+        errors[step] += not ok
+    summary = {}
+    for step, step_durations in durations.items():
+        step_durations.sort()
+        summary[step] = {
+            "count": len(step_durations),
+            "errors": errors[step],
+            "p50_ms": percentile(step_durations, 0.5) * 1000,
+            "p95_ms": percentile(step_durations, 0.95) * 1000,
+            "p99_ms": percentile(step_durations, 0.99) * 1000,
+            "mean_queries": sum(queries[step]) / len(queries[step]),
+            "max_queries": max(queries[step]),
+        }
+    return summary
+
+
+def run_scan_storm(
+    card_ids: list[uuid.UUID],
+    visitors: int,
+    concurrency: int,
+    seed: int = 0,
+    ceremeo_latency: float = 0.0,
+    ceremeo_error_rate: float = 0.0,
+    batch_size: int = 50,
+    drain_during_storm: bool = True,
+) -> dict[str, any]:
+    from BusinessApp import settings
+    from cards.management.commands.run_ceremeo_stub import build_ceremeo_stub_server
+    from cards.models import CeremeoOutbox
+
+    stub = build_ceremeo_stub_server(
+        host="127.0.0.1",
+        port=0,
+        latency=ceremeo_latency,
+        error_rate=ceremeo_error_rate,
+        seed=seed,
+    )
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    host, port = stub.server_address
+
+    rng = random.Random(seed)
+    visits = queue.Queue()
+    for visitor in range(visitors):
+        visits.put((rng.choice(card_ids), visitor))
+
+    samples = []
+
+    def visitor_worker() -> None:
+        while True:
+            try:
+                card_id, visitor = visits.get_nowait()
+            except queue.Empty:
+                return
+            samples.extend(visit_funnel(card_id=card_id, visitor=visitor))
+
+    drained = Counter()
+    stop = threading.Event()
+    with patch.multiple(
+        settings,
+        CEREMEO_URL=f"http://{host}:{port}/api/v1/lead/",
+        CEREMEO_BULK_URL=f"http://{host}:{port}/api/v1/lead/bulk/",
+        CEREMEO_COALESCE_WINDOW=0,
+    ):
+        drainer = threading.Thread(
+            target=lambda: drained.update(drain_outbox(stop, batch_size))
+        )
+        if drain_during_storm:
+            drainer.start()
+        workers = [threading.Thread(target=visitor_worker) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        if drain_during_storm:
+            drainer.join()
+        else:
+            drainer.run()
+
+    stub.shutdown()
+    stub.server_close()
+    steps = summarize(samples)
+    return {
+        "visitors": visitors,
+        "requests": len(samples),
+        "elapsed_s": elapsed,
+        "requests_per_s": len(samples) / elapsed,
+        "visitors_per_s": visitors / elapsed,
+        "errors": sum(summary["errors"] for summary in steps.values()),
+        "steps": steps,
+        "ceremeo": dict(stub.stats),
+        "drained": dict(drained),
+        "outbox": dict(Counter(CeremeoOutbox.objects.values_list("status", flat=True))),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--visitors", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hot-cards", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--ceremeo-latency", type=float, default=0.05, help="Seconds per request."
+    )
+    parser.add_argument(
+        "--ceremeo-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of Ceremeo requests answered with 503.",
+    )
+    parser.add_argument(
+        "--drain-after",
+        action="store_true",
+        help="Deliver the outbox after the storm instead of during it.",
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test.utils import setup_test_environment
+
+    from cards.models import BusinessCard
+
+    setup_test_environment()
+    with benchmark_database():
+        card_ids = [
+            BusinessCard.objects.create(
+                name_and_surname=f"Exhibitor {index}",
+                company="Firma",
+                phone_number="+48600100200",
+                email=f"exhibitor{index}@example.com",
+                user=get_user_model().objects.create(username=f"exhibitor{index}"),
+            ).id
+            for index in range(args.hot_cards)
+        ]
+        report = run_scan_storm(
+            card_ids=card_ids,
+            visitors=args.visitors,
+            concurrency=args.concurrency,
+            seed=args.seed,
+            ceremeo_latency=args.ceremeo_latency,
+            ceremeo_error_rate=args.ceremeo_error_rate,
+            drain_during_storm=not args.drain_after,
+        )
+
+    print(
+        f"{report['visitors']} visitors, {report['requests']} requests "
+        f"in {report['elapsed_s']:.2f} s: {report['requests_per_s']:.1f} req/s, "
+        f"{report['visitors_per_s']:.1f} visitors/s, {report['errors']} errors"
+    )
+    for step, summary in report["steps"].items():
+        print(format_row(step, summary))
+    print(f"ceremeo stub: {report['ceremeo']}")
+    print(f"drained: {report['drained']}, outbox: {report['outbox']}")
+
+
+if __name__ == "__main__":
+    main()
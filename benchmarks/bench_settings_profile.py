@@ -0,0 +1,81 @@
+"""
+Per-request overhead of the dev settings profile compared with prod.
+
+Runs the first contact request step GET through the full middleware stack
+once under DJANGO_PROFILE=dev (DEBUG, Django Debug Toolbar, uncached
+templates) and once under DJANGO_PROFILE=prod, each in its own process since
+the profile is picked when settings are imported. The prod run uses
+ALLOWED_HOSTS from the environment, or localhost.
+
+    python -m benchmarks.bench_settings_profile --repeat 500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import benchmark_database, format_row, measure, setup_django
+
+PROFILES = ("dev", "prod")
+
+
+def run_profile(repeat: int) -> None:
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+
+    from BusinessApp import settings
+    from cards.models import BusinessCard
+
+    setup_test_environment()
+    with benchmark_database():
+        business_card = BusinessCard.objects.create(
+            name_and_surname="Jan Kowalski",
+            company="Firma",
+            phone_number="+48600100200",
+            email="jan@example.com",
+            user=get_user_model().objects.create(username="jan"),
+        )
+        client = Client()
+        url = reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        assert client.get(url).status_code == 200
+        result = measure(lambda: client.get(url), repeat)
+    print(format_row(settings.DJANGO_PROFILE, result), flush=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--profile", choices=PROFILES)
+    args = parser.parse_args()
+
+    if args.profile is not None:
+        run_profile(args.repeat)
+        return
+
+    print(f"first step GET, {args.repeat} requests")
+    for profile in PROFILES:
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_settings_profile",
+                "--repeat",
+                str(args.repeat),
+                "--profile",
+                profile,
+            ],
+            env={
+                **os.environ,
+                "DJANGO_PROFILE": profile,
+                "ALLOWED_HOSTS": os.environ.get("ALLOWED_HOSTS", "localhost"),
+            },
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Time and memory of parsing multi-contact vCard uploads.
+
+Builds a .vcf with --contacts contacts, optionally embedding a base64
+PHOTO of --photo-kib KiB in each, and parses it with the legacy approach
+(decode the whole upload, then build vobject components from the string),
+with vobject over the streamed upload and with the line-oriented fast path
+used by the contact request funnel.
+
+    python -m benchmarks.bench_vcard_parsing --contacts 1000 --photo-kib 16
+"""
+
+import argparse
+import base64
+import os
+import time
+import tracemalloc
+
+from benchmarks.common import setup_django
+
+
+def build_photo_lines(photo_kib: int) -> str:
+    if not photo_kib:
+        return ""
+    encoded = base64.b64encode(os.urandom(photo_kib * 1024)).decode()
+    lines = [encoded[start : start + 74] for start in range(0, len(encoded), 74)]
+    return "PHOTO;ENCODING=b;TYPE=JPEG:" + "\r\n ".join(lines) + "\r\n"
+
+
+def build_vcard_file(contacts: int, photo_kib: int = 0) -> bytes:
+    photo = build_photo_lines(photo_kib)
+    vcards = []
+    for index in range(contacts):
+        vcards.append(
+            "BEGIN:VCARD\r\n"
+            "VERSION:3.0\r\n"
+            f"N:Kowalski{index};Jan\r\n"
+            f"FN:Jan Kowalski{index}\r\n"
+            "ORG:Firma Sp. z o.o.\r\n"
+            f"TEL;TYPE=CELL:+48{600000000 + index}\r\n"
+            f"EMAIL;TYPE=INTERNET:jan{index}@example.com\r\n"
+            "ADR;TYPE=WORK:;;Prosta 1;Warszawa;;00-001;Polska\r\n"
+            f"{photo}"
+            "END:VCARD\r\n"
+        )
+    return "".join(vcards).encode()
+
+
+def legacy_parse(upload) -> list[dict]:
+    import io
+
+    from cards.services import convert_vcard_fields_to_ceremeo_format
+    from cards.vcards import read_vcard_fields
+
+    vcard_content = upload.read().decode("utf-8")
+    return [
+        convert_vcard_fields_to_ceremeo_format(vcard_fields)
+        for vcard_fields in read_vcard_fields(io.StringIO(vcard_content))
+    ]
+
+
+def vobject_parse(upload) -> list[dict]:
+    from cards.services import iter_vcard_contacts
+    from cards.vcards import read_vcard_fields
+
+    return list(iter_vcard_contacts(vcard_file=upload, read_fields=read_vcard_fields))
+
+
+def fast_path_parse(upload) -> list[dict]:
+    from cards.services import parse_vcard_contacts
+
+    return parse_vcard_contacts(vcard_file=upload)
+
+
+def run(parser, content: bytes, repeat: int) -> dict[str, float]:
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    timings, peaks = [], []
+    for _ in range(repeat):
+        upload = SimpleUploadedFile("contacts.vcf", content, "text/vcard")
+        tracemalloc.start()
+        start = time.perf_counter()
+        contacts = parser(upload)
+        timings.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "contacts": len(contacts),
+        "ms": min(timings) * 1000,
+        "peak_kib": max(peaks) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--photo-kib", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    content = build_vcard_file(args.contacts, args.photo_kib)
+    print(f"{args.contacts} contacts, {len(content) / 1024:.1f} KiB")
+    for name, vcard_parser in [
+        ("legacy", legacy_parse),
+        ("vobject", vobject_parse),
+        ("fast_path", fast_path_parse),
+    ]:
+        result = run(vcard_parser, content, args.repeat)
+        print(
+            f"{name:<10} contacts={result['contacts']:6d}  ms={result['ms']:9.2f}  "
+            f"peak_kib={result['peak_kib']:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
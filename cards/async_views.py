@@ -0,0 +1,266 @@
+import uuid
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.shortcuts import render, aget_object_or_404
+from django.views import View
+
+from BusinessApp import settings
+from cards.models import BusinessCard
+from cards.services import (
+    submit_first_step_contact_request,
+    enqueue_parsed_vcard_data,
+    redirect_based_on_request_contact_state,
+    aget_contact_request,
+    adelete_contact_request,
+    get_phone_number_and_vcard_from_request_data,
+    convert_request_data_to_ceremeo_format_second_step,
+    advance_contact_request,
+    convert_request_data_to_ceremeo_format_third_step,
+    get_random_meme,
+    astream_contact_requests_export,
+)
+from cards.funnel import (
+    get_funnel_state,
+    set_funnel_state,
+    clear_funnel_state,
+    redirect_to_contact_request_step,
+    route_funnel_state,
+    get_posted_contact_request_id,
+)
+from cards.projections import aget_card_projection
+from cards.forms import (
+    FirstStepContactForm,
+    SecondStepContactForm,
+    ThirdStepContactForm,
+)
+
+
+async def aget_contact_request_id_for_step(
+    request: HttpRequest, card_id: uuid.UUID, step_url: str
+) -> tuple[Optional[str], Optional[HttpResponseRedirect]]:
+    funnel_state = get_funnel_state(request=request, card_id=card_id)
+    if funnel_state is not None:
+        return funnel_state.contact_request_id, route_funnel_state(
+            funnel_state, card_id, step_url
+        )
+
+    contact_request_id = request.GET.get("contact_request_id")
+    if contact_request_id is None:
+        return None, redirect_to_contact_request_step("upload_phone_num", card_id, None)
+
+    contact_request = await aget_contact_request(contact_id=contact_request_id)
+    if contact_request is None:
+        return None, redirect_to_contact_request_step("upload_phone_num", card_id, None)
+
+    redirect_url = redirect_based_on_request_contact_state(contact_request)
+    if redirect_url != step_url:
+        return None, redirect_to_contact_request_step(
+            redirect_url, card_id, contact_request.id
+        )
+    return contact_request_id, None
+
+
+class AsyncContactRequestExportView(View):
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponseForbidden("You must be logged in.")
+        export_format = request.GET.get("format", "vcf")
+        if export_format not in settings.CARDS_EXPORT_FORMATS:
+            return HttpResponseBadRequest("Unsupported export format.")
+        return StreamingHttpResponse(
+            astream_contact_requests_export(lead=user, export_format=export_format),
+            content_type=settings.CARDS_EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="contact_requests.{export_format}"'
+                )
+            },
+        )
+
+
+class AsyncContactRequestFirstStepView(View):
+    async def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        card_projection = await aget_card_projection(card_id=card_id)
+        form = FirstStepContactForm()
+        context = {"card_id": card_id, **card_projection, "form": form}
+        return render(request, "first_step_form.html", context)
+
+    async def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        business_card = await aget_object_or_404(
+            BusinessCard.objects.select_related("user"), id=card_id
+        )
+        form = FirstStepContactForm(request.POST, request.FILES)
+        if await sync_to_async(form.is_valid)():
+            phone_number, vcard = get_phone_number_and_vcard_from_request_data(
+                data=form.cleaned_data
+            )
+            if phone_number:
+                created_contact_request = await sync_to_async(
+                    submit_first_step_contact_request
+                )(
+                    data=form.cleaned_data,
+                    requestor=await request.auser(),
+                    lead=business_card.user,
+                )
+                response = redirect_to_contact_request_step(
+                    "requestor_info", card_id, created_contact_request.id
+                )
+                return set_funnel_state(
+                    request, response, card_id, created_contact_request.id, step=2
+                )
+            try:
+                deliveries = await sync_to_async(enqueue_parsed_vcard_data)(vcard=vcard)
+            except ValidationError as e:
+                form.add_error("vcard", e)
+            else:
+                return render(
+                    request,
+                    "finish_meme.html",
+                    {
+                        "card_id": card_id,
+                        "contacts_received": len(deliveries),
+                        "random_meme": await sync_to_async(get_random_meme)(),
+                        **await aget_card_projection(card_id=card_id),
+                    },
+                )
+        return render(request, "form_validation_error.html", {"form": form}, status=400)
+
+
+class AsyncContactRequestSecondStepView(View):
+    async def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        contact_request_id, redirect = await aget_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="requestor_info"
+        )
+        if redirect is not None:
+            return redirect
+
+        card_projection = await aget_card_projection(card_id=card_id)
+        form = SecondStepContactForm()
+        return render(
+            request,
+            "second_step_form.html",
+            {
+                "form": form,
+                "card_id": card_id,
+                "contact_request_id": contact_request_id,
+                **card_projection,
+            },
+        )
+
+    async def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        contact_request_id, redirect = get_posted_contact_request_id(
+            request=request, card_id=card_id, step_url="requestor_info"
+        )
+        if redirect is not None:
+            return redirect
+        form = SecondStepContactForm(request.POST)
+        if form.is_valid():
+            contact_request = await aget_contact_request(contact_id=contact_request_id)
+            if contact_request is None:
+                return redirect_to_contact_request_step(
+                    "upload_phone_num", card_id, None
+                )
+            data_to_ceremeo = convert_request_data_to_ceremeo_format_second_step(
+                data=form.cleaned_data, phone=contact_request.phone_number
+            )
+            await sync_to_async(advance_contact_request)(
+                contact_request=contact_request,
+                data=form.cleaned_data,
+                ceremeo_data=data_to_ceremeo,
+                step=3,
+            )
+            response = redirect_to_contact_request_step(
+                "contact_prefs", card_id, contact_request.id
+            )
+            return set_funnel_state(
+                request, response, card_id, contact_request.id, step=3
+            )
+        return render(request, "form_validation_error.html", {"form": form}, status=400)
+
+
+class AsyncContactRequestThirdStepView(View):
+    async def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        contact_request_id, redirect = await aget_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="contact_prefs"
+        )
+        if redirect is not None:
+            return redirect
+
+        card_projection = await aget_card_projection(card_id=card_id)
+        form = ThirdStepContactForm()
+        return render(
+            request,
+            "third_step_form.html",
+            {
+                "form": form,
+                "card_id": card_id,
+                "contact_request_id": contact_request_id,
+                **card_projection,
+            },
+        )
+
+    async def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        contact_request_id, redirect = get_posted_contact_request_id(
+            request=request, card_id=card_id, step_url="contact_prefs"
+        )
+        if redirect is not None:
+            return redirect
+        form = ThirdStepContactForm(request.POST)
+        if form.is_valid():
+            contact_request = await aget_contact_request(contact_id=contact_request_id)
+            if contact_request is None:
+                return redirect_to_contact_request_step(
+                    "upload_phone_num", card_id, None
+                )
+            ceremeo_data = convert_request_data_to_ceremeo_format_third_step(
+                data=form.cleaned_data, phone=contact_request.phone_number
+            )
+            await sync_to_async(advance_contact_request)(
+                contact_request=contact_request,
+                data=form.cleaned_data,
+                ceremeo_data=ceremeo_data,
+                step=4,
+            )
+            response = redirect_to_contact_request_step(
+                "finish_meme", card_id, contact_request.id
+            )
+            return set_funnel_state(
+                request, response, card_id, contact_request.id, step=4
+            )
+        return render(request, "form_validation_error.html", {"form": form}, status=400)
+
+
+class AsyncCompletedContactRequestView(View):
+    async def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        contact_request_id, redirect = await aget_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="finish_meme"
+        )
+        if redirect is not None:
+            return redirect
+
+        await adelete_contact_request(contact_id=contact_request_id)
+        card_projection = await aget_card_projection(card_id=card_id)
+        random_meme = await sync_to_async(get_random_meme)()
+
+        response = render(
+            request,
+            "finish_meme.html",
+            {
+                "card_id": card_id,
+                "contact_request_id": contact_request_id,
+                "random_meme": random_meme,
+                **card_projection,
+            },
+        )
+        return clear_funnel_state(response, card_id)
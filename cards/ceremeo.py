@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from BusinessApp import settings
+from cards.timing import timed
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def build_ceremeo_session() -> requests.Session:
+    retry = Retry(
+        total=settings.CEREMEO_MAX_RETRIES,
+        connect=settings.CEREMEO_MAX_RETRIES,
+        read=0,
+        status=settings.CEREMEO_MAX_RETRIES,
+        status_forcelist=settings.CEREMEO_RETRY_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        backoff_factor=settings.CEREMEO_RETRY_BACKOFF,
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.CEREMEO_POOL_CONNECTIONS,
+        pool_maxsize=settings.CEREMEO_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_ceremeo_session() -> requests.Session:
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = build_ceremeo_session()
+                _session_pid = pid
+    return _session
+
+
+def get_ceremeo_timeout() -> tuple[float, float]:
+    return settings.CEREMEO_CONNECT_TIMEOUT, settings.CEREMEO_READ_TIMEOUT
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint: str, failure_threshold: int, reset_timeout: int):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+    def _key(self, name: str) -> str:
+        return f"ceremeo:circuit:{self.endpoint}:{name}"
+
+    def _increment(self, name: str, timeout: Optional[int] = None) -> int:
+        key = self._key(name)
+        cache.add(key, 0, timeout=timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=timeout)
+            return 1
+
+    def state(self) -> str:
+        opened_at = cache.get(self._key("opened_at"))
+        if opened_at is None:
+            return self.CLOSED
+        if time.time() - opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow_request(self) -> bool:
+        state = self.state()
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        return cache.add(self._key("probe"), 1, timeout=self.reset_timeout)
+
+    def record_success(self, rejected: bool = False) -> None:
+        self._increment("requests", timeout=settings.CEREMEO_STATS_WINDOW)
+        if rejected:
+            self._increment("errors", timeout=settings.CEREMEO_STATS_WINDOW)
+        cache.delete_many(
+            [self._key("failures"), self._key("opened_at"), self._key("probe")]
+        )
+
+    def record_failure(self) -> None:
+        self._increment("requests", timeout=settings.CEREMEO_STATS_WINDOW)
+        self._increment("errors", timeout=settings.CEREMEO_STATS_WINDOW)
+        failures = self._increment("failures")
+        if self.state() == self.HALF_OPEN or failures >= self.failure_threshold:
+            cache.set(self._key("opened_at"), time.time(), timeout=None)
+            cache.delete(self._key("probe"))
+
+    def stats(self) -> dict[str, any]:
+        requests_count = cache.get(self._key("requests"), 0)
+        errors_count = cache.get(self._key("errors"), 0)
+        return {
+            "endpoint": self.endpoint,
+            "state": self.state(),
+            "requests": requests_count,
+            "errors": errors_count,
+            "error_rate": errors_count / requests_count if requests_count else 0.0,
+        }
+
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        endpoint=endpoint,
+        failure_threshold=settings.CEREMEO_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=settings.CEREMEO_CIRCUIT_RESET_TIMEOUT,
+    )
+
+
+def get_ceremeo_endpoints() -> list[str]:
+    if settings.CEREMEO_BULK_URL:
+        return ["lead", "bulk"]
+    return ["lead"]
+
+
+def is_ceremeo_failure(error: requests.exceptions.RequestException) -> bool:
+    response = getattr(error, "response", None)
+    if response is None:
+        return True
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def post_to_ceremeo(url: str, data: any, endpoint: str = "lead") -> requests.Response:
+    breaker = get_circuit_breaker(endpoint)
+    if not breaker.allow_request():
+        raise CircuitOpenError(f"Ceremeo {endpoint} endpoint circuit is open.")
+    try:
+        with timed("ceremeo"):
+            response = get_ceremeo_session().post(
+                url, json=data, timeout=get_ceremeo_timeout()
+            )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        if is_ceremeo_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success(rejected=True)
+        raise
+    breaker.record_success()
+    return response
@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, TypeVar
+
+from BusinessApp import settings
+from cards.timing import timed
+
+T = TypeVar("T")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_slots: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+class ExecutorBusyError(Exception):
+    pass
+
+
+def get_image_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor, _executor_pid, _executor_slots
+    if not settings.CARDS_IMAGE_EXECUTOR_WORKERS:
+        return None
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.CARDS_IMAGE_EXECUTOR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                _executor_slots = threading.BoundedSemaphore(
+                    settings.CARDS_IMAGE_EXECUTOR_MAX_PENDING
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = None
+        _executor_pid = None
+
+
+def run_cpu_bound(func: Callable[..., T], *args) -> T:
+    with timed("image"):
+        executor = get_image_executor()
+        if executor is None:
+            return func(*args)
+        slots = _executor_slots
+        if not slots.acquire(timeout=settings.CARDS_IMAGE_EXECUTOR_TIMEOUT):
+            raise ExecutorBusyError("Image processing queue is full.")
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _future: slots.release())
+        try:
+            return future.result(timeout=settings.CARDS_IMAGE_EXECUTOR_TIMEOUT)
+        except FutureTimeoutError as e:
+            raise ExecutorBusyError("Image processing timed out.") from e
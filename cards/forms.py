@@ -1,8 +1,13 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from phonenumber_field.formfields import PhoneNumberField
+from PIL import Image
+
+from BusinessApp import settings
+from cards.images import get_image_ingest
 from cards.validators import (
     validate_vcard_format,
+    validate_vcard_size,
     validate_user_photo,
     validate_phone_number_for_contact_request,
     validate_name_and_surname,
@@ -18,6 +23,23 @@ class AlphaCharsValidator:
             )
 
 
+class IngestImageField(forms.ImageField):
+    def to_python(self, data):
+        uploaded_image = forms.FileField.to_python(self, data)
+        if uploaded_image is None:
+            return None
+
+        ingest = get_image_ingest(uploaded_image)
+        try:
+            uploaded_image.image = ingest.image
+            uploaded_image.content_type = Image.MIME.get(ingest.format)
+        except Exception as exc:
+            raise ValidationError(
+                self.error_messages["invalid_image"], code="invalid_image"
+            ) from exc
+        return uploaded_image
+
+
 class BusinessCardForm(forms.Form):
     name_and_surname = forms.CharField(
         max_length=100, validators=[AlphaCharsValidator(), validate_name_and_surname]
@@ -25,10 +47,17 @@ class BusinessCardForm(forms.Form):
     company = forms.CharField(max_length=100)
     phone_number = PhoneNumberField(region="PL")
     email = forms.EmailField(max_length=320)
-    user_photo = forms.ImageField(validators=[validate_user_photo])
+    user_photo = IngestImageField(validators=[validate_user_photo])
     vcard_address = forms.CharField(max_length=200)
 
 
+class BusinessCardImportForm(BusinessCardForm):
+    username = forms.CharField(max_length=150)
+    photo = forms.CharField(max_length=255)
+    user_photo = None
+    vcard_address = forms.CharField(max_length=200, required=False)
+
+
 class FirstStepContactForm(forms.Form):
     phone_number = PhoneNumberField(
         region="PL",
@@ -36,7 +65,9 @@ class FirstStepContactForm(forms.Form):
         validators=[validate_phone_number_for_contact_request],
     )
     vcard = forms.FileField(
-        label="Wyślij wizytówkę", required=False, validators=[validate_vcard_format]
+        label="Wyślij wizytówkę",
+        required=False,
+        validators=[validate_vcard_size, validate_vcard_format],
     )
 
     def clean(self):
@@ -68,3 +99,19 @@ class SecondStepContactForm(forms.Form):
 class ThirdStepContactForm(forms.Form):
     date = forms.DateField(required=False, validators=[validate_date])
     contact_topic = forms.CharField(max_length=200, required=False)
+
+
+class QRCodeForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[
+            (image_format, image_format) for image_format in settings.CARDS_QR_FORMATS
+        ],
+        required=False,
+    )
+    size = forms.TypedChoiceField(
+        choices=[(size, size) for size in settings.CARDS_QR_SIZES],
+        coerce=int,
+        empty_value=None,
+        required=False,
+    )
+    optimize = forms.BooleanField(required=False)
@@ -0,0 +1,111 @@
+import uuid
+from typing import NamedTuple, Optional
+
+from django.core import signing
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.urls import reverse
+
+from BusinessApp import settings
+from cards.services import CONTACT_REQUEST_STEP_URLS
+
+FUNNEL_TOKEN_SALT = "cards.funnel"
+
+
+class FunnelState(NamedTuple):
+    card_id: str
+    contact_request_id: str
+    step: int
+
+
+def get_funnel_cookie_path(card_id: uuid.UUID) -> str:
+    return (
+        reverse("upload_phone_num", kwargs={"card_id": card_id}).rsplit("/", 2)[0] + "/"
+    )
+
+
+def get_funnel_state(request: HttpRequest, card_id: uuid.UUID) -> Optional[FunnelState]:
+    token = request.COOKIES.get(settings.CARDS_FUNNEL_COOKIE_NAME)
+    if token is None:
+        return None
+    try:
+        funnel_state = FunnelState(
+            *signing.loads(
+                token,
+                salt=FUNNEL_TOKEN_SALT,
+                max_age=settings.CARDS_FUNNEL_TOKEN_MAX_AGE,
+            )
+        )
+    except (signing.BadSignature, TypeError):
+        return None
+    if funnel_state.card_id != str(card_id):
+        return None
+    if funnel_state.step not in CONTACT_REQUEST_STEP_URLS:
+        return None
+    return funnel_state
+
+
+def set_funnel_state(
+    request: HttpRequest,
+    response: HttpResponse,
+    card_id: uuid.UUID,
+    contact_request_id: uuid.UUID,
+    step: int,
+) -> HttpResponse:
+    response.set_cookie(
+        settings.CARDS_FUNNEL_COOKIE_NAME,
+        signing.dumps(
+            [str(card_id), str(contact_request_id), step], salt=FUNNEL_TOKEN_SALT
+        ),
+        max_age=settings.CARDS_FUNNEL_TOKEN_MAX_AGE,
+        path=get_funnel_cookie_path(card_id),
+        secure=request.is_secure(),
+        httponly=True,
+        samesite="Lax",
+    )
+    return response
+
+
+def clear_funnel_state(response: HttpResponse, card_id: uuid.UUID) -> HttpResponse:
+    response.delete_cookie(
+        settings.CARDS_FUNNEL_COOKIE_NAME,
+        path=get_funnel_cookie_path(card_id),
+        samesite="Lax",
+    )
+    return response
+
+
+def redirect_to_contact_request_step(
+    redirect_url: str,
+    card_id: uuid.UUID,
+    contact_request_id: Optional[uuid.UUID],
+) -> HttpResponseRedirect:
+    url = reverse(redirect_url, kwargs={"card_id": card_id})
+    if redirect_url == "upload_phone_num" or contact_request_id is None:
+        return HttpResponseRedirect(url)
+    return HttpResponseRedirect(url + f"?contact_request_id={contact_request_id}")
+
+
+def route_funnel_state(
+    funnel_state: FunnelState, card_id: uuid.UUID, step_url: str
+) -> Optional[HttpResponseRedirect]:
+    redirect_url = CONTACT_REQUEST_STEP_URLS[funnel_state.step]
+    if redirect_url == step_url:
+        return None
+    return redirect_to_contact_request_step(
+        redirect_url, card_id, funnel_state.contact_request_id
+    )
+
+
+def get_posted_contact_request_id(
+    request: HttpRequest, card_id: uuid.UUID, step_url: str
+) -> tuple[Optional[str], Optional[HttpResponseRedirect]]:
+    funnel_state = get_funnel_state(request=request, card_id=card_id)
+    if funnel_state is not None:
+        return funnel_state.contact_request_id, route_funnel_state(
+            funnel_state, card_id, step_url
+        )
+
+    contact_request_id = request.POST.get("contact_request_id")
+    if contact_request_id is None:
+        return None, redirect_to_contact_request_step("upload_phone_num", card_id, None)
+    return contact_request_id, None
@@ -0,0 +1,145 @@
+from io import BytesIO
+from typing import Optional
+
+import qrcode
+from django.core.files import File
+from PIL import Image
+
+
+class ImageIngest:
+    HEADER_SIZE = 2048
+
+    def __init__(
+        self, uploaded_image: File, decoded_image: Optional[Image.Image] = None
+    ):
+        self.file = uploaded_image
+        self._image = decoded_image
+        self._decoded_image = decoded_image
+
+        uploaded_image.seek(0)
+        self.header = uploaded_image.read(self.HEADER_SIZE)
+        uploaded_image.seek(0)
+
+    @property
+    def image(self) -> Image.Image:
+        if self._image is None:
+            self._image = Image.open(self.file)
+        return self._image
+
+    @property
+    def format(self) -> Optional[str]:
+        return self.image.format
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.image.size
+
+    def decode(self) -> Image.Image:
+        if self._decoded_image is None:
+            self._decoded_image = self.image.convert("RGB")
+            self.file.seek(0)
+        return self._decoded_image
+
+
+def get_image_ingest(uploaded_image: File) -> ImageIngest:
+    ingest = getattr(uploaded_image, "ingest", None)
+    if ingest is None:
+        ingest = ImageIngest(uploaded_image)
+        uploaded_image.ingest = ingest
+    return ingest
+
+
+def render_square_jpeg(image: Image.Image) -> tuple[Image.Image, bytes]:
+    width, height = image.size
+    new_size = min(width, height)
+    square_image = image.resize((new_size, new_size))
+
+    output = BytesIO()
+    square_image.save(output, format="JPEG")
+    return square_image, output.getvalue()
+
+
+def render_thumbnails(
+    image: Image.Image, sizes: tuple[int, ...], formats: tuple[str, ...], quality: int
+) -> dict[tuple[str, int], bytes]:
+    rendered = {}
+    for size in sorted({min(size, image.width) for size in sizes}):
+        thumbnail = image.resize((size, size), Image.LANCZOS)
+        for image_format in formats:
+            output = BytesIO()
+            thumbnail.save(output, format=image_format, quality=quality)
+            rendered[(image_format, size)] = output.getvalue()
+    return rendered
+
+
+def render_qr_svg(matrix: list[list[bool]]) -> bytes:
+    modules = len(matrix)
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < modules:
+            if row[x]:
+                start = x
+                while x < modules and row[x]:
+                    x += 1
+                path.append(f"M{start} {y}h{x - start}v1H{start}z")
+            else:
+                x += 1
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {modules} {modules}" '
+        f'shape-rendering="crispEdges"><rect width="{modules}" height="{modules}" '
+        f'fill="#fff"/><path d="{"".join(path)}"/></svg>'
+    ).encode()
+
+
+def render_qr_code(
+    url: str,
+    image_format: str = "png",
+    size: Optional[int] = None,
+    optimize: bool = False,
+) -> bytes:
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10 if size is None else 1,
+        border=4,
+    )
+
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    if image_format == "svg":
+        return render_qr_svg(qr.get_matrix())
+
+    if size is not None:
+        qr.box_size = max(1, size // len(qr.get_matrix()))
+    qr_image = qr.make_image(fill_color="black", back_color="white").get_image()
+    if size is not None and qr_image.size[0] > size:
+        qr_image = qr_image.resize((size, size), Image.NEAREST)
+    elif size is not None and qr_image.size[0] < size:
+        canvas = Image.new(qr_image.mode, (size, size), "white")
+        offset = (size - qr_image.size[0]) // 2
+        canvas.paste(qr_image, (offset, offset))
+        qr_image = canvas
+    output = BytesIO()
+    qr_image.save(output, format="PNG", optimize=optimize)
+    return output.getvalue()
+
+
+def render_card_images(
+    photo_path: str,
+    card_url: Optional[str],
+    thumbnail_sizes: tuple[int, ...],
+    thumbnail_formats: tuple[str, ...],
+    thumbnail_quality: int,
+) -> dict[str, any]:
+    with Image.open(photo_path) as photo:
+        image = photo.convert("RGB")
+    square_image, square_jpeg = render_square_jpeg(image)
+    return {
+        "photo": square_jpeg,
+        "thumbnails": render_thumbnails(
+            square_image, thumbnail_sizes, thumbnail_formats, thumbnail_quality
+        ),
+        "qr_code": render_qr_code(card_url) if card_url else None,
+    }
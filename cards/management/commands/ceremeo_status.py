@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from cards.ceremeo import get_circuit_breaker, get_ceremeo_endpoints
+from cards.models import CeremeoOutbox
+
+
+class Command(BaseCommand):
+    help = "Show Ceremeo circuit breaker state, error rates and outbox backlog."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", action="append", dest="endpoints", default=None
+        )
+
+    def handle(self, *args, **options):
+        for endpoint in options["endpoints"] or get_ceremeo_endpoints():
+            stats = get_circuit_breaker(endpoint).stats()
+            self.stdout.write(
+                f"{stats['endpoint']}: state={stats['state']} "
+                f"requests={stats['requests']} errors={stats['errors']} "
+                f"error_rate={stats['error_rate']:.2%}"
+            )
+        backlog = dict(
+            CeremeoOutbox.objects.values_list("status")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for status in CeremeoOutbox.Status.values:
+            self.stdout.write(f"outbox {status}: {backlog.get(status, 0)}")
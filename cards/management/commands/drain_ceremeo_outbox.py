@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from BusinessApp import settings
+from cards.services import deliver_pending_ceremeo_payloads
+
+
+class Command(BaseCommand):
+    help = "Deliver pending Ceremeo payloads stored in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.CEREMEO_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        while True:
+            sent, failed = deliver_pending_ceremeo_payloads(batch_size=batch_size)
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed} Ceremeo payloads.")
+            if options["once"] and sent + failed < batch_size:
+                return
+            if sent + failed == 0:
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from cards.models import BusinessCard
+from cards.services import generate_photo_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Generate missing photo thumbnails for existing business cards."
+
+    def handle(self, *args, **options):
+        business_cards = (
+            BusinessCard.objects.filter(photo_thumbnails={})
+            .exclude(user_photo="")
+            .select_related("user")
+        )
+        generated = 0
+        for business_card in business_cards.iterator():
+            with business_card.user_photo.open("rb") as user_photo:
+                business_card.photo_thumbnails = generate_photo_thumbnails(
+                    uploaded_image=user_photo, user=business_card.user
+                )
+            business_card.save(update_fields=["photo_thumbnails"])
+            generated += 1
+        self.stdout.write(f"Generated thumbnails for {generated} business cards.")
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from BusinessApp import settings
+from cards.forms import BusinessCardImportForm
+from cards.images import render_card_images
+from cards.services import (
+    read_business_card_manifest,
+    get_usernames_with_business_card,
+    bulk_create_business_cards,
+    get_user_card_url,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create business cards from a CSV or JSON manifest and a photo directory. "
+        "Rows whose username already has a card are skipped, so an interrupted "
+        "import can be rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("manifest")
+        parser.add_argument("--photo-dir", required=True)
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--warm-qr-cache",
+            action="store_true",
+            help="Render each card's QR code during the import and cache it.",
+        )
+
+    def handle(self, *args, **options):
+        rows = read_business_card_manifest(options["manifest"])
+        seen_usernames = get_usernames_with_business_card(
+            [row.get("username") for row in rows]
+        )
+        pending = []
+        for row in rows:
+            if row.get("username") not in seen_usernames:
+                seen_usernames.add(row.get("username"))
+                pending.append(row)
+        self.stdout.write(
+            f"Importing {len(pending)} cards, skipping {len(rows) - len(pending)}."
+        )
+
+        imported = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=options["workers"],
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            for start in range(0, len(pending), options["batch_size"]):
+                rendering = []
+                for row in pending[start : start + options["batch_size"]]:
+                    form = BusinessCardImportForm(row)
+                    if not form.is_valid():
+                        failed += 1
+                        self.stderr.write(
+                            f"{row.get('username')}: {form.errors.as_text()}"
+                        )
+                        continue
+
+                    data = {**row, **form.cleaned_data}
+                    card_id = uuid.uuid4()
+                    future = executor.submit(
+                        render_card_images,
+                        os.path.join(options["photo_dir"], data["photo"]),
+                        (
+                            get_user_card_url(card_id=card_id)
+                            if options["warm_qr_cache"]
+                            else None
+                        ),
+                        settings.CARDS_THUMBNAIL_SIZES,
+                        tuple(settings.CARDS_THUMBNAIL_FORMATS),
+                        settings.CARDS_THUMBNAIL_QUALITY,
+                    )
+                    rendering.append((data, card_id, future))
+
+                cards = []
+                for data, card_id, future in rendering:
+                    try:
+                        cards.append((data, card_id, future.result()))
+                    except (OSError, ValueError) as e:
+                        failed += 1
+                        self.stderr.write(f"{data['username']}: {e}")
+
+                imported += len(bulk_create_business_cards(cards=cards))
+                self.stdout.write(
+                    f"Imported {imported}/{len(pending)} cards, {failed} failed."
+                )
@@ -0,0 +1,95 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class CeremeoStubHandler(BaseHTTPRequestHandler):
+    server_version = "CeremeoStub/1.0"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        leads = json.loads(body or b"null")
+        leads_count = len(leads) if isinstance(leads, list) else 1
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+            self.server.stats["leads"] += leads_count
+
+        if self.server.random.random() < self.server.error_rate:
+            status, response = 503, {"error": "Ceremeo stub failure"}
+        else:
+            status, response = 201, {"accepted": leads_count}
+        content = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def build_ceremeo_stub_server(
+    host: str,
+    port: int,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = None,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), CeremeoStubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    server.random = random.Random(seed)
+    server.verbose = verbose
+    server.stats = {"requests": 0, "leads": 0}
+    server.stats_lock = threading.Lock()
+    return server
+
+
+class Command(BaseCommand):
+    help = "Run a local Ceremeo stub that accepts single and bulk lead payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8900)
+        parser.add_argument(
+            "--latency", type=float, default=0.0, help="Seconds to wait per request."
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with 503.",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        server = build_ceremeo_stub_server(
+            host=options["host"],
+            port=options["port"],
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            seed=options["seed"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(
+            f"Ceremeo stub listening on http://{options['host']}:{options['port']}/"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(
+                f"Handled {server.stats['requests']} requests "
+                f"with {server.stats['leads']} leads."
+            )
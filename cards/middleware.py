@@ -0,0 +1,53 @@
+import time
+from typing import Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from cards.timing import finish_request_timing, track_request_timings
+from cards.uploadhandlers import LimitedUploadHandler, UploadTooLarge
+
+
+def limit_uploads(view_func: Callable) -> Callable:
+    view_func.limit_uploads = True
+    return view_func
+
+
+class UploadLimitMiddleware(MiddlewareMixin):
+    def process_view(
+        self, request: HttpRequest, view_func: Callable, view_args, view_kwargs
+    ) -> Optional[HttpResponse]:
+        if request.method != "POST" or not getattr(view_func, "limit_uploads", False):
+            return None
+        request.upload_handlers.insert(0, LimitedUploadHandler(request))
+        try:
+            request.FILES
+        except UploadTooLarge as e:
+            return HttpResponse(str(e), status=413)
+        return None
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with track_request_timings() as timings:
+            response = self.get_response(request)
+        return finish_request_timing(request, response, start, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        with track_request_timings() as timings:
+            response = await self.get_response(request)
+        return finish_request_timing(request, response, start, timings)
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.4 on 2026-10-16 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0006_ceremeooutbox"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contactrequest",
+            index=models.Index(
+                fields=["phone_number", "lead", "form_step"],
+                name="contact_phone_lead_step_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0007_contactrequest_phone_lead_step_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="businesscard",
+            name="photo_thumbnails",
+            field=models.JSONField(default=dict),
+        ),
+    ]
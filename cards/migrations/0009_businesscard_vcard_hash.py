@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-16 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0008_businesscard_photo_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="businesscard",
+            name="vcard_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="businesscard",
+            name="vcard_updated_at",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
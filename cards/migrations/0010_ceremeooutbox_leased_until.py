@@ -0,0 +1,18 @@
+# Generated by Django 5.0.4 on 2026-10-17 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0009_businesscard_vcard_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ceremeooutbox",
+            name="leased_until",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.core.validators import FileExtensionValidator
 from phonenumber_field.modelfields import PhoneNumberField
 
@@ -24,6 +25,9 @@ class BusinessCard(models.Model):
     )
     vcard = models.FileField(upload_to="vcard_files/")
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
+    photo_thumbnails = models.JSONField(default=dict)
+    vcard_hash = models.CharField(max_length=64, blank=True, default="")
+    vcard_updated_at = models.DateTimeField(null=True)
 
 
 class ContactRequest(models.Model):
@@ -44,3 +48,38 @@ class ContactRequest(models.Model):
     contact_date = models.DateField(null=True)
     contact_topic = models.CharField(max_length=150, null=True)
     form_step = models.IntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["phone_number", "lead", "form_step"],
+                name="contact_phone_lead_step_idx",
+            )
+        ]
+
+
+class CeremeoOutbox(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    contact_request = models.ForeignKey(
+        ContactRequest,
+        related_name="ceremeo_deliveries",
+        on_delete=models.SET_NULL,
+        null=True,
+    )
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    leased_until = models.DateTimeField(null=True)
+    last_error = models.TextField(null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "available_at"])]
@@ -0,0 +1,136 @@
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Optional
+
+from django.core.cache import cache
+from django.http import Http404
+
+from BusinessApp import settings
+from cards.models import BusinessCard
+from cards.services import get_lead_photo_context
+
+CARD_PROJECTION_FIELDS = (
+    "id",
+    "name_and_surname",
+    "company",
+    "user_photo",
+    "photo_thumbnails",
+)
+
+_local_projections: OrderedDict[str, tuple[float, dict[str, str]]] = OrderedDict()
+_local_lock = threading.Lock()
+_stats: Counter = Counter()
+
+
+def get_card_projection_cache_key(card_id: uuid.UUID) -> str:
+    return f"cards:projection:{card_id}"
+
+
+def build_card_projection(business_card: BusinessCard) -> dict[str, str]:
+    return {
+        "name_and_surname": business_card.name_and_surname,
+        "company": business_card.company,
+        **get_lead_photo_context(business_card),
+    }
+
+
+def count_card_projection_event(event: str) -> None:
+    with _local_lock:
+        _stats[event] += 1
+
+
+def get_card_projection_stats() -> dict[str, int]:
+    with _local_lock:
+        return {
+            event: _stats[event]
+            for event in ("local_hits", "shared_hits", "misses", "invalidations")
+        }
+
+
+def get_local_card_projection(key: str) -> Optional[dict[str, str]]:
+    with _local_lock:
+        entry = _local_projections.get(key)
+        if entry is None:
+            return None
+        expires_at, projection = entry
+        if expires_at < time.monotonic():
+            del _local_projections[key]
+            return None
+        _local_projections.move_to_end(key)
+        _stats["local_hits"] += 1
+        return projection
+
+
+def set_local_card_projection(key: str, projection: dict[str, str]) -> None:
+    with _local_lock:
+        _local_projections[key] = (
+            time.monotonic() + settings.CARDS_CARD_CACHE_LOCAL_TIMEOUT,
+            projection,
+        )
+        _local_projections.move_to_end(key)
+        while len(_local_projections) > settings.CARDS_CARD_CACHE_LOCAL_SIZE:
+            _local_projections.popitem(last=False)
+
+
+def clear_local_card_projections() -> None:
+    with _local_lock:
+        _local_projections.clear()
+        _stats.clear()
+
+
+def invalidate_card_projection(card_id: uuid.UUID) -> None:
+    key = get_card_projection_cache_key(card_id)
+    with _local_lock:
+        _local_projections.pop(key, None)
+        _stats["invalidations"] += 1
+    cache.delete(key)
+
+
+def get_card_projection(card_id: uuid.UUID) -> dict[str, str]:
+    key = get_card_projection_cache_key(card_id)
+    projection = get_local_card_projection(key)
+    if projection is not None:
+        return projection
+
+    projection = cache.get(key)
+    if projection is not None:
+        count_card_projection_event("shared_hits")
+    else:
+        count_card_projection_event("misses")
+        business_card = (
+            BusinessCard.objects.only(*CARD_PROJECTION_FIELDS)
+            .filter(id=card_id)
+            .first()
+        )
+        if business_card is None:
+            raise Http404("No BusinessCard matches the given query.")
+        projection = build_card_projection(business_card)
+        cache.set(key, projection, settings.CARDS_CARD_CACHE_TIMEOUT)
+    set_local_card_projection(key, projection)
+    return projection
+
+
+async def aget_card_projection(card_id: uuid.UUID) -> dict[str, str]:
+    key = get_card_projection_cache_key(card_id)
+    projection = get_local_card_projection(key)
+    if projection is not None:
+        return projection
+
+    projection = await cache.aget(key)
+    if projection is not None:
+        count_card_projection_event("shared_hits")
+    else:
+        count_card_projection_event("misses")
+        business_card = (
+            await BusinessCard.objects.only(*CARD_PROJECTION_FIELDS)
+            .filter(id=card_id)
+            .afirst()
+        )
+        if business_card is None:
+            raise Http404("No BusinessCard matches the given query.")
+        projection = build_card_projection(business_card)
+        await cache.aset(key, projection, settings.CARDS_CARD_CACHE_TIMEOUT)
+    set_local_card_projection(key, projection)
+    return projection
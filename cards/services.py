@@ -1,42 +1,93 @@
 import os
+import csv
+import codecs
+import json
 import uuid
 import random
+import hashlib
+from datetime import timedelta
 from io import BytesIO
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Iterator, AsyncIterator, Callable, Iterable
 
-import qrcode
 import vobject
 import requests
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.files.base import ContentFile
-from PIL import Image
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.http import quote_etag
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
 from django.http import HttpRequest, QueryDict
 from django.shortcuts import get_object_or_404
 
 from BusinessApp import settings
-from cards.models import BusinessCard, ContactRequest
+from cards.ceremeo import (
+    post_to_ceremeo,
+    get_circuit_breaker,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from cards.executors import run_cpu_bound
+from cards.images import (
+    ImageIngest,
+    get_image_ingest,
+    render_square_jpeg,
+    render_thumbnails,
+    render_qr_code,
+)
+from cards.vcards import (
+    VCardFastPathError,
+    extract_vcard_fields,
+    read_vcard_fields,
+)
+from cards.models import BusinessCard, ContactRequest, CeremeoOutbox, CustomUser
 from cards.validators import (
     validate_business_card_duplication,
     validate_vcard_data,
 )
 
 
+VCARD_ADDRESS_PARTS = ("street", "city", "region", "postal_code", "country")
+
+
 def generate_vcard(data: dict[str, str], user_id: int) -> ContentFile:
-    vcard_content = f"BEGIN:VCARD\n"
-    vcard_content += f"VERSION:3.0\n"
-    vcard_content += f"N:{data.get('last_name')};{data.get('first_name')}\n"
-    vcard_content += f"FN:{data.get('name_and_surname')}\n"
-    vcard_content += f"ORG:{data.get('company')}\n"
-    vcard_content += f"TEL;TYPE=WORK,VOICE:{data.get('phone_number')}\n"
-    vcard_content += f"EMAIL;TYPE=INTERNET:{data.get('email')}\n"
-    vcard_content += f"ADR;TYPE=WORK:;;{data.get('street')};{data.get('city')};{data.get('region')};{data.get('postal_code')};{data.get('country')}\n"
-    vcard_content += f"END:VCARD\n"
+    name_and_surname = data.get("name_and_surname") or ""
+    address = [data.get(part) or "" for part in VCARD_ADDRESS_PARTS]
+    vcard_content = "BEGIN:VCARD\n"
+    vcard_content += "VERSION:3.0\n"
+    vcard_content += f"N:{format_vcard_name(name_and_surname)}\n"
+    vcard_content += f"FN:{escape_vcard_value(name_and_surname)}\n"
+    if data.get("company"):
+        vcard_content += f"ORG:{escape_vcard_value(data['company'])}\n"
+    if data.get("phone_number"):
+        vcard_content += f"TEL;TYPE=WORK,VOICE:{data['phone_number']}\n"
+    if data.get("email"):
+        vcard_content += f"EMAIL;TYPE=INTERNET:{escape_vcard_value(data['email'])}\n"
+    if any(address):
+        address_values = ";".join(escape_vcard_value(part) for part in address)
+        vcard_content += f"ADR;TYPE=WORK:;;{address_values}\n"
+    vcard_content += "END:VCARD\n"
 
     return ContentFile(vcard_content, name=f"user_id-{user_id}.vcf")
 
 
+def get_vcard_hash(vcard_content: str | bytes) -> str:
+    if isinstance(vcard_content, str):
+        vcard_content = vcard_content.encode()
+    return hashlib.sha256(vcard_content).hexdigest()
+
+
+def refresh_business_card_vcard_hash(business_card: BusinessCard) -> None:
+    with business_card.vcard.open("rb") as vcard:
+        business_card.vcard_hash = get_vcard_hash(vcard.read())
+    business_card.vcard_updated_at = timezone.now()
+    business_card.save(update_fields=["vcard_hash", "vcard_updated_at"])
+
+
 def set_business_cart_post_data(request: HttpRequest) -> QueryDict:
     post_data = request.POST.copy()
     post_data["user_photo"] = request.FILES.get("user_photo")
@@ -48,44 +99,65 @@ def set_business_cart_post_data(request: HttpRequest) -> QueryDict:
 def resize_image_to_square(
     uploaded_image: InMemoryUploadedFile, user: User
 ) -> InMemoryUploadedFile:
-    image = Image.open(uploaded_image)
-    image = image.convert("RGB")
-    width, height = image.size
+    image = get_image_ingest(uploaded_image).decode()
+    square_image, square_jpeg = run_cpu_bound(render_square_jpeg, image)
 
-    new_size = min(width, height)
-    square_image = image.resize((new_size, new_size))
-
-    output = BytesIO()
-    square_image.save(output, format="JPEG")
-    output.seek(0)
+    output = BytesIO(square_jpeg)
 
     image_name = f"user_id-{user.id}_{uuid.uuid4()}.jpg"
-    return InMemoryUploadedFile(
+    resized_image = InMemoryUploadedFile(
         output, "ImageField", image_name, "image/jpeg", output.getbuffer().nbytes, None
     )
+    resized_image.ingest = ImageIngest(resized_image, decoded_image=square_image)
+    return resized_image
 
 
-def get_image_dimensions(uploaded_image: InMemoryUploadedFile) -> Tuple[int, int]:
-    image = Image.open(uploaded_image)
-    width, height = image.size
-    return width, height
+def save_photo_thumbnails(
+    rendered: dict[tuple[str, int], bytes], user: User
+) -> dict[str, dict[str, str]]:
+    thumbnails = {image_format: {} for image_format in settings.CARDS_THUMBNAIL_FORMATS}
+    for (image_format, size), content in rendered.items():
+        extension = settings.CARDS_THUMBNAIL_FORMATS[image_format]
+        thumbnails[image_format][str(size)] = default_storage.save(
+            f"thumbnails/user_id-{user.id}_{size}.{extension}", ContentFile(content)
+        )
+    return thumbnails
 
 
-def generate_qr_code(url: str, user_id: int) -> None:
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
+def generate_photo_thumbnails(
+    uploaded_image: InMemoryUploadedFile, user: User
+) -> dict[str, dict[str, str]]:
+    rendered = run_cpu_bound(
+        render_thumbnails,
+        get_image_ingest(uploaded_image).decode(),
+        settings.CARDS_THUMBNAIL_SIZES,
+        tuple(settings.CARDS_THUMBNAIL_FORMATS),
+        settings.CARDS_THUMBNAIL_QUALITY,
     )
+    return save_photo_thumbnails(rendered=rendered, user=user)
 
-    qr.add_data(url)
-    qr.make(fit=True)
 
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    file_name = f"qr_user_id-{user_id}.png"
-    file_path = os.path.join("media", "qr_codes", file_name)
-    qr_image.save(file_path)
+def build_photo_srcset(thumbnails: dict[str, str]) -> str:
+    return ", ".join(
+        f"{default_storage.url(name)} {size}w"
+        for size, name in sorted(thumbnails.items(), key=lambda item: int(item[0]))
+    )
+
+
+def get_lead_photo_context(business_card: BusinessCard) -> dict[str, any]:
+    thumbnails = business_card.photo_thumbnails or {}
+    return {
+        "lead_photo_url": (
+            business_card.user_photo.url if business_card.user_photo else ""
+        ),
+        "lead_photo_srcset": build_photo_srcset(thumbnails.get("jpeg", {})),
+        "lead_photo_webp_srcset": build_photo_srcset(thumbnails.get("webp", {})),
+    }
+
+
+def get_image_dimensions(uploaded_image: InMemoryUploadedFile) -> Tuple[int, int]:
+    width, height = get_image_ingest(uploaded_image).size
+    return width, height
 
 
 def create_business_card(data: dict[str, any], user: User) -> BusinessCard:
@@ -102,15 +174,19 @@ def create_business_card(data: dict[str, any], user: User) -> BusinessCard:
     uploaded_image.name = f"user_id-{user.id}.jpg"
 
     data["vcard"] = vcard
+    data["vcard_hash"] = get_vcard_hash(vcard.read())
+    data["vcard_updated_at"] = timezone.now()
+    data["photo_thumbnails"] = generate_photo_thumbnails(
+        uploaded_image=uploaded_image, user=user
+    )
     data["user_photo"] = uploaded_image
-    generate_qr_code(url=f"{settings.DOMAIN}api/my_card/", user_id=user.id)
 
     return BusinessCard.objects.create(**data, user=user)
 
 
-def get_user_card_qr_url(user: User) -> str:
-    qr_image_path = f"{settings.DOMAIN}media/qr_codes/qr_user_id-{user.id}.png"
-    return qr_image_path
+def get_user_card_qr_url(card_id: uuid.UUID) -> str:
+    qr_image_url = f"{settings.DOMAIN}card/{card_id}/qr/"
+    return qr_image_url
 
 
 def get_user_card_url(card_id: uuid.UUID) -> str:
@@ -118,6 +194,139 @@ def get_user_card_url(card_id: uuid.UUID) -> str:
     return qr_url
 
 
+def get_card_qr_cache_key(
+    card_id: uuid.UUID,
+    image_format: str = "png",
+    size: Optional[int] = None,
+    optimize: bool = False,
+) -> str:
+    domain = hashlib.sha256(settings.DOMAIN.encode()).hexdigest()[:16]
+    return f"cards:qr:{domain}:{card_id}:{image_format}:{size}:{int(optimize)}"
+
+
+def cache_card_qr_code(
+    card_id: uuid.UUID,
+    content: bytes,
+    image_format: str = "png",
+    size: Optional[int] = None,
+    optimize: bool = False,
+) -> Tuple[bytes, str]:
+    etag = hashlib.sha256(settings.DOMAIN.encode() + b"\0" + content).hexdigest()
+    qr_code = (content, quote_etag(etag))
+    cache.set(
+        get_card_qr_cache_key(card_id, image_format, size, optimize),
+        qr_code,
+        settings.CARDS_QR_CACHE_TIMEOUT,
+    )
+    return qr_code
+
+
+def invalidate_card_qr_codes(card_id: uuid.UUID) -> None:
+    cache.delete_many(
+        [
+            get_card_qr_cache_key(card_id, image_format, size, optimize)
+            for image_format in settings.CARDS_QR_FORMATS
+            for size in (None, *settings.CARDS_QR_SIZES)
+            for optimize in (False, True)
+        ]
+    )
+
+
+def get_card_qr_code(
+    card_id: uuid.UUID,
+    image_format: str = "png",
+    size: Optional[int] = None,
+    optimize: bool = False,
+) -> Tuple[bytes, str]:
+    if image_format == "svg":
+        size, optimize = None, False
+    qr_code = cache.get(get_card_qr_cache_key(card_id, image_format, size, optimize))
+    if qr_code is None:
+        get_object_or_404(BusinessCard.objects.only("id"), id=card_id)
+        content = run_cpu_bound(
+            render_qr_code,
+            get_user_card_url(card_id=card_id),
+            image_format,
+            size,
+            optimize,
+        )
+        qr_code = cache_card_qr_code(
+            card_id=card_id,
+            content=content,
+            image_format=image_format,
+            size=size,
+            optimize=optimize,
+        )
+    return qr_code
+
+
+def read_business_card_manifest(manifest_path: str) -> list[dict[str, str]]:
+    with open(manifest_path, newline="", encoding="utf-8") as manifest:
+        if manifest_path.endswith(".json"):
+            return json.load(manifest)
+        return list(csv.DictReader(manifest))
+
+
+def get_usernames_with_business_card(usernames: list[str]) -> set[str]:
+    return set(
+        BusinessCard.objects.filter(user__username__in=usernames).values_list(
+            "user__username", flat=True
+        )
+    )
+
+
+def bulk_create_business_cards(
+    cards: list[tuple[dict[str, any], uuid.UUID, dict[str, any]]]
+) -> list[BusinessCard]:
+    users = {
+        user.username: user
+        for user in CustomUser.objects.filter(
+            username__in=[data["username"] for data, _, _ in cards]
+        )
+    }
+    new_users = []
+    business_cards = []
+    now = timezone.now()
+    for data, card_id, images in cards:
+        user = users.get(data["username"])
+        if user is None:
+            user = CustomUser(username=data["username"])
+            user.set_unusable_password()
+            users[user.username] = user
+            new_users.append(user)
+
+        vcard = generate_vcard(data=data, user_id=user.id)
+        vcard_hash = get_vcard_hash(vcard.read())
+        business_cards.append(
+            BusinessCard(
+                id=card_id,
+                name_and_surname=data["name_and_surname"],
+                company=data["company"],
+                phone_number=data["phone_number"],
+                email=data["email"],
+                user_photo=default_storage.save(
+                    f"images/user_id-{user.id}.jpg", ContentFile(images["photo"])
+                ),
+                vcard=default_storage.save(f"vcard_files/{vcard.name}", vcard),
+                vcard_hash=vcard_hash,
+                vcard_updated_at=now,
+                photo_thumbnails=save_photo_thumbnails(
+                    rendered=images["thumbnails"], user=user
+                ),
+                user=user,
+            )
+        )
+
+    with transaction.atomic():
+        CustomUser.objects.bulk_create(new_users)
+        created_cards = BusinessCard.objects.bulk_create(business_cards)
+
+    for _, card_id, images in cards:
+        if images["qr_code"] is not None:
+            cache_card_qr_code(card_id=card_id, content=images["qr_code"])
+    return created_cards
+
+
 def get_business_card(user_id: uuid.UUID) -> BusinessCard:
     return get_object_or_404(BusinessCard, user_id=user_id)
 
@@ -134,47 +343,79 @@ def create_contact_request(
     return phone, created_contact
 
 
-def parse_vcard_data(vcard_file: SimpleUploadedFile) -> dict[str, str]:
-    if vcard_file is not None:
-        vcard_content = vcard_file.read().decode("utf-8")
-
-        if not vcard_content:
-            return {}
+def submit_first_step_contact_request(
+    data: dict[str, any], requestor: Optional[User], lead: User
+) -> ContactRequest:
+    data["form_step"] = 2
+    with transaction.atomic():
+        phone, contact_request = create_contact_request(
+            data=data, requestor=requestor, lead=lead
+        )
+        enqueue_ceremeo_delivery(data=phone, contact_request=contact_request)
+    return contact_request
+
+
+def convert_vcard_fields_to_ceremeo_format(
+    vcard_fields: dict[str, any]
+) -> dict[str, any]:
+    vcard_data = {
+        "phone": vcard_fields["tel"],
+        "name": vcard_fields["given"],
+        "surname": vcard_fields["family"],
+        "email": vcard_fields["email"],
+        "comments": [],
+    }
 
-        try:
-            vcard = vobject.readOne(vcard_content)
-        except StopIteration:
-            return {}
-
-        vcard_data = {
-            "phone": None,
-            "name": None,
-            "surname": None,
-            "email": None,
-            "comments": [],
-        }
-
-        if vcard.tel:
-            vcard_data["phone"] = vcard.tel.value
-
-        if vcard.n:
-            vcard_data["surname"] = vcard.n.value.family
-            vcard_data["name"] = vcard.n.value.given
-
-        if vcard.email:
-            vcard_data["email"] = vcard.email.value
-
-        if vcard.org:
-            company_name = (
-                vcard.org.value[0]
-                if isinstance(vcard.org.value, list)
-                else vcard.org.value
-            )
-            vcard_data["comments"].append({"text": f"Company: {company_name}"})
+    if vcard_fields["org"] is not None:
+        company_name = (
+            vcard_fields["org"][0]
+            if isinstance(vcard_fields["org"], list)
+            else vcard_fields["org"]
+        )
+        vcard_data["comments"].append({"text": f"Company: {company_name}"})
+
+    return vcard_data
+
+
+def iter_vcard_contacts(
+    vcard_file: SimpleUploadedFile,
+    read_fields: Callable[
+        [Iterable[str]], Iterator[dict[str, any]]
+    ] = extract_vcard_fields,
+) -> Iterator[dict[str, any]]:
+    vcard_file.seek(0)
+    lines = codecs.iterdecode(vcard_file, "utf-8-sig")
+    try:
+        for index, vcard_fields in enumerate(read_fields(lines)):
+            if index >= settings.CARDS_VCARD_MAX_CONTACTS:
+                raise ValidationError(
+                    f"vCard file cannot contain more than "
+                    f"{settings.CARDS_VCARD_MAX_CONTACTS} contacts."
+                )
+            vcard_data = convert_vcard_fields_to_ceremeo_format(vcard_fields)
+            try:
+                validate_vcard_data(vcard_data)
+            except ValidationError:
+                continue
+            yield vcard_data
+    except (vobject.base.ParseError, ValueError, LookupError) as e:
+        raise ValidationError("Invalid vCard file.") from e
+
+
+def parse_vcard_contacts(vcard_file: SimpleUploadedFile) -> list[dict[str, any]]:
+    if vcard_file is None:
+        return []
+    try:
+        return list(iter_vcard_contacts(vcard_file=vcard_file))
+    except VCardFastPathError:
+        return list(
+            iter_vcard_contacts(vcard_file=vcard_file, read_fields=read_vcard_fields)
+        )
 
-        validate_vcard_data(vcard_data)
 
-        return vcard_data
+def parse_vcard_data(vcard_file: SimpleUploadedFile) -> dict[str, str]:
+    if vcard_file is not None:
+        return next(iter(parse_vcard_contacts(vcard_file=vcard_file)), {})
 
 
 def get_phone_number_and_vcard_from_request_data(
@@ -185,30 +426,191 @@ def get_phone_number_and_vcard_from_request_data(
     return phone_number, vcard
 
 
-def send_data_to_ceremeo_api(data: dict[str, str]) -> None | str:
-    try:
-        response = requests.post(settings.CEREMEO_URL, json=data)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        return f"Error sending data to Ceremeo API: {e}"
+def enqueue_parsed_vcard_data(vcard: SimpleUploadedFile) -> list[CeremeoOutbox]:
+    vcard_contacts = parse_vcard_contacts(vcard_file=vcard)
+    if not vcard_contacts:
+        raise ValidationError("vCard file does not contain any valid contact.")
+    return enqueue_ceremeo_deliveries(payloads=vcard_contacts)
 
 
-def send_parsed_vcard_data_to_ceremeo(vcard: SimpleUploadedFile) -> None | str:
-    vcard_data = parse_vcard_data(vcard_file=vcard)
-    error_message = send_data_to_ceremeo_api(data=vcard_data)
-    return error_message
+def enqueue_ceremeo_delivery(
+    data: dict[str, any], contact_request: Optional[ContactRequest] = None
+) -> CeremeoOutbox:
+    return CeremeoOutbox.objects.create(
+        payload=data,
+        contact_request=contact_request,
+        available_at=timezone.now()
+        + timedelta(seconds=settings.CEREMEO_COALESCE_WINDOW),
+    )
+
+
+def enqueue_ceremeo_deliveries(payloads: list[dict[str, any]]) -> list[CeremeoOutbox]:
+    available_at = timezone.now() + timedelta(seconds=settings.CEREMEO_COALESCE_WINDOW)
+    return CeremeoOutbox.objects.bulk_create(
+        [
+            CeremeoOutbox(payload=payload, available_at=available_at)
+            for payload in payloads
+        ]
+    )
+
+
+def advance_contact_request(
+    contact_request: ContactRequest,
+    data: dict[str, any],
+    ceremeo_data: dict[str, any],
+    step: int,
+) -> None:
+    with transaction.atomic():
+        enqueue_ceremeo_delivery(data=ceremeo_data, contact_request=contact_request)
+        update_contact_request(data=data, contact_request=contact_request, step=step)
+
+
+def claim_ceremeo_deliveries(batch_size: int) -> list[CeremeoOutbox]:
+    now = timezone.now()
+    unleased = Q(leased_until__isnull=True) | Q(leased_until__lte=now)
+    with transaction.atomic():
+        deliveries = list(
+            CeremeoOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                unleased, status=CeremeoOutbox.Status.PENDING, available_at__lte=now
+            )
+            .order_by("created_at")[:batch_size]
+        )
+        phones = {delivery.payload.get("phone") for delivery in deliveries} - {None}
+        if phones:
+            deliveries += list(
+                CeremeoOutbox.objects.select_for_update(skip_locked=True)
+                .filter(
+                    unleased,
+                    Q(attempts=0) | Q(available_at__lte=now),
+                    status=CeremeoOutbox.Status.PENDING,
+                    payload__phone__in=phones,
+                )
+                .exclude(id__in=[delivery.id for delivery in deliveries])
+                .order_by("created_at")
+            )
+        CeremeoOutbox.objects.filter(
+            id__in=[delivery.id for delivery in deliveries]
+        ).update(leased_until=now + timedelta(seconds=settings.CEREMEO_OUTBOX_LEASE))
+    return deliveries
+
+
+def merge_ceremeo_payloads(payloads: list[dict[str, any]]) -> dict[str, any]:
+    merged = {}
+    for payload in payloads:
+        for key, value in payload.items():
+            if key == "comments":
+                merged.setdefault("comments", []).extend(value)
+            elif value is not None or key not in merged:
+                merged[key] = value
+    return merged
+
+
+def group_ceremeo_deliveries(
+    deliveries: list[CeremeoOutbox],
+) -> list[list[CeremeoOutbox]]:
+    groups = {}
+    for delivery in sorted(deliveries, key=lambda delivery: delivery.created_at):
+        key = delivery.payload.get("phone") or f"delivery-{delivery.id}"
+        groups.setdefault(key, []).append(delivery)
+    return list(groups.values())
+
+
+def build_ceremeo_submissions(
+    groups: list[list[CeremeoOutbox]],
+) -> list[Tuple[str, str, any, list[CeremeoOutbox]]]:
+    payloads = [
+        merge_ceremeo_payloads([delivery.payload for delivery in group])
+        for group in groups
+    ]
+    if settings.CEREMEO_BULK_URL and groups:
+        deliveries = [delivery for group in groups for delivery in group]
+        return [(settings.CEREMEO_BULK_URL, "bulk", payloads, deliveries)]
+    return [
+        (settings.CEREMEO_URL, "lead", payload, group)
+        for payload, group in zip(payloads, groups)
+    ]
+
+
+def mark_ceremeo_delivery_result(
+    delivery: CeremeoOutbox, error_message: Optional[str]
+) -> None:
+    delivery.attempts += 1
+    delivery.leased_until = None
+    if error_message is None:
+        delivery.status = CeremeoOutbox.Status.SENT
+        delivery.sent_at = timezone.now()
+        delivery.last_error = None
+    elif delivery.attempts >= settings.CEREMEO_OUTBOX_MAX_ATTEMPTS:
+        delivery.status = CeremeoOutbox.Status.FAILED
+        delivery.last_error = error_message
+    else:
+        backoff = settings.CEREMEO_OUTBOX_RETRY_BACKOFF * 2 ** (delivery.attempts - 1)
+        delivery.available_at = timezone.now() + timedelta(seconds=backoff)
+        delivery.last_error = error_message
+    delivery.save(
+        update_fields=[
+            "attempts",
+            "status",
+            "sent_at",
+            "available_at",
+            "leased_until",
+            "last_error",
+        ]
+    )
+
+
+def release_ceremeo_deliveries(deliveries: list[CeremeoOutbox]) -> None:
+    CeremeoOutbox.objects.filter(
+        id__in=[delivery.id for delivery in deliveries]
+    ).update(leased_until=None)
+
+
+def deliver_pending_ceremeo_payloads(batch_size: int) -> Tuple[int, int]:
+    sent, failed = 0, 0
+    endpoint = "bulk" if settings.CEREMEO_BULK_URL else "lead"
+    if get_circuit_breaker(endpoint).state() == CircuitBreaker.OPEN:
+        return sent, failed
+    groups = group_ceremeo_deliveries(claim_ceremeo_deliveries(batch_size=batch_size))
+    submissions = build_ceremeo_submissions(groups=groups)
+    for index, (url, endpoint, payload, deliveries) in enumerate(submissions):
+        try:
+            post_to_ceremeo(url=url, data=payload, endpoint=endpoint)
+        except CircuitOpenError:
+            release_ceremeo_deliveries(
+                deliveries=[
+                    delivery
+                    for *_, pending_deliveries in submissions[index:]
+                    for delivery in pending_deliveries
+                ]
+            )
+            break
+        except requests.exceptions.RequestException as e:
+            for delivery in deliveries:
+                mark_ceremeo_delivery_result(
+                    delivery=delivery,
+                    error_message=f"Error sending data to Ceremeo API: {e}",
+                )
+            failed += len(deliveries)
+        else:
+            for delivery in deliveries:
+                mark_ceremeo_delivery_result(delivery=delivery, error_message=None)
+            sent += len(deliveries)
+    return sent, failed
+
+
+CONTACT_REQUEST_STEP_URLS = {
+    1: "upload_phone_num",
+    2: "requestor_info",
+    3: "contact_prefs",
+    4: "finish_meme",
+}
 
 
 def redirect_based_on_request_contact_state(
     contact_request: ContactRequest,
 ) -> str:
-    redirect_dict = {
-        1: "upload_phone_num",
-        2: "requestor_info",
-        3: "contact_prefs",
-        4: "finish_meme",
-    }
-    return redirect_dict[contact_request.form_step]
+    return CONTACT_REQUEST_STEP_URLS[contact_request.form_step]
 
 
 def get_contact_request(contact_id: uuid.UUID) -> Optional[ContactRequest]:
@@ -218,6 +620,138 @@ def get_contact_request(contact_id: uuid.UUID) -> Optional[ContactRequest]:
         return None
 
 
+async def aget_contact_request(contact_id: uuid.UUID) -> Optional[ContactRequest]:
+    try:
+        return await ContactRequest.objects.aget(id=contact_id)
+    except ObjectDoesNotExist:
+        return None
+
+
+def delete_contact_request(contact_id: uuid.UUID) -> None:
+    ContactRequest.objects.filter(id=contact_id).delete()
+
+
+async def adelete_contact_request(contact_id: uuid.UUID) -> None:
+    await ContactRequest.objects.filter(id=contact_id).adelete()
+
+
+CONTACT_REQUEST_EXPORT_FIELDS = [
+    "phone_number",
+    "name_and_surname",
+    "email",
+    "company_or_contact_place",
+    "contact_date",
+    "contact_topic",
+]
+
+
+class EchoBuffer:
+    def write(self, value: str) -> str:
+        return value
+
+
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_csv_value(value: Optional[str]) -> Optional[str]:
+    if value and value.startswith(CSV_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def escape_vcard_value(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace(",", "\\,")
+        .replace(";", "\\;")
+    )
+
+
+def format_vcard_name(name_and_surname: str) -> str:
+    *given_names, family_name = name_and_surname.split() or [""]
+    given_name = " ".join(given_names)
+    return f"{escape_vcard_value(family_name)};{escape_vcard_value(given_name)};;;"
+
+
+def get_contact_request_export_values(
+    contact_request: ContactRequest,
+) -> list[Optional[str]]:
+    contact_date = contact_request.contact_date
+    return [
+        str(contact_request.phone_number),
+        contact_request.name_and_surname,
+        contact_request.email,
+        contact_request.company_or_contact_place,
+        contact_date.isoformat() if contact_date else None,
+        contact_request.contact_topic,
+    ]
+
+
+def format_contact_request_vcard(contact_request: ContactRequest) -> str:
+    phone, name, email, company, contact_date, topic = (
+        get_contact_request_export_values(contact_request)
+    )
+    vcard_content = "BEGIN:VCARD\n"
+    vcard_content += "VERSION:3.0\n"
+    vcard_content += f"N:{format_vcard_name(name or '')}\n"
+    vcard_content += f"FN:{escape_vcard_value(name or phone)}\n"
+    vcard_content += f"TEL;TYPE=CELL:{phone}\n"
+    if email:
+        vcard_content += f"EMAIL;TYPE=INTERNET:{escape_vcard_value(email)}\n"
+    if company:
+        vcard_content += f"ORG:{escape_vcard_value(company)}\n"
+    note = " - ".join(value for value in [contact_date, topic] if value)
+    if note:
+        vcard_content += f"NOTE:{escape_vcard_value(note)}\n"
+    vcard_content += "END:VCARD\n"
+    return vcard_content
+
+
+def format_contact_request_export(
+    contact_request: ContactRequest, export_format: str, csv_writer
+) -> str:
+    if export_format == "vcf":
+        return format_contact_request_vcard(contact_request)
+    values = get_contact_request_export_values(contact_request)
+    if export_format == "csv":
+        phone, *text_values = values
+        return csv_writer.writerow(
+            [phone, *(escape_csv_value(value) for value in text_values)]
+        )
+    return json.dumps(dict(zip(CONTACT_REQUEST_EXPORT_FIELDS, values))) + "\n"
+
+
+def get_received_contact_requests_for_export(lead: User):
+    return (
+        ContactRequest.objects.filter(lead=lead)
+        .only(*CONTACT_REQUEST_EXPORT_FIELDS)
+        .order_by("id")
+    )
+
+
+def stream_contact_requests_export(lead: User, export_format: str) -> Iterator[str]:
+    csv_writer = csv.writer(EchoBuffer())
+    if export_format == "csv":
+        yield csv_writer.writerow(CONTACT_REQUEST_EXPORT_FIELDS)
+    for contact_request in get_received_contact_requests_for_export(lead).iterator(
+        chunk_size=settings.CARDS_EXPORT_CHUNK_SIZE
+    ):
+        yield format_contact_request_export(contact_request, export_format, csv_writer)
+
+
+async def astream_contact_requests_export(
+    lead: User, export_format: str
+) -> AsyncIterator[str]:
+    csv_writer = csv.writer(EchoBuffer())
+    if export_format == "csv":
+        yield csv_writer.writerow(CONTACT_REQUEST_EXPORT_FIELDS)
+    async for contact_request in get_received_contact_requests_for_export(
+        lead
+    ).aiterator(chunk_size=settings.CARDS_EXPORT_CHUNK_SIZE):
+        yield format_contact_request_export(contact_request, export_format, csv_writer)
+
+
 def convert_request_data_to_ceremeo_format_second_step(
     data: dict[str, str], phone: str
 ) -> dict[str, str]:
@@ -0,0 +1,30 @@
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cards.models import BusinessCard
+from cards.projections import invalidate_card_projection
+from cards.services import invalidate_card_qr_codes
+from cards.timing import record_query
+
+
+@receiver([post_save, post_delete], sender=BusinessCard)
+def invalidate_business_card_projection(
+    sender, instance: BusinessCard, created: bool = False, **kwargs
+) -> None:
+    if created:
+        return
+    invalidate_card_projection(instance.id)
+    transaction.on_commit(lambda: invalidate_card_projection(instance.id))
+
+
+@receiver(post_delete, sender=BusinessCard)
+def invalidate_business_card_qr_codes(sender, instance: BusinessCard, **kwargs) -> None:
+    invalidate_card_qr_codes(instance.id)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,36 @@
+import os
+import threading
+from typing import Optional
+
+import magic
+from django.core.files import File
+
+from cards.images import ImageIngest
+
+HEADER_SIZE = ImageIngest.HEADER_SIZE
+
+_magic: Optional[magic.Magic] = None
+_magic_pid: Optional[int] = None
+_magic_lock = threading.Lock()
+
+
+def get_magic() -> magic.Magic:
+    global _magic, _magic_pid
+    pid = os.getpid()
+    if _magic is None or _magic_pid != pid:
+        with _magic_lock:
+            if _magic is None or _magic_pid != pid:
+                _magic = magic.Magic(mime=True)
+                _magic_pid = pid
+    return _magic
+
+
+def read_file_header(uploaded_file: File, size: int = HEADER_SIZE) -> bytes:
+    uploaded_file.seek(0)
+    header = uploaded_file.read(size)
+    uploaded_file.seek(0)
+    return header
+
+
+def sniff_mime_type(header: bytes) -> str:
+    return get_magic().from_buffer(header[:HEADER_SIZE])
@@ -0,0 +1,30 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from cards.models import BusinessCard
+from cards.projections import clear_local_card_projections
+from cards.timing import clear_request_metrics
+
+CustomUser = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    clear_local_card_projections()
+    clear_request_metrics()
+    yield
+    cache.clear()
+    clear_local_card_projections()
+
+
+@pytest.fixture
+def business_card() -> BusinessCard:
+    return BusinessCard.objects.create(
+        name_and_surname="Jan Kowalski",
+        company="Firma",
+        phone_number="+48600100200",
+        email="jan@example.com",
+        user=CustomUser.objects.create(username="jan"),
+    )
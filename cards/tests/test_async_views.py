@@ -0,0 +1,250 @@
+import mimetypes
+import os
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+
+from BusinessApp import settings
+from cards.async_views import (
+    AsyncContactRequestExportView,
+    AsyncContactRequestFirstStepView,
+    AsyncContactRequestSecondStepView,
+    AsyncContactRequestThirdStepView,
+    AsyncCompletedContactRequestView,
+)
+from cards.funnel import FUNNEL_TOKEN_SALT
+from cards.models import BusinessCard, ContactRequest, CeremeoOutbox
+
+CustomUser = get_user_model()
+
+
+@pytest.fixture
+def request_factory() -> AsyncRequestFactory:
+    return AsyncRequestFactory()
+
+
+@pytest.fixture
+def lead() -> CustomUser:
+    return CustomUser.objects.create(username="asynclead", password="test999111")
+
+
+@pytest.fixture
+def in_memory_image():
+    filename = "valid_image.jpg"
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    test_image_path = os.path.join(current_dir, "test_data", "test_images", filename)
+    content_type, _ = mimetypes.guess_type(test_image_path)
+    with open(test_image_path, "rb") as f:
+        return SimpleUploadedFile(filename, f.read(), content_type)
+
+
+@pytest.fixture
+def business_card(lead: CustomUser, in_memory_image: SimpleUploadedFile):
+    business_card = BusinessCard.objects.create(
+        name_and_surname="John Doe",
+        company="testcompany",
+        phone_number="+48264354758",
+        email="user@gmail.com",
+        user_photo=in_memory_image,
+        vcard=None,
+        user=lead,
+    )
+    yield business_card
+    os.remove(business_card.user_photo.path)
+
+
+def contact_request_at_step(lead: CustomUser, step: int) -> ContactRequest:
+    return ContactRequest.objects.create(
+        lead=lead, requestor=None, phone_number="+48374958767", form_step=step
+    )
+
+
+def call_view(view_class, request, card_id):
+    async def anonymous_user():
+        return AnonymousUser()
+
+    request.auser = anonymous_user
+    return async_to_sync(view_class.as_view())(request, card_id=card_id)
+
+
+@pytest.mark.django_db
+class TestAsyncContactRequestViews:
+    def test_async_first_step_view_return_200(
+        self, request_factory: AsyncRequestFactory, business_card: BusinessCard
+    ):
+        request = request_factory.get("/")
+        response = call_view(
+            AsyncContactRequestFirstStepView, request, business_card.id
+        )
+        assert response.status_code == 200
+
+    def test_async_first_step_view_create_contact_and_enqueue_phone(
+        self, request_factory: AsyncRequestFactory, business_card: BusinessCard
+    ):
+        request = request_factory.post("/", data={"phone_number": "+48564738467"})
+        response = call_view(
+            AsyncContactRequestFirstStepView, request, business_card.id
+        )
+        created_contact = ContactRequest.objects.get(phone_number="+48564738467")
+        assert response.status_code == 302
+        assert (
+            response.url
+            == reverse("requestor_info", kwargs={"card_id": business_card.id})
+            + f"?contact_request_id={created_contact.id}"
+        )
+        assert created_contact.form_step == 2
+        assert CeremeoOutbox.objects.filter(contact_request=created_contact).exists()
+
+    def test_async_first_step_view_return_400_when_post_data_invalid(
+        self, request_factory: AsyncRequestFactory, business_card: BusinessCard
+    ):
+        request = request_factory.post("/", data={"phone_number": "+50736453647"})
+        response = call_view(
+            AsyncContactRequestFirstStepView, request, business_card.id
+        )
+        assert response.status_code == 400
+
+    def test_async_first_step_view_enqueue_every_contact_of_uploaded_vcard(
+        self, request_factory: AsyncRequestFactory, business_card: BusinessCard
+    ):
+        vcard_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "test_data",
+            "test_vcards",
+            "multi_contact_vcard.vcf",
+        )
+        with open(vcard_path, "rb") as vcard:
+            request = request_factory.post("/", data={"vcard": vcard})
+        response = call_view(
+            AsyncContactRequestFirstStepView, request, business_card.id
+        )
+        assert response.status_code == 200
+        assert b"Odebrane kontakty: 2" in response.content
+        assert CeremeoOutbox.objects.count() == 2
+
+    def test_async_second_step_view_redirect_if_form_step_invalid_for_view(
+        self,
+        request_factory: AsyncRequestFactory,
+        business_card: BusinessCard,
+        lead: CustomUser,
+    ):
+        contact_request = contact_request_at_step(lead=lead, step=3)
+        request = request_factory.get(
+            "/", data={"contact_request_id": contact_request.id}
+        )
+        response = call_view(
+            AsyncContactRequestSecondStepView, request, business_card.id
+        )
+        assert response.status_code == 302
+        assert (
+            response.url
+            == reverse("contact_prefs", kwargs={"card_id": business_card.id})
+            + f"?contact_request_id={contact_request.id}"
+        )
+
+    def test_async_second_step_view_route_by_funnel_cookie_without_queries(
+        self,
+        request_factory: AsyncRequestFactory,
+        business_card: BusinessCard,
+        lead: CustomUser,
+        django_assert_num_queries,
+    ):
+        contact_request = contact_request_at_step(lead=lead, step=3)
+        request = request_factory.get("/")
+        request.COOKIES[settings.CARDS_FUNNEL_COOKIE_NAME] = signing.dumps(
+            [str(business_card.id), str(contact_request.id), 3], salt=FUNNEL_TOKEN_SALT
+        )
+        with django_assert_num_queries(0):
+            response = call_view(
+                AsyncContactRequestSecondStepView, request, business_card.id
+            )
+        assert response.status_code == 302
+        assert (
+            response.url
+            == reverse("contact_prefs", kwargs={"card_id": business_card.id})
+            + f"?contact_request_id={contact_request.id}"
+        )
+
+    def test_async_second_step_view_advance_contact_when_data_posted(
+        self,
+        request_factory: AsyncRequestFactory,
+        business_card: BusinessCard,
+        lead: CustomUser,
+    ):
+        contact_request = contact_request_at_step(lead=lead, step=2)
+        data = {
+            "name_and_surname": "test user",
+            "email": "testemail@gmail.com",
+            "company_or_contact_place": "sadffsd",
+            "contact_request_id": contact_request.id,
+        }
+        request = request_factory.post("/", data=data)
+        response = call_view(
+            AsyncContactRequestSecondStepView, request, business_card.id
+        )
+        contact_request.refresh_from_db()
+        assert response.status_code == 302
+        assert contact_request.form_step == 3
+        assert contact_request.name_and_surname == data["name_and_surname"]
+
+    def test_async_third_step_view_return_200_if_form_step_correct(
+        self,
+        request_factory: AsyncRequestFactory,
+        business_card: BusinessCard,
+        lead: CustomUser,
+    ):
+        contact_request = contact_request_at_step(lead=lead, step=3)
+        request = request_factory.get(
+            "/", data={"contact_request_id": contact_request.id}
+        )
+        response = call_view(
+            AsyncContactRequestThirdStepView, request, business_card.id
+        )
+        assert response.status_code == 200
+
+    def test_async_completed_view_return_200_and_delete_contact_request(
+        self,
+        request_factory: AsyncRequestFactory,
+        business_card: BusinessCard,
+        lead: CustomUser,
+    ):
+        contact_request = contact_request_at_step(lead=lead, step=4)
+        request = request_factory.get(
+            "/", data={"contact_request_id": contact_request.id}
+        )
+        response = call_view(
+            AsyncCompletedContactRequestView, request, business_card.id
+        )
+        assert response.status_code == 200
+        assert not ContactRequest.objects.filter(id=contact_request.id).exists()
+
+
+@pytest.mark.django_db
+class TestAsyncContactRequestExportView:
+    def test_async_export_view_stream_received_contact_requests(
+        self, request_factory: AsyncRequestFactory, lead: CustomUser
+    ):
+        contact_request_at_step(lead=lead, step=2)
+        request = request_factory.get("/", {"format": "ndjson"})
+
+        async def authenticated_user():
+            return lead
+
+        async def read_streaming_content():
+            response = await AsyncContactRequestExportView.as_view()(request)
+            return response, [chunk async for chunk in response.streaming_content]
+
+        request.auser = authenticated_user
+        response, chunks = async_to_sync(read_streaming_content)()
+        assert response.is_async
+        assert chunks == [
+            b'{"phone_number": "+48374958767", "name_and_surname": null, '
+            b'"email": null, "company_or_contact_place": null, '
+            b'"contact_date": null, "contact_topic": null}\n'
+        ]
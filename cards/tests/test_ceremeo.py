@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+import requests_mock
+
+from BusinessApp import settings
+from cards.ceremeo import (
+    build_ceremeo_session,
+    get_ceremeo_session,
+    post_to_ceremeo,
+    get_circuit_breaker,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+@pytest.fixture
+def request_mocker():
+    with requests_mock.Mocker() as mocker:
+        yield mocker
+
+
+class TestCeremeoSession:
+    def test_get_ceremeo_session_return_same_session_for_process(self):
+        assert get_ceremeo_session() is get_ceremeo_session()
+
+    def test_build_ceremeo_session_configure_pool_and_retries(self):
+        session = build_ceremeo_session()
+        adapter = session.get_adapter(settings.CEREMEO_URL)
+        assert adapter._pool_connections == settings.CEREMEO_POOL_CONNECTIONS
+        assert adapter._pool_maxsize == settings.CEREMEO_POOL_MAXSIZE
+        assert adapter.max_retries.total == settings.CEREMEO_MAX_RETRIES
+        assert adapter.max_retries.read == 0
+        assert "POST" in adapter.max_retries.allowed_methods
+        assert 502 not in adapter.max_retries.status_forcelist
+        assert not adapter.max_retries.respect_retry_after_header
+
+    def test_post_to_ceremeo_send_json_with_timeouts(self, request_mocker):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        post_to_ceremeo(url=settings.CEREMEO_URL, data={"phone": "+48635495647"})
+        assert request_mocker.last_request.json() == {"phone": "+48635495647"}
+        assert request_mocker.last_request.timeout == (
+            settings.CEREMEO_CONNECT_TIMEOUT,
+            settings.CEREMEO_READ_TIMEOUT,
+        )
+
+    def test_post_to_ceremeo_raise_for_error_status(self, request_mocker):
+        request_mocker.post(settings.CEREMEO_URL, status_code=500)
+        with pytest.raises(requests.exceptions.HTTPError):
+            post_to_ceremeo(url=settings.CEREMEO_URL, data={"phone": "+48635495647"})
+
+
+@pytest.fixture
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(endpoint="test", failure_threshold=2, reset_timeout=30)
+
+
+class TestCircuitBreaker:
+    def test_circuit_breaker_open_after_failure_threshold(
+        self, breaker: CircuitBreaker
+    ):
+        breaker.record_failure()
+        assert breaker.state() == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state() == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_circuit_breaker_allow_single_probe_when_half_open(
+        self, breaker: CircuitBreaker
+    ):
+        breaker.record_failure()
+        breaker.record_failure()
+        with patch("cards.ceremeo.time.time", return_value=10**10):
+            assert breaker.state() == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request()
+            assert not breaker.allow_request()
+            breaker.record_success()
+            assert breaker.state() == CircuitBreaker.CLOSED
+
+    def test_circuit_breaker_reopen_when_probe_fails(self, breaker: CircuitBreaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        with patch("cards.ceremeo.time.time", return_value=10**10):
+            assert breaker.allow_request()
+            breaker.record_failure()
+            assert breaker.state() == CircuitBreaker.OPEN
+
+    def test_circuit_breaker_stats_return_error_rate(self, breaker: CircuitBreaker):
+        breaker.record_success()
+        breaker.record_success(rejected=True)
+        breaker.record_failure()
+        breaker.record_success()
+        stats = breaker.stats()
+        assert stats["requests"] == 4
+        assert stats["errors"] == 2
+        assert stats["error_rate"] == 0.5
+
+    def test_post_to_ceremeo_fail_fast_when_circuit_open(self, request_mocker):
+        request_mocker.post(settings.CEREMEO_URL, status_code=503)
+        for _ in range(settings.CEREMEO_CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(requests.exceptions.HTTPError):
+                post_to_ceremeo(url=settings.CEREMEO_URL, data={})
+        with pytest.raises(CircuitOpenError):
+            post_to_ceremeo(url=settings.CEREMEO_URL, data={})
+        assert request_mocker.call_count == settings.CEREMEO_CIRCUIT_FAILURE_THRESHOLD
+
+    def test_post_to_ceremeo_not_open_circuit_on_client_errors(self, request_mocker):
+        request_mocker.post(settings.CEREMEO_URL, status_code=400)
+        for _ in range(settings.CEREMEO_CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(requests.exceptions.HTTPError):
+                post_to_ceremeo(url=settings.CEREMEO_URL, data={})
+        assert get_circuit_breaker("lead").state() == CircuitBreaker.CLOSED
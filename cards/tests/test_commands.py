@@ -0,0 +1,185 @@
+import csv
+import os
+import shutil
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+from BusinessApp import settings
+from cards.management.commands.run_ceremeo_stub import build_ceremeo_stub_server
+from cards.models import BusinessCard, CeremeoOutbox
+from cards.services import (
+    enqueue_ceremeo_delivery,
+    deliver_pending_ceremeo_payloads,
+    get_card_qr_cache_key,
+)
+
+
+@pytest.fixture
+def request_mocker():
+    with requests_mock.Mocker() as mocker:
+        yield mocker
+
+
+@pytest.fixture
+def no_coalesce_window():
+    with patch.object(settings, "CEREMEO_COALESCE_WINDOW", 0):
+        yield
+
+
+@pytest.fixture
+def ceremeo_stub():
+    server = build_ceremeo_stub_server(host="127.0.0.1", port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=str(tmp_path / "media")):
+        yield tmp_path / "media"
+
+
+@pytest.fixture
+def card_manifest(tmp_path):
+    photo_dir = tmp_path / "photos"
+    photo_dir.mkdir()
+    shutil.copy(
+        os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "test_data",
+            "test_images",
+            "valid_image.jpg",
+        ),
+        photo_dir / "valid_image.jpg",
+    )
+    manifest_path = tmp_path / "manifest.csv"
+    with open(manifest_path, "w", newline="") as manifest:
+        writer = csv.DictWriter(
+            manifest,
+            fieldnames=[
+                "username",
+                "name_and_surname",
+                "company",
+                "phone_number",
+                "email",
+                "photo",
+            ],
+        )
+        writer.writeheader()
+        for username, phone_number, photo in [
+            ("employee1", "+48564835465", "valid_image.jpg"),
+            ("employee2", "+48564835466", "valid_image.jpg"),
+            ("employee3", "+48564835467", "missing_image.jpg"),
+        ]:
+            writer.writerow(
+                {
+                    "username": username,
+                    "name_and_surname": "John Doe",
+                    "company": "testcompany",
+                    "phone_number": phone_number,
+                    "email": f"{username}@gmail.com",
+                    "photo": photo,
+                }
+            )
+    return str(manifest_path), str(photo_dir)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("no_coalesce_window")
+class TestDrainCeremeoOutboxCommand:
+    def test_drain_ceremeo_outbox_once_deliver_pending_payloads(self, request_mocker):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        for phone in ["+48564835465", "+48564835466", "+48564835467"]:
+            enqueue_ceremeo_delivery(data={"phone": phone})
+        call_command("drain_ceremeo_outbox", "--once", "--batch-size", "2")
+        assert request_mocker.call_count == 3
+        assert (
+            CeremeoOutbox.objects.filter(status=CeremeoOutbox.Status.SENT).count() == 3
+        )
+
+
+@pytest.mark.django_db
+class TestCeremeoStatusCommand:
+    def test_ceremeo_status_print_circuit_state_and_backlog(self, capsys):
+        enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        call_command("ceremeo_status")
+        output = capsys.readouterr().out
+        assert "lead: state=closed" in output
+        assert "outbox pending: 1" in output
+        assert "bulk:" not in output
+
+    def test_ceremeo_status_include_bulk_endpoint_when_configured(self, capsys):
+        with patch.object(
+            settings, "CEREMEO_BULK_URL", "https://ceremeo.test/api/v1/lead/bulk/"
+        ):
+            call_command("ceremeo_status")
+        output = capsys.readouterr().out
+        assert "lead: state=closed" in output
+        assert "bulk: state=closed" in output
+
+    def test_ceremeo_status_show_only_requested_endpoint(self, capsys):
+        with patch.object(
+            settings, "CEREMEO_BULK_URL", "https://ceremeo.test/api/v1/lead/bulk/"
+        ):
+            call_command("ceremeo_status", "--endpoint", "bulk")
+        output = capsys.readouterr().out
+        assert "bulk: state=closed" in output
+        assert "lead:" not in output
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("no_coalesce_window")
+class TestRunCeremeoStubCommand:
+    def test_ceremeo_stub_accept_bulk_submission(self, ceremeo_stub):
+        host, port = ceremeo_stub.server_address
+        enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        enqueue_ceremeo_delivery(data={"phone": "+48564835466"})
+        with patch.object(
+            settings, "CEREMEO_BULK_URL", f"http://{host}:{port}/api/v1/lead/bulk/"
+        ):
+            assert deliver_pending_ceremeo_payloads(batch_size=10) == (2, 0)
+        assert ceremeo_stub.stats == {"requests": 1, "leads": 2}
+
+
+@pytest.mark.django_db
+class TestImportBusinessCardsCommand:
+    def test_import_business_cards_create_cards_and_skip_them_on_rerun(
+        self, card_manifest, media_root, capsys
+    ):
+        manifest_path, photo_dir = card_manifest
+        call_command(
+            "import_business_cards",
+            manifest_path,
+            "--photo-dir",
+            photo_dir,
+            "--workers",
+            "1",
+            "--warm-qr-cache",
+        )
+        output = capsys.readouterr()
+        assert "Imported 2/3 cards, 1 failed." in output.out
+        assert "employee3" in output.err
+
+        business_cards = BusinessCard.objects.select_related("user")
+        assert {card.user.username for card in business_cards} == {
+            "employee1",
+            "employee2",
+        }
+        for card in business_cards:
+            assert (media_root / card.user_photo.name).exists()
+            assert (media_root / card.vcard.name).exists()
+            assert set(card.photo_thumbnails) == set(settings.CARDS_THUMBNAIL_FORMATS)
+            assert cache.get(get_card_qr_cache_key(card.id)) is not None
+
+        call_command("import_business_cards", manifest_path, "--photo-dir", photo_dir)
+        assert "Importing 1 cards, skipping 2." in capsys.readouterr().out
+        assert BusinessCard.objects.count() == 2
@@ -0,0 +1,57 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from BusinessApp import settings
+from cards import executors
+from cards.executors import (
+    run_cpu_bound,
+    get_image_executor,
+    shutdown_image_executor,
+    ExecutorBusyError,
+)
+from cards.images import render_qr_code, render_square_jpeg
+
+
+@pytest.fixture
+def process_pool():
+    with patch.object(settings, "CARDS_IMAGE_EXECUTOR_WORKERS", 1), patch.object(
+        settings, "CARDS_IMAGE_EXECUTOR_MAX_PENDING", 1
+    ):
+        yield get_image_executor()
+        shutdown_image_executor()
+
+
+class TestImageExecutor:
+    def test_run_cpu_bound_run_inline_when_no_workers_configured(self):
+        assert get_image_executor() is None
+        square_image, square_jpeg = run_cpu_bound(
+            render_square_jpeg, Image.new("RGB", (120, 200))
+        )
+        assert square_image.size == (120, 120)
+        assert square_jpeg.startswith(b"\xff\xd8")
+
+    def test_run_cpu_bound_run_in_process_pool(self, process_pool):
+        qr_png = run_cpu_bound(render_qr_code, "https://example.com/card/")
+        assert process_pool is not None
+        assert qr_png.startswith(b"\x89PNG")
+
+    def test_run_cpu_bound_raise_when_queue_full(self, process_pool):
+        executors._executor_slots.acquire()
+        try:
+            with patch.object(settings, "CARDS_IMAGE_EXECUTOR_TIMEOUT", 0.01):
+                with pytest.raises(ExecutorBusyError):
+                    run_cpu_bound(render_qr_code, "https://example.com/card/")
+        finally:
+            executors._executor_slots.release()
+
+    def test_run_cpu_bound_keep_slot_until_timed_out_job_finishes(self, process_pool):
+        run_cpu_bound(render_qr_code, "https://example.com/card/")
+        with patch.object(settings, "CARDS_IMAGE_EXECUTOR_TIMEOUT", 0.05):
+            with pytest.raises(ExecutorBusyError):
+                run_cpu_bound(time.sleep, 1)
+        assert not executors._executor_slots.acquire(blocking=False)
+        assert executors._executor_slots.acquire(timeout=10)
+        executors._executor_slots.release()
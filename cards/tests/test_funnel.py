@@ -0,0 +1,269 @@
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core import signing
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from BusinessApp import settings
+from cards.funnel import FUNNEL_TOKEN_SALT
+from cards.models import BusinessCard, ContactRequest, CeremeoOutbox
+from cards.projections import get_card_projection
+
+CustomUser = get_user_model()
+
+FUNNEL_STEPS = [
+    ("upload_phone_num", {"phone_number": "+48564738467"}),
+    (
+        "requestor_info",
+        {
+            "name_and_surname": "Anna Nowak",
+            "email": "anna@example.com",
+            "company_or_contact_place": "Targi",
+        },
+    ),
+    ("contact_prefs", {"contact_topic": "Oferta"}),
+    ("finish_meme", None),
+]
+
+FUNNEL_QUERY_BUDGET = {
+    "GET upload_phone_num": 1,
+    "POST upload_phone_num": 4,
+    "GET requestor_info": 0,
+    "POST requestor_info": 3,
+    "GET contact_prefs": 0,
+    "POST contact_prefs": 3,
+    "GET finish_meme": 3,
+}
+
+TRANSACTION_STATEMENTS = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+@pytest.fixture
+def funnel_client(business_card: BusinessCard) -> Client:
+    client = Client()
+    client.post(
+        reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+        data={"phone_number": "+48564738467"},
+    )
+    get_card_projection(card_id=business_card.id)
+    return client
+
+
+def get_funnel_token(client: Client) -> dict:
+    return signing.loads(
+        client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME].value, salt=FUNNEL_TOKEN_SALT
+    )
+
+
+@pytest.mark.django_db
+class TestFunnelState:
+    def test_first_step_post_set_signed_funnel_cookie(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        contact_request = ContactRequest.objects.get()
+        cookie = funnel_client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME]
+        assert get_funnel_token(funnel_client) == [
+            str(business_card.id),
+            str(contact_request.id),
+            2,
+        ]
+        assert cookie["path"] == f"/contact_request/{business_card.id}/"
+        assert cookie["httponly"]
+
+    def test_second_step_get_render_without_queries(
+        self,
+        business_card: BusinessCard,
+        funnel_client: Client,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(0):
+            response = funnel_client.get(
+                reverse("requestor_info", kwargs={"card_id": business_card.id})
+            )
+        assert response.status_code == 200
+        assert str(ContactRequest.objects.get().id).encode() in response.content
+
+    def test_third_step_get_redirect_to_token_step_without_queries(
+        self,
+        business_card: BusinessCard,
+        funnel_client: Client,
+        django_assert_num_queries,
+    ):
+        with django_assert_num_queries(0):
+            response = funnel_client.get(
+                reverse("contact_prefs", kwargs={"card_id": business_card.id})
+            )
+        assert response.status_code == 302
+        assert response.url == (
+            reverse("requestor_info", kwargs={"card_id": business_card.id})
+            + f"?contact_request_id={ContactRequest.objects.get().id}"
+        )
+
+    def test_second_step_post_advance_funnel_cookie(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        response = funnel_client.post(
+            reverse("requestor_info", kwargs={"card_id": business_card.id}),
+            data={
+                "name_and_surname": "Anna Nowak",
+                "email": "anna@example.com",
+                "company_or_contact_place": "Targi",
+            },
+        )
+        assert response.status_code == 302
+        assert get_funnel_token(funnel_client)[2] == 3
+        assert ContactRequest.objects.get().form_step == 3
+
+    def test_stale_second_step_post_redirect_without_write(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        data = {
+            "name_and_surname": "Anna Nowak",
+            "email": "anna@example.com",
+            "company_or_contact_place": "Targi",
+        }
+        url = reverse("requestor_info", kwargs={"card_id": business_card.id})
+        funnel_client.post(url, data=data)
+        outbox_size = CeremeoOutbox.objects.count()
+        response = funnel_client.post(url, data=data)
+        assert response.status_code == 302
+        assert response.url.startswith(
+            reverse("contact_prefs", kwargs={"card_id": business_card.id})
+        )
+        assert CeremeoOutbox.objects.count() == outbox_size
+
+    def test_tampered_funnel_cookie_fall_back_to_query_string(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        funnel_client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME] = signing.dumps(
+            [str(business_card.id), str(uuid.uuid4()), 3], salt="another.salt"
+        )
+        response = funnel_client.get(
+            reverse("requestor_info", kwargs={"card_id": business_card.id})
+        )
+        assert response.status_code == 302
+        assert response.url == reverse(
+            "upload_phone_num", kwargs={"card_id": business_card.id}
+        )
+
+    def test_funnel_cookie_for_another_card_is_ignored(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        token = funnel_client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME].value
+        other_card_id = uuid.uuid4()
+        client = Client()
+        client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME] = token
+        response = client.get(
+            reverse("requestor_info", kwargs={"card_id": other_card_id})
+        )
+        assert response.status_code == 302
+        assert response.url == reverse(
+            "upload_phone_num", kwargs={"card_id": other_card_id}
+        )
+
+    def test_finish_view_delete_contact_request_and_clear_funnel_cookie(
+        self, business_card: BusinessCard, funnel_client: Client
+    ):
+        contact_request = ContactRequest.objects.get()
+        funnel_client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME] = signing.dumps(
+            [str(business_card.id), str(contact_request.id), 4], salt=FUNNEL_TOKEN_SALT
+        )
+        response = funnel_client.get(
+            reverse("finish_meme", kwargs={"card_id": business_card.id})
+        )
+        assert response.status_code == 200
+        assert not ContactRequest.objects.exists()
+        assert funnel_client.cookies[settings.CARDS_FUNNEL_COOKIE_NAME].value == ""
+
+
+def walk_funnel(client: Client, business_card: BusinessCard) -> list[str]:
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse("upload_phone_num", kwargs={"card_id": business_card.id}))
+        response = client.post(
+            reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+            data={"phone_number": "+48564738467"},
+        )
+        client.get(response.url)
+        response = client.post(
+            reverse("requestor_info", kwargs={"card_id": business_card.id}),
+            data={
+                "name_and_surname": "Anna Nowak",
+                "email": "anna@example.com",
+                "company_or_contact_place": "Targi",
+            },
+        )
+        client.get(response.url)
+        response = client.post(
+            reverse("contact_prefs", kwargs={"card_id": business_card.id}),
+            data={"contact_topic": "Oferta"},
+        )
+        assert client.get(response.url).status_code == 200
+    return [query["sql"] for query in queries.captured_queries]
+
+
+@pytest.mark.django_db
+class TestSessionFreeFunnel:
+    def test_anonymous_funnel_never_touch_session_table(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        queries = walk_funnel(client=client, business_card=business_card)
+        assert not any("django_session" in query for query in queries)
+        assert "sessionid" not in client.cookies
+        assert not Session.objects.exists()
+
+    @override_settings(
+        SESSION_ENGINE=settings.SESSION_ENGINES["signed_cookies"],
+        MESSAGE_STORAGE="django.contrib.messages.storage.cookie.CookieStorage",
+    )
+    def test_signed_cookie_sessions_record_requestor_without_session_table(
+        self, business_card: BusinessCard
+    ):
+        requestor = CustomUser.objects.create(username="anna")
+        client = Client()
+        client.force_login(requestor)
+        with CaptureQueriesContext(connection) as queries:
+            client.post(
+                reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+                data={"phone_number": "+48564738467"},
+            )
+        assert ContactRequest.objects.get().requestor == requestor
+        assert not any(
+            "django_session" in query["sql"] for query in queries.captured_queries
+        )
+        assert not Session.objects.exists()
+
+
+def count_queries(queries: CaptureQueriesContext) -> int:
+    return sum(
+        not query["sql"].startswith(TRANSACTION_STATEMENTS)
+        for query in queries.captured_queries
+    )
+
+
+@pytest.mark.django_db
+class TestFunnelQueryBudget:
+    def test_funnel_steps_stay_within_query_budget(self, business_card: BusinessCard):
+        client = Client()
+        url = reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        step_queries = {}
+        for step, data in FUNNEL_STEPS:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            assert response.status_code == 200
+            assert response.resolver_match.url_name == step
+            step_queries[f"GET {step}"] = count_queries(queries)
+            if data is None:
+                continue
+            with CaptureQueriesContext(connection) as queries:
+                response = client.post(url, data=data)
+            assert response.status_code == 302
+            step_queries[f"POST {step}"] = count_queries(queries)
+            url = response.url
+        assert step_queries == FUNNEL_QUERY_BUDGET
+        assert CeremeoOutbox.objects.count() == 3
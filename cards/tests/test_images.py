@@ -0,0 +1,115 @@
+import mimetypes
+import os
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from cards.forms import BusinessCardForm
+from cards.images import ImageIngest, get_image_ingest, render_qr_code
+from cards.services import resize_image_to_square, get_image_dimensions
+
+User = get_user_model()
+
+
+@pytest.fixture
+def in_memory_image():
+    filename = "valid_image.jpg"
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    test_image_path = os.path.join(current_dir, "test_data", "test_images", filename)
+    content_type, _ = mimetypes.guess_type(test_image_path)
+    with open(test_image_path, "rb") as f:
+        file_content = f.read()
+        in_memory_image = SimpleUploadedFile(filename, file_content, content_type)
+    return in_memory_image
+
+
+@pytest.fixture
+def user() -> User:
+    return User(username="testuser123")
+
+
+class TestImageIngest:
+    def test_image_ingest_read_header_and_rewind(
+        self, in_memory_image: SimpleUploadedFile
+    ):
+        ingest = ImageIngest(in_memory_image)
+        assert len(ingest.header) == ImageIngest.HEADER_SIZE
+        assert in_memory_image.tell() == 0
+        assert ingest.format == "JPEG"
+
+    def test_get_image_ingest_return_same_ingest_for_upload(
+        self, in_memory_image: SimpleUploadedFile
+    ):
+        assert get_image_ingest(in_memory_image) is get_image_ingest(in_memory_image)
+
+    def test_image_ingest_decode_only_once(self, in_memory_image: SimpleUploadedFile):
+        ingest = get_image_ingest(in_memory_image)
+        assert ingest.decode() is ingest.decode()
+        assert ingest.decode().mode == "RGB"
+
+    def test_resize_image_to_square_reuse_decoded_image(
+        self, in_memory_image: SimpleUploadedFile, user: User
+    ):
+        resized_image = resize_image_to_square(
+            uploaded_image=in_memory_image, user=user
+        )
+        with patch.object(Image, "open", wraps=Image.open) as mock_open:
+            width, height = get_image_dimensions(uploaded_image=resized_image)
+            get_image_ingest(resized_image).decode()
+        assert width == height
+        mock_open.assert_not_called()
+
+    @pytest.mark.django_db
+    def test_business_card_form_open_upload_once(
+        self, in_memory_image: SimpleUploadedFile
+    ):
+        data = {
+            "name_and_surname": "Test Name",
+            "company": "testcompany",
+            "phone_number": "+48132465825",
+            "email": "user@gmail.com",
+            "vcard_address": "TYPE=WORK,POSTAL,PARCEL:;;One Microsoft Way;Redmond;WA",
+        }
+        with patch.object(Image, "open", wraps=Image.open) as mock_open:
+            form = BusinessCardForm(data, {"user_photo": in_memory_image})
+            assert form.is_valid()
+            get_image_ingest(form.cleaned_data["user_photo"]).decode()
+        assert mock_open.call_count == 1
+
+
+class TestRenderQRCode:
+    def test_render_qr_code_render_png_at_requested_size(self):
+        qr_png = render_qr_code("https://example.com/card/", size=256)
+        assert Image.open(BytesIO(qr_png)).size == (256, 256)
+
+    def test_render_qr_code_scale_modules_by_whole_pixels(self):
+        qr_png = render_qr_code("https://example.com/card/", size=256)
+        image = Image.open(BytesIO(qr_png)).convert("L")
+        left, top, right, bottom = image.point(lambda value: 255 - value).getbbox()
+        module_width = (right - left) // 25
+        assert right - left == bottom - top == 25 * module_width
+        for y in range(top, bottom):
+            row = [image.getpixel((x, y)) < 128 for x in range(left, right)]
+            runs, start = [], 0
+            for x in range(1, len(row) + 1):
+                if x == len(row) or row[x] != row[start]:
+                    runs.append(x - start)
+                    start = x
+            assert all(run % module_width == 0 for run in runs)
+
+    def test_render_qr_code_optimize_png(self):
+        qr_png = render_qr_code("https://example.com/card/")
+        optimized_png = render_qr_code("https://example.com/card/", optimize=True)
+        assert (
+            Image.open(BytesIO(optimized_png)).size == Image.open(BytesIO(qr_png)).size
+        )
+        assert len(optimized_png) <= len(qr_png)
+
+    def test_render_qr_code_render_svg_from_modules(self):
+        qr_svg = render_qr_code("https://example.com/card/", image_format="svg")
+        assert qr_svg.startswith(b'<svg xmlns="http://www.w3.org/2000/svg"')
+        assert b'viewBox="0 0 33 33"' in qr_svg
@@ -0,0 +1,121 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+from django.test import Client
+from django.urls import reverse
+
+from BusinessApp import settings
+from cards.models import BusinessCard
+from cards.projections import (
+    aget_card_projection,
+    clear_local_card_projections,
+    get_card_projection,
+    get_card_projection_cache_key,
+    get_card_projection_stats,
+)
+
+CustomUser = get_user_model()
+
+
+@pytest.fixture
+def business_card(business_card: BusinessCard) -> BusinessCard:
+    BusinessCard.objects.filter(id=business_card.id).update(
+        user_photo="user_photos/jan.jpg",
+        photo_thumbnails={"jpeg": {"96": "user_photos/jan-96.jpg"}},
+    )
+    business_card.refresh_from_db()
+    return business_card
+
+
+@pytest.mark.django_db
+class TestCardProjection:
+    def test_get_card_projection_return_public_fields(
+        self, business_card: BusinessCard
+    ):
+        assert get_card_projection(card_id=business_card.id) == {
+            "name_and_surname": "Jan Kowalski",
+            "company": "Firma",
+            "lead_photo_url": "/media/user_photos/jan.jpg",
+            "lead_photo_srcset": "/media/user_photos/jan-96.jpg 96w",
+            "lead_photo_webp_srcset": "",
+        }
+
+    def test_get_card_projection_query_once_per_card(
+        self, business_card: BusinessCard, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            for _ in range(100):
+                get_card_projection(card_id=business_card.id)
+        assert get_card_projection_stats() == {
+            "local_hits": 99,
+            "shared_hits": 0,
+            "misses": 1,
+            "invalidations": 0,
+        }
+
+    def test_get_card_projection_fall_back_to_shared_cache(
+        self, business_card: BusinessCard, django_assert_num_queries
+    ):
+        get_card_projection(card_id=business_card.id)
+        clear_local_card_projections()
+        with django_assert_num_queries(0):
+            get_card_projection(card_id=business_card.id)
+        assert get_card_projection_stats()["shared_hits"] == 1
+
+    def test_get_card_projection_expire_local_entries(
+        self, business_card: BusinessCard
+    ):
+        with patch.object(settings, "CARDS_CARD_CACHE_LOCAL_TIMEOUT", -1):
+            get_card_projection(card_id=business_card.id)
+            get_card_projection(card_id=business_card.id)
+        assert get_card_projection_stats()["local_hits"] == 0
+
+    def test_get_card_projection_evict_least_recently_used(
+        self, business_card: BusinessCard
+    ):
+        with patch.object(settings, "CARDS_CARD_CACHE_LOCAL_SIZE", 1):
+            get_card_projection(card_id=business_card.id)
+            cache.set(get_card_projection_cache_key(uuid.UUID(int=1)), {})
+            get_card_projection(card_id=uuid.UUID(int=1))
+            get_card_projection(card_id=business_card.id)
+        assert get_card_projection_stats()["shared_hits"] == 2
+
+    def test_get_card_projection_raise_404_for_missing_card(self):
+        with pytest.raises(Http404):
+            get_card_projection(card_id=uuid.uuid4())
+
+    def test_save_invalidate_card_projection(self, business_card: BusinessCard):
+        get_card_projection(card_id=business_card.id)
+        business_card.company = "Nowa Firma"
+        business_card.save()
+        assert get_card_projection(card_id=business_card.id)["company"] == "Nowa Firma"
+        assert get_card_projection_stats()["invalidations"] == 1
+
+    def test_delete_invalidate_card_projection(self, business_card: BusinessCard):
+        get_card_projection(card_id=business_card.id)
+        business_card.delete()
+        with pytest.raises(Http404):
+            get_card_projection(card_id=business_card.id)
+
+    def test_aget_card_projection_share_cache_with_sync_views(
+        self, business_card: BusinessCard, django_assert_num_queries
+    ):
+        get_card_projection(card_id=business_card.id)
+        with django_assert_num_queries(0):
+            projection = async_to_sync(aget_card_projection)(card_id=business_card.id)
+        assert projection["name_and_surname"] == "Jan Kowalski"
+
+    def test_first_step_view_render_popular_card_without_queries(
+        self, business_card: BusinessCard, django_assert_num_queries
+    ):
+        url = reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        Client().get(url)
+        with django_assert_num_queries(0):
+            response = Client().get(url)
+        assert response.status_code == 200
+        assert b"Jan Kowalski" in response.content
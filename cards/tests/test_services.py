@@ -1,6 +1,9 @@
+import hashlib
 import mimetypes
 import os
-from datetime import date
+import uuid
+from datetime import date, timedelta
+from io import BytesIO
 from unittest.mock import patch
 
 import requests_mock
@@ -8,8 +11,11 @@ from PIL import Image
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.http import HttpRequest
+from django.http import HttpRequest, Http404
+from django.utils import timezone
 
 from BusinessApp import settings
 from cards.services import (
@@ -19,20 +25,33 @@ from cards.services import (
     create_business_card,
     get_user_card_qr_url,
     get_user_card_url,
+    get_card_qr_code,
     get_business_card,
     create_contact_request,
     parse_vcard_data,
+    parse_vcard_contacts,
+    enqueue_parsed_vcard_data,
     get_phone_number_and_vcard_from_request_data,
-    send_data_to_ceremeo_api,
-    send_parsed_vcard_data_to_ceremeo,
     redirect_based_on_request_contact_state,
     get_contact_request,
     convert_request_data_to_ceremeo_format_second_step,
     update_contact_request,
     convert_request_data_to_ceremeo_format_third_step,
     get_random_meme,
+    enqueue_ceremeo_delivery,
+    claim_ceremeo_deliveries,
+    advance_contact_request,
+    deliver_pending_ceremeo_payloads,
+    submit_first_step_contact_request,
+    merge_ceremeo_payloads,
+    generate_photo_thumbnails,
+    build_photo_srcset,
+    format_vcard_name,
+    generate_vcard,
 )
-from cards.models import BusinessCard, ContactRequest
+from cards.ceremeo import get_circuit_breaker
+from cards.images import render_qr_code
+from cards.models import BusinessCard, ContactRequest, CeremeoOutbox
 
 User = get_user_model()
 
@@ -101,6 +120,15 @@ def in_memory_vcard():
     return in_memory_vcard
 
 
+@pytest.fixture
+def multi_contact_vcard():
+    filename = "multi_contact_vcard.vcf"
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    test_vcard_path = os.path.join(current_dir, "test_data", "test_vcards", filename)
+    with open(test_vcard_path, "rb") as f:
+        return SimpleUploadedFile(filename, f.read(), "text/vcard")
+
+
 @pytest.mark.django_db
 class TestCardsServices:
     def test_set_business_card_data(self, in_memory_image: SimpleUploadedFile):
@@ -138,33 +166,144 @@ class TestCardsServices:
     def test_create_business_card_create_obj(
         self, user: User, in_memory_image: SimpleUploadedFile
     ):
-        with patch("cards.services.generate_qr_code") as mock_generate_qr_code:
-            mock_generate_qr_code.return_value = "/path/to/mock_qr_code.png"
-
-            assert BusinessCard.objects.count() == 0
-            data = {
-                "name_and_surname": "Test Name",
-                "company": "testcompany",
-                "phone_number": "+48132465825",
-                "email": "user@gmail.com",
-                "user_photo": in_memory_image,
-                "vcard_address": "TYPE=WORK,POSTAL,PARCEL:;;One Microsoft Way;Redmond;WA;98052-6399;USA",
-            }
-            create_business_card(data=data, user=user)
-            data.pop("user_photo")
-            assert BusinessCard.objects.count() == 1
-            created_card = BusinessCard.objects.get(user=user)
-            for key, value in data.items():
-                if key != "vcard":
-                    assert getattr(created_card, key) == value
-            assert created_card.user_photo is not None
-            assert created_card.vcard.name is not None
-            os.remove(created_card.user_photo.path)
-            os.remove(created_card.vcard.path)
-
-    def test_get_user_card_qr_return_qr(self, user: User):
-        qr_url = get_user_card_qr_url(user=user)
-        assert qr_url == f"{settings.DOMAIN}media/qr_codes/qr_user_id-{user.id}.png"
+        assert BusinessCard.objects.count() == 0
+        data = {
+            "name_and_surname": "Test Name",
+            "company": "testcompany",
+            "phone_number": "+48132465825",
+            "email": "user@gmail.com",
+            "user_photo": in_memory_image,
+            "vcard_address": "TYPE=WORK,POSTAL,PARCEL:;;One Microsoft Way;Redmond;WA;98052-6399;USA",
+        }
+        create_business_card(data=data, user=user)
+        data.pop("user_photo")
+        assert BusinessCard.objects.count() == 1
+        created_card = BusinessCard.objects.get(user=user)
+        for key, value in data.items():
+            if key != "vcard":
+                assert getattr(created_card, key) == value
+        assert created_card.user_photo is not None
+        assert created_card.vcard.name is not None
+        with created_card.vcard.open("rb") as vcard:
+            assert created_card.vcard_hash == hashlib.sha256(vcard.read()).hexdigest()
+        assert set(created_card.photo_thumbnails) == {"jpeg", "webp"}
+        os.remove(created_card.user_photo.path)
+        os.remove(created_card.vcard.path)
+        for thumbnails in created_card.photo_thumbnails.values():
+            for name in thumbnails.values():
+                default_storage.delete(name)
+
+    def test_generate_vcard_split_name_and_skip_missing_fields(self):
+        vcard = generate_vcard(
+            data={
+                "name_and_surname": "Jan Kowalski",
+                "company": "Firma, Sp. z o.o.",
+                "phone_number": "+48600100200",
+                "email": "jan@example.com",
+            },
+            user_id=1,
+        )
+        assert vcard.read() == (
+            "BEGIN:VCARD\n"
+            "VERSION:3.0\n"
+            "N:Kowalski;Jan;;;\n"
+            "FN:Jan Kowalski\n"
+            "ORG:Firma\\, Sp. z o.o.\n"
+            "TEL;TYPE=WORK,VOICE:+48600100200\n"
+            "EMAIL;TYPE=INTERNET:jan@example.com\n"
+            "END:VCARD\n"
+        )
+
+    def test_generate_vcard_write_address_with_empty_missing_parts(self):
+        vcard = generate_vcard(
+            data={"name_and_surname": "Jan Kowalski", "city": "Kraków"}, user_id=1
+        )
+        content = vcard.read()
+        assert "ADR;TYPE=WORK:;;;Kraków;;;\n" in content
+        assert "None" not in content
+
+    def test_generate_photo_thumbnails_save_square_thumbnails_in_each_format(
+        self, in_memory_image: SimpleUploadedFile, user: User
+    ):
+        square_image = resize_image_to_square(uploaded_image=in_memory_image, user=user)
+        width, _ = get_image_dimensions(uploaded_image=square_image)
+        thumbnails = generate_photo_thumbnails(uploaded_image=square_image, user=user)
+        expected_sizes = {
+            str(min(size, width)) for size in settings.CARDS_THUMBNAIL_SIZES
+        }
+        try:
+            assert set(thumbnails) == set(settings.CARDS_THUMBNAIL_FORMATS)
+            for image_format, names in thumbnails.items():
+                assert set(names) == expected_sizes
+                for size, name in names.items():
+                    with default_storage.open(name) as thumbnail_file:
+                        thumbnail = Image.open(thumbnail_file)
+                        assert thumbnail.format.lower() == image_format
+                        assert thumbnail.size == (int(size), int(size))
+        finally:
+            for names in thumbnails.values():
+                for name in names.values():
+                    default_storage.delete(name)
+
+    def test_build_photo_srcset_return_urls_ordered_by_width(self):
+        srcset = build_photo_srcset(
+            {"192": "thumbnails/b.jpg", "96": "thumbnails/a.jpg"}
+        )
+        assert srcset == (
+            f"/{settings.MEDIA_URL}thumbnails/a.jpg 96w, "
+            f"/{settings.MEDIA_URL}thumbnails/b.jpg 192w"
+        )
+
+    def test_get_user_card_qr_return_qr(self, business_card: BusinessCard):
+        qr_url = get_user_card_qr_url(card_id=business_card.id)
+        assert qr_url == f"{settings.DOMAIN}card/{business_card.id}/qr/"
+
+    @pytest.mark.parametrize(
+        "name_and_surname, vcard_name",
+        [
+            ("Jan Kowalski", "Kowalski;Jan;;;"),
+            ("Anna Maria Nowak", "Nowak;Anna Maria;;;"),
+            ("Cher", "Cher;;;;"),
+            ("", ";;;;"),
+        ],
+    )
+    def test_format_vcard_name_split_family_and_given_names(
+        self, name_and_surname: str, vcard_name: str
+    ):
+        assert format_vcard_name(name_and_surname) == vcard_name
+
+    def test_get_card_qr_code_render_once_and_cache_png(
+        self, business_card: BusinessCard
+    ):
+        with patch(
+            "cards.services.render_qr_code", wraps=render_qr_code
+        ) as mock_render_qr_code:
+            qr_png, etag = get_card_qr_code(card_id=business_card.id)
+            assert get_card_qr_code(card_id=business_card.id) == (qr_png, etag)
+        mock_render_qr_code.assert_called_once_with(
+            get_user_card_url(card_id=business_card.id), "png", None, False
+        )
+        assert qr_png.startswith(b"\x89PNG")
+        digest = hashlib.sha256(settings.DOMAIN.encode() + b"\0" + qr_png)
+        assert etag == f'"{digest.hexdigest()}"'
+
+    def test_get_card_qr_code_memoize_each_format_separately(
+        self, business_card: BusinessCard
+    ):
+        with patch(
+            "cards.services.render_qr_code", wraps=render_qr_code
+        ) as mock_render_qr_code:
+            svg, _ = get_card_qr_code(card_id=business_card.id, image_format="svg")
+            small_png, _ = get_card_qr_code(card_id=business_card.id, size=128)
+            get_card_qr_code(card_id=business_card.id, image_format="svg", size=128)
+            get_card_qr_code(card_id=business_card.id, size=128)
+        assert mock_render_qr_code.call_count == 2
+        assert svg.startswith(b"<svg")
+        assert Image.open(BytesIO(small_png)).size == (128, 128)
+
+    def test_get_card_qr_code_raise_404_for_unknown_card(self):
+        with pytest.raises(Http404):
+            get_card_qr_code(card_id=uuid.uuid4())
 
     def test_get_user_card_url_return_url(self, business_card: BusinessCard):
         card_url = get_user_card_url(business_card.id)
@@ -239,21 +378,6 @@ class TestCardsServices:
         contact = get_contact_request(contact_id=contact_request.id)
         assert contact.id == contact_request.id
 
-    def test_send_data_to_ceremeo_api_return_none_if_data_valid(self, request_mocker):
-        data = {"phone": "+48635495647"}
-        request_mocker.post(settings.CEREMEO_URL, status_code=200)
-        result = send_data_to_ceremeo_api(data=data)
-        assert request_mocker.called
-        assert result is None
-
-    def test_send_parsed_vcard_data_to_ceremeo_return_none_if_data_uploaded(
-        self, request_mocker, in_memory_vcard: SimpleUploadedFile
-    ):
-        request_mocker.post(settings.CEREMEO_URL, status_code=200)
-        result = send_parsed_vcard_data_to_ceremeo(vcard=in_memory_vcard)
-        assert request_mocker.called
-        assert result is None
-
     def test_convert_data_to_ceremeo_format_second_step_return_correct_data_dict(self):
         data = {
             "name_and_surname": "test name",
@@ -308,3 +432,286 @@ class TestCardsServices:
         )
         expected_path = f"{settings.DOMAIN}static/cat_meme.jpg"
         assert random_meme_path == expected_path
+
+
+@pytest.mark.django_db
+class TestVCardContactsParsing:
+    def test_parse_vcard_contacts_return_every_valid_contact(
+        self, multi_contact_vcard: SimpleUploadedFile
+    ):
+        vcard_contacts = parse_vcard_contacts(vcard_file=multi_contact_vcard)
+        assert vcard_contacts == [
+            {
+                "phone": "+48758334536",
+                "name": "Derik",
+                "surname": "Stenerson",
+                "email": "deriks@Microsoft.com",
+                "comments": [{"text": "Company: Microsoft Corporation"}],
+            },
+            {
+                "phone": "+48600100200",
+                "name": "Jan",
+                "surname": "Kowalski",
+                "email": None,
+                "comments": [],
+            },
+        ]
+
+    def test_parse_vcard_contacts_raise_if_too_many_contacts(
+        self, multi_contact_vcard: SimpleUploadedFile
+    ):
+        with patch.object(settings, "CARDS_VCARD_MAX_CONTACTS", 2):
+            with pytest.raises(ValidationError):
+                parse_vcard_contacts(vcard_file=multi_contact_vcard)
+
+    def test_parse_vcard_contacts_raise_if_vcard_malformed(self):
+        vcard = SimpleUploadedFile(
+            "broken.vcf", b"BEGIN:VCARD\nVERSION:3.0\nEND:VCALENDAR\n", "text/vcard"
+        )
+        with pytest.raises(ValidationError):
+            parse_vcard_contacts(vcard_file=vcard)
+
+    @pytest.mark.parametrize(
+        "vcard_content",
+        [
+            b"BEGIN:VCARD\r\nVERSION:2.1\r\n"
+            b"N;CHARSET=x-unknown;ENCODING=QUOTED-PRINTABLE:Kowalski;Jan\r\n"
+            b"TEL:+48600100200\r\nEND:VCARD\r\n",
+            b"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Jan\r\n"
+            b"TEL;ENCODING=b:abc\r\nEND:VCARD\r\n",
+        ],
+        ids=["unknown-charset", "bad-base64"],
+    )
+    def test_parse_vcard_contacts_raise_if_vcard_value_cannot_be_decoded(
+        self, vcard_content: bytes
+    ):
+        vcard = SimpleUploadedFile("broken.vcf", vcard_content, "text/vcard")
+        with pytest.raises(ValidationError):
+            parse_vcard_contacts(vcard_file=vcard)
+
+    def test_enqueue_parsed_vcard_data_enqueue_contacts_in_one_batch(
+        self, multi_contact_vcard: SimpleUploadedFile, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            deliveries = enqueue_parsed_vcard_data(vcard=multi_contact_vcard)
+        assert len(deliveries) == 2
+        assert sorted(
+            CeremeoOutbox.objects.values_list("payload__phone", flat=True)
+        ) == ["+48600100200", "+48758334536"]
+
+
+@pytest.fixture
+def no_coalesce_window():
+    with patch.object(settings, "CEREMEO_COALESCE_WINDOW", 0):
+        yield
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("no_coalesce_window")
+class TestCeremeoOutbox:
+    def test_submit_first_step_contact_request_enqueue_phone_and_advance_step(
+        self, user: User, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        data = {"phone_number": "+48536485725", "vcard": None}
+        contact = submit_first_step_contact_request(
+            data=data, requestor=None, lead=user
+        )
+        delivery = CeremeoOutbox.objects.get(contact_request=contact)
+        assert contact.form_step == 2
+        assert delivery.payload == {"phone": "+48536485725"}
+        assert delivery.status == CeremeoOutbox.Status.PENDING
+        assert not request_mocker.called
+
+    def test_advance_contact_request_update_contact_and_enqueue_payload(
+        self, contact_request: ContactRequest
+    ):
+        ceremeo_data = {"phone": "+48564835465", "comments": [{"text": "topic"}]}
+        advance_contact_request(
+            contact_request=contact_request,
+            data={"contact_topic": "topic"},
+            ceremeo_data=ceremeo_data,
+            step=4,
+        )
+        updated_contact = ContactRequest.objects.get(id=contact_request.id)
+        assert updated_contact.form_step == 4
+        assert updated_contact.ceremeo_deliveries.get().payload == ceremeo_data
+
+    def test_deliver_pending_ceremeo_payloads_mark_sent(
+        self, contact_request: ContactRequest, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        delivery = enqueue_ceremeo_delivery(
+            data={"phone": "+48564835465"}, contact_request=contact_request
+        )
+        sent, failed = deliver_pending_ceremeo_payloads(batch_size=10)
+        delivery.refresh_from_db()
+        assert (sent, failed) == (1, 0)
+        assert request_mocker.last_request.json() == {"phone": "+48564835465"}
+        assert delivery.status == CeremeoOutbox.Status.SENT
+        assert delivery.sent_at is not None
+
+    def test_deliver_pending_ceremeo_payloads_reschedule_failed_delivery(
+        self, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=500)
+        delivery = enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        sent, failed = deliver_pending_ceremeo_payloads(batch_size=10)
+        delivery.refresh_from_db()
+        assert (sent, failed) == (0, 1)
+        assert delivery.status == CeremeoOutbox.Status.PENDING
+        assert delivery.attempts == 1
+        assert delivery.available_at > delivery.created_at
+        assert delivery.last_error is not None
+        assert deliver_pending_ceremeo_payloads(batch_size=10) == (0, 0)
+
+    def test_deliver_pending_ceremeo_payloads_give_up_after_max_attempts(
+        self, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=500)
+        delivery = enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        CeremeoOutbox.objects.filter(id=delivery.id).update(
+            attempts=settings.CEREMEO_OUTBOX_MAX_ATTEMPTS - 1
+        )
+        deliver_pending_ceremeo_payloads(batch_size=10)
+        delivery.refresh_from_db()
+        assert delivery.status == CeremeoOutbox.Status.FAILED
+
+    def test_deliver_pending_ceremeo_payloads_keep_spooled_while_circuit_open(
+        self, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        delivery = enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        breaker = get_circuit_breaker("lead")
+        for _ in range(settings.CEREMEO_CIRCUIT_FAILURE_THRESHOLD):
+            breaker.record_failure()
+        assert deliver_pending_ceremeo_payloads(batch_size=10) == (0, 0)
+        delivery.refresh_from_db()
+        assert not request_mocker.called
+        assert delivery.status == CeremeoOutbox.Status.PENDING
+        assert delivery.attempts == 0
+
+    def test_deliver_pending_ceremeo_payloads_coalesce_payloads_for_same_phone(
+        self, contact_request: ContactRequest, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        phone = str(contact_request.phone_number)
+        for payload in [
+            {"phone": phone},
+            {"phone": phone, "name": "Jan", "email": None, "comments": [{"text": "a"}]},
+            {"phone": phone, "comments": [{"text": "b"}]},
+        ]:
+            enqueue_ceremeo_delivery(data=payload, contact_request=contact_request)
+        assert deliver_pending_ceremeo_payloads(batch_size=1) == (3, 0)
+        assert request_mocker.call_count == 1
+        assert request_mocker.last_request.json() == {
+            "phone": phone,
+            "name": "Jan",
+            "email": None,
+            "comments": [{"text": "a"}, {"text": "b"}],
+        }
+
+    def test_deliver_pending_ceremeo_payloads_pull_same_phone_forward_from_window(
+        self, contact_request: ContactRequest, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        phone = str(contact_request.phone_number)
+        enqueue_ceremeo_delivery(data={"phone": phone})
+        with patch.object(settings, "CEREMEO_COALESCE_WINDOW", 60):
+            enqueue_ceremeo_delivery(data={"phone": phone, "name": "Jan"})
+            enqueue_ceremeo_delivery(data={"phone": "+48564835466"})
+        assert deliver_pending_ceremeo_payloads(batch_size=10) == (2, 0)
+        assert request_mocker.last_request.json() == {"phone": phone, "name": "Jan"}
+        assert CeremeoOutbox.objects.filter(status="pending").count() == 1
+
+    def test_deliver_pending_ceremeo_payloads_coalesce_funnel_steps_seconds_apart(
+        self, contact_request: ContactRequest, request_mocker
+    ):
+        request_mocker.post(settings.CEREMEO_URL, status_code=200)
+        phone = str(contact_request.phone_number)
+        start = timezone.now()
+        with patch.object(settings, "CEREMEO_COALESCE_WINDOW", 10):
+            for seconds, payload in [
+                (0, {"phone": phone}),
+                (3, {"phone": phone, "name": "Jan"}),
+                (6, {"phone": phone, "comments": [{"text": "a"}]}),
+            ]:
+                with patch(
+                    "django.utils.timezone.now",
+                    return_value=start + timedelta(seconds=seconds),
+                ):
+                    enqueue_ceremeo_delivery(
+                        data=payload, contact_request=contact_request
+                    )
+        with patch(
+            "django.utils.timezone.now", return_value=start + timedelta(seconds=9)
+        ):
+            assert deliver_pending_ceremeo_payloads(batch_size=10) == (0, 0)
+        with patch(
+            "django.utils.timezone.now", return_value=start + timedelta(seconds=10)
+        ):
+            assert deliver_pending_ceremeo_payloads(batch_size=10) == (3, 0)
+        assert request_mocker.call_count == 1
+        assert request_mocker.last_request.json() == {
+            "phone": phone,
+            "name": "Jan",
+            "comments": [{"text": "a"}],
+        }
+
+    def test_claim_ceremeo_deliveries_leave_same_phone_backing_off(
+        self, contact_request: ContactRequest
+    ):
+        phone = str(contact_request.phone_number)
+        backing_off = enqueue_ceremeo_delivery(data={"phone": phone})
+        CeremeoOutbox.objects.filter(id=backing_off.id).update(
+            attempts=1, available_at=timezone.now() + timedelta(seconds=60)
+        )
+        fresh = enqueue_ceremeo_delivery(data={"phone": phone, "name": "Jan"})
+        assert [delivery.id for delivery in claim_ceremeo_deliveries(10)] == [fresh.id]
+
+    def test_claim_ceremeo_deliveries_skip_same_phone_leased_by_another_claim(
+        self, contact_request: ContactRequest
+    ):
+        phone = str(contact_request.phone_number)
+        first = enqueue_ceremeo_delivery(data={"phone": phone})
+        second = enqueue_ceremeo_delivery(data={"phone": phone, "name": "Jan"})
+        assert {delivery.id for delivery in claim_ceremeo_deliveries(1)} == {
+            first.id,
+            second.id,
+        }
+        third = enqueue_ceremeo_delivery(data={"phone": phone, "email": "jan@x.pl"})
+        assert [delivery.id for delivery in claim_ceremeo_deliveries(1)] == [third.id]
+        assert claim_ceremeo_deliveries(10) == []
+
+    def test_deliver_pending_ceremeo_payloads_send_one_bulk_submission(
+        self, request_mocker
+    ):
+        bulk_url = "https://ceremeo.test/api/v1/lead/bulk/"
+        request_mocker.post(bulk_url, status_code=201)
+        enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        enqueue_ceremeo_delivery(data={"phone": "+48564835466"})
+        with patch.object(settings, "CEREMEO_BULK_URL", bulk_url):
+            assert deliver_pending_ceremeo_payloads(batch_size=10) == (2, 0)
+        assert request_mocker.call_count == 1
+        assert request_mocker.last_request.json() == [
+            {"phone": "+48564835465"},
+            {"phone": "+48564835466"},
+        ]
+
+    def test_merge_ceremeo_payloads_keep_latest_values_and_all_comments(self):
+        merged = merge_ceremeo_payloads(
+            [
+                {"phone": "+48564835465", "name": "Jan", "comments": [{"text": "a"}]},
+                {"phone": "+48564835465", "name": None, "comments": [{"text": "b"}]},
+            ]
+        )
+        assert merged == {
+            "phone": "+48564835465",
+            "name": "Jan",
+            "comments": [{"text": "a"}, {"text": "b"}],
+        }
+
+    def test_enqueue_ceremeo_delivery_delay_delivery_by_coalesce_window(self):
+        with patch.object(settings, "CEREMEO_COALESCE_WINDOW", 60):
+            delivery = enqueue_ceremeo_delivery(data={"phone": "+48564835465"})
+        assert (delivery.available_at - delivery.created_at).total_seconds() >= 59
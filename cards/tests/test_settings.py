@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SHOW_PROFILE = (
+    "from BusinessApp import settings; print(settings.DJANGO_PROFILE, settings.DEBUG)"
+)
+
+
+def import_settings(**env: str) -> subprocess.CompletedProcess:
+    environ = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("DJANGO_PROFILE", "ALLOWED_HOSTS", "DEBUG")
+    }
+    return subprocess.run(
+        [sys.executable, "-c", SHOW_PROFILE],
+        env={**environ, **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestSettingsProfiles:
+    def test_settings_default_to_dev_profile(self):
+        result = import_settings(DJANGO_SETTINGS_MODULE="BusinessApp.settings")
+        assert result.stdout.split() == ["dev", "True"]
+
+    @pytest.mark.parametrize("profile", ["dev", "prod"])
+    def test_settings_follow_settings_module_over_django_profile(self, profile: str):
+        result = import_settings(
+            DJANGO_SETTINGS_MODULE=f"BusinessApp.settings.{profile}",
+            DJANGO_PROFILE="prod" if profile == "dev" else "dev",
+            ALLOWED_HOSTS="cards.example.com",
+        )
+        assert result.stdout.split() == [profile, str(profile == "dev")]
+
+    def test_prod_settings_require_allowed_hosts(self):
+        result = import_settings(
+            DJANGO_SETTINGS_MODULE="BusinessApp.settings", DJANGO_PROFILE="prod"
+        )
+        assert result.returncode != 0
+        assert "ImproperlyConfigured: Set ALLOWED_HOSTS" in result.stderr
@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from cards import sniffing
+from cards.images import render_qr_code
+from cards.sniffing import HEADER_SIZE, get_magic, read_file_header, sniff_mime_type
+from cards.validators import validate_vcard_format
+
+VCARD = (
+    b"BEGIN:VCARD\r\nVERSION:3.0\r\nN:Kowalski;Jan\r\nTEL:+48600100200\r\n"
+    + b"NOTE:"
+    + b"x" * 10 * HEADER_SIZE
+    + b"\r\n"
+    + b"END:VCARD\r\n"
+)
+
+
+class TestSniffing:
+    def test_get_magic_reuse_handle_within_process(self):
+        assert get_magic() is get_magic()
+
+    def test_get_magic_create_new_handle_after_fork(self):
+        handle = get_magic()
+        with patch.object(sniffing.os, "getpid", return_value=os.getpid() + 1):
+            assert get_magic() is not handle
+
+    def test_read_file_header_read_only_header_and_rewind(self):
+        vcard = SimpleUploadedFile("contact.vcf", VCARD, "text/vcard")
+        vcard.read(10)
+        header = read_file_header(vcard)
+        assert header == VCARD[:HEADER_SIZE]
+        assert vcard.tell() == 0
+
+    def test_sniff_mime_type_is_thread_safe(self):
+        headers = [VCARD[:HEADER_SIZE], render_qr_code("https://example.com/")] * 50
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            mime_types = list(executor.map(sniff_mime_type, headers))
+        assert mime_types == ["text/vcard", "image/png"] * 50
+
+    def test_validate_vcard_format_sniff_only_header(self):
+        vcard = SimpleUploadedFile("contact.vcf", VCARD, "text/vcard")
+        handle = get_magic()
+        with patch.object(
+            handle, "from_buffer", wraps=handle.from_buffer
+        ) as from_buffer:
+            validate_vcard_format(vcard)
+        assert len(from_buffer.call_args.args[0]) == HEADER_SIZE
+        assert vcard.tell() == 0
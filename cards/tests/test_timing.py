@@ -0,0 +1,101 @@
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+import requests_mock
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from BusinessApp import settings
+from cards.ceremeo import post_to_ceremeo
+from cards.models import BusinessCard, ContactRequest
+from cards.timing import format_server_timing, render_metrics, track_request_timings
+
+CustomUser = get_user_model()
+
+
+def parse_server_timing(header: str) -> dict[str, str]:
+    return {
+        metric.split(";")[0]: metric.split(";", 1)[1] for metric in header.split(", ")
+    }
+
+
+class TestRequestTimings:
+    def test_format_server_timing_skip_unused_phases(self):
+        timings = Counter({"db": 0.002, "db_queries": 3, "template": 0.0015})
+        assert format_server_timing(0.01, timings) == (
+            'total;dur=10.00, db;dur=2.00;desc="3 queries", template;dur=1.50'
+        )
+
+    def test_post_to_ceremeo_record_http_time(self):
+        with track_request_timings() as timings, requests_mock.Mocker() as mocker:
+            mocker.post(settings.CEREMEO_URL, json={})
+            post_to_ceremeo(url=settings.CEREMEO_URL, data={})
+        assert timings["ceremeo"] > 0
+
+
+@pytest.mark.django_db
+class TestRequestTimingMiddleware:
+    def test_first_step_view_return_server_timing_header(
+        self, business_card: BusinessCard
+    ):
+        response = Client().get(
+            reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        )
+        server_timing = parse_server_timing(response["Server-Timing"])
+        assert server_timing["db"].endswith('desc="1 queries"')
+        assert "template" in server_timing
+        assert "total" in server_timing
+
+    def test_metrics_view_expose_request_metrics(self, business_card: BusinessCard):
+        client = Client()
+        client.get(reverse("upload_phone_num", kwargs={"card_id": business_card.id}))
+        client.get(reverse("upload_phone_num", kwargs={"card_id": business_card.id}))
+        with patch.object(settings, "CARDS_METRICS_ALLOWED_IPS", ["127.0.0.1"]):
+            response = client.get(reverse("metrics"))
+        metrics = response.content.decode()
+        assert response.status_code == 200
+        assert (
+            'cards_requests_total{view="upload_phone_num",method="GET",status="200"} 2'
+            in metrics
+        )
+        assert (
+            'cards_request_duration_seconds_bucket{view="upload_phone_num",le="+Inf"} 2'
+            in metrics
+        )
+        assert 'cards_db_queries_total{view="upload_phone_num"} 1' in metrics
+        assert 'cards_card_projection_events_total{event="local_hits"} 1' in metrics
+
+    def test_metrics_view_return_404_for_proxied_clients_by_default(self):
+        response = Client(REMOTE_ADDR="127.0.0.1").get(reverse("metrics"))
+        assert response.status_code == 404
+
+    def test_metrics_view_accept_bearer_token(self):
+        with patch.object(settings, "CARDS_METRICS_TOKEN", "scrape-secret"):
+            accepted = Client().get(
+                reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret"
+            )
+            rejected = Client().get(
+                reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong"
+            )
+        assert accepted.status_code == 200
+        assert rejected.status_code == 404
+
+    def test_streaming_export_record_queries_after_body_is_sent(self):
+        lead = CustomUser.objects.create(username="anna")
+        ContactRequest.objects.create(lead=lead, phone_number="+48374958767")
+        client = Client()
+        client.force_login(lead)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("export_contact_requests"))
+            assert "Server-Timing" not in response
+            assert "export_contact_requests" not in render_metrics({})
+            b"".join(response.streaming_content)
+            response.close()
+        assert (
+            f'cards_db_queries_total{{view="export_contact_requests"}} {len(queries)}'
+            in render_metrics({})
+        )
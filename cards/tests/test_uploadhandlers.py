@@ -0,0 +1,93 @@
+import uuid
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from PIL import Image
+
+from BusinessApp import settings
+from cards.models import BusinessCard
+from cards.uploadhandlers import LimitedUploadHandler, UploadTooLarge
+
+CustomUser = get_user_model()
+
+FIELD_LIMITS = {"user_photo": 64 * 1024, "vcard": 1024}
+
+
+@pytest.fixture
+def field_limits():
+    with patch.object(settings, "CARDS_UPLOAD_FIELD_LIMITS", FIELD_LIMITS):
+        yield FIELD_LIMITS
+
+
+@pytest.fixture
+def upload_handler(field_limits: dict) -> LimitedUploadHandler:
+    return LimitedUploadHandler(RequestFactory().post("/"))
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    output = BytesIO()
+    Image.new("RGB", (width, height)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+class TestLimitedUploadHandler:
+    def test_receive_data_chunk_raise_once_field_limit_exceeded(
+        self, upload_handler: LimitedUploadHandler
+    ):
+        upload_handler.new_file("vcard", "contact.vcf", "text/vcard", None)
+        assert upload_handler.receive_data_chunk(b"x" * 1000, 0) == b"x" * 1000
+        with pytest.raises(UploadTooLarge):
+            upload_handler.receive_data_chunk(b"x" * 100, 1000)
+
+    def test_receive_data_chunk_raise_on_image_dimensions_from_header(
+        self, upload_handler: LimitedUploadHandler
+    ):
+        upload_handler.new_file("user_photo", "photo.jpg", "image/jpeg", None)
+        with pytest.raises(UploadTooLarge):
+            upload_handler.receive_data_chunk(make_jpeg(5000, 100)[:1024], 0)
+
+    def test_receive_data_chunk_leave_non_images_to_validators(
+        self, upload_handler: LimitedUploadHandler
+    ):
+        upload_handler.new_file("user_photo", "photo.jpg", "image/jpeg", None)
+        assert upload_handler.receive_data_chunk(b"not an image", 0)
+
+    def test_handle_raw_input_raise_if_content_length_too_big(
+        self, upload_handler: LimitedUploadHandler
+    ):
+        with pytest.raises(UploadTooLarge):
+            upload_handler.handle_raw_input(
+                BytesIO(), {}, settings.CARDS_UPLOAD_MAX_REQUEST_SIZE + 1, b"boundary"
+            )
+
+
+@pytest.mark.django_db
+class TestUploadLimitMiddleware:
+    def test_first_step_view_return_413_for_oversized_vcard(self, field_limits: dict):
+        vcard = SimpleUploadedFile("contact.vcf", b"x" * 2048, "text/vcard")
+        response = Client().post(
+            reverse("upload_phone_num", kwargs={"card_id": uuid.uuid4()}),
+            data={"vcard": vcard},
+        )
+        assert response.status_code == 413
+
+    def test_create_card_view_return_413_for_oversized_photo_dimensions(self):
+        client = Client()
+        client.force_login(CustomUser.objects.create(username="uploader"))
+        photo = SimpleUploadedFile("photo.jpg", make_jpeg(5000, 100), "image/jpeg")
+        response = client.post(reverse("create_card"), data={"user_photo": photo})
+        assert response.status_code == 413
+        assert not BusinessCard.objects.filter(user__username="uploader").exists()
+
+    def test_second_step_view_is_not_limited(self, field_limits: dict):
+        vcard = SimpleUploadedFile("contact.vcf", b"x" * 2048, "text/vcard")
+        response = Client().post(
+            reverse("requestor_info", kwargs={"card_id": uuid.uuid4()}),
+            data={"vcard": vcard},
+        )
+        assert response.status_code != 413
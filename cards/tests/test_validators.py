@@ -1,6 +1,7 @@
 import mimetypes
 import os
 from datetime import date
+from unittest.mock import patch
 
 import pytest
 from _pytest.fixtures import SubRequest
@@ -8,6 +9,7 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from BusinessApp import settings
 from cards.services import parse_vcard_data
 from cards.validators import (
     validate_image_format,
@@ -15,6 +17,7 @@ from cards.validators import (
     validate_image_size,
     validate_vcard_data,
     validate_vcard_format,
+    validate_vcard_size,
     validate_phone_number_for_contact_request,
     validate_name_and_surname,
     validate_date,
@@ -159,6 +162,16 @@ class TestVcardValidation:
             validate_vcard_format(uploaded_vcard=in_memory_file)
             assert str(e.value) == "Invalid vcard extension."
 
+    @pytest.mark.parametrize(
+        "in_memory_file", [("test_vcards", "valid_vcf_vcard.vcf")], indirect=True
+    )
+    def test_validate_vcard_size_raise_error_if_vcard_too_big(
+        self, in_memory_file: SimpleUploadedFile
+    ):
+        with patch.object(settings, "CARDS_VCARD_MAX_UPLOAD_SIZE", 100):
+            with pytest.raises(ValidationError):
+                validate_vcard_size(uploaded_vcard=in_memory_file)
+
 
 @pytest.mark.django_db
 def test_validate_business_card_duplication_raise_error_if_user_already_has_card(
@@ -0,0 +1,87 @@
+import codecs
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from cards import vcards
+from cards.services import parse_vcard_contacts
+from cards.vcards import (
+    VCardFastPathError,
+    extract_vcard_fields,
+    read_vcard_fields,
+)
+
+CORPUS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "test_data", "test_vcards", "corpus"
+)
+
+
+def read_corpus_file(filename: str, read_fields) -> list[dict]:
+    with open(os.path.join(CORPUS_DIR, filename), "rb") as f:
+        return list(read_fields(codecs.iterdecode(f, "utf-8-sig")))
+
+
+class TestExtractVCardFields:
+    @pytest.mark.parametrize("filename", sorted(os.listdir(CORPUS_DIR)))
+    def test_extract_vcard_fields_match_vobject_on_corpus(self, filename: str):
+        assert read_corpus_file(filename, extract_vcard_fields) == read_corpus_file(
+            filename, read_vcard_fields
+        )
+
+    def test_extract_vcard_fields_skip_photo_continuation_lines(self):
+        lines = io.StringIO(
+            "BEGIN:VCARD\r\n"
+            "VERSION:3.0\r\n"
+            "PHOTO;ENCODING=b;TYPE=JPEG:/9j/4AAQ\r\n"
+            " TEL:+48111222333\r\n"
+            "N:Nowak;Anna\r\n"
+            "END:VCARD\r\n"
+        )
+        with patch.object(vcards.vobject, "readOne") as read_one:
+            assert list(extract_vcard_fields(lines)) == [
+                {
+                    "tel": None,
+                    "family": "Nowak",
+                    "given": "Anna",
+                    "email": None,
+                    "org": None,
+                }
+            ]
+        read_one.assert_not_called()
+
+    def test_extract_vcard_fields_raise_on_line_outside_vcard(self):
+        lines = io.StringIO("TEL:+48111222333\r\n")
+        with pytest.raises(VCardFastPathError):
+            list(extract_vcard_fields(lines))
+
+    def test_extract_vcard_fields_raise_on_unclosed_vcard(self):
+        lines = io.StringIO("BEGIN:VCARD\r\nTEL:+48111222333\r\n")
+        with pytest.raises(VCardFastPathError):
+            list(extract_vcard_fields(lines))
+
+    def test_parse_vcard_contacts_fall_back_to_vobject_for_whole_file(self):
+        vcard = SimpleUploadedFile(
+            "junk.vcf", b"TEL:+48111222333\r\nEND:VCARD\r\n", "text/vcard"
+        )
+        with patch(
+            "cards.services.read_vcard_fields", wraps=read_vcard_fields
+        ) as read_fields, pytest.raises(ValidationError):
+            parse_vcard_contacts(vcard_file=vcard)
+        read_fields.assert_called_once()
+
+    def test_read_vcard_fields_read_lines_lazily(self):
+        consumed = []
+        contact = "BEGIN:VCARD\r\nVERSION:3.0\r\nTEL:+48111222333\r\nEND:VCARD\r\n"
+        lines = io.StringIO(contact * 100)
+
+        def iter_lines():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        assert next(read_vcard_fields(iter_lines()))["tel"] == "+48111222333"
+        assert len(consumed) < 10
@@ -1,21 +1,36 @@
+import csv
+import hashlib
+import json
 import mimetypes
 import os
+import shutil
 import uuid
 from datetime import date
+from unittest.mock import patch
 
 import pytest
 import requests_mock
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile, InMemoryUploadedFile
-from django.test import Client
+from django.test import Client, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 
 from BusinessApp import settings
-from cards.models import BusinessCard, ContactRequest
+from cards.executors import ExecutorBusyError
+from cards.models import BusinessCard, ContactRequest, CeremeoOutbox
 
 CustomUser = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=str(tmp_path / "media")):
+        yield tmp_path / "media"
+    shutil.rmtree(tmp_path / "media", ignore_errors=True)
+
+
 @pytest.fixture
 def request_mocker():
     with requests_mock.Mocker() as mocker:
@@ -182,9 +197,31 @@ class TestCreateCardView:
         response = client.post(reverse("create_card"), data=data, format="multipart")
         assert response.status_code == 302
         assert BusinessCard.objects.count() == 1
-        created_card = BusinessCard.objects.first()
-        os.remove(created_card.user_photo.path)
-        os.remove(created_card.vcard.path)
+
+    def test_create_card_view_return_503_when_image_processing_busy(
+        self,
+        client: Client,
+        in_memory_image: InMemoryUploadedFile,
+        authenticated_user: CustomUser,
+    ):
+        data = {
+            "name_and_surname": "Test Name",
+            "company": "testcompany",
+            "phone_number": "+48132465825",
+            "email": "user@gmail.com",
+            "user_photo": in_memory_image,
+            "vcard_address": "TYPE=WORK,POSTAL,PARCEL:;;One Microsoft Way;Redmond;WA;98052-6399;USA",
+        }
+        with patch(
+            "cards.services.run_cpu_bound",
+            side_effect=ExecutorBusyError("Image processing queue is full."),
+        ):
+            response = client.post(
+                reverse("create_card"), data=data, format="multipart"
+            )
+        assert response.status_code == 503
+        assert response["Retry-After"] == str(settings.CARDS_IMAGE_EXECUTOR_RETRY_AFTER)
+        assert not BusinessCard.objects.exists()
 
     def test_create_card_view_return_400_if_name_and_surname_invalid(
         self,
@@ -261,16 +298,12 @@ class TestMyCardViewView:
         self,
         client: Client,
         business_card: BusinessCard,
-        in_memory_image: SimpleUploadedFile,
-        in_memory_vcard: SimpleUploadedFile,
     ):
         client.force_login(business_card.user)
         response = client.get(reverse("card_info"))
         assert response.status_code == 200
         assert b"card-url" in response.content
         assert b"qr-code-img" in response.content
-        os.remove(f"media/images/{in_memory_image.name}")
-        os.remove(f"media/vcard_files/{in_memory_vcard.name}")
 
     def test_my_card_view_return_302_for_authenticated_user_with_no_business_card(
         self, client: Client
@@ -284,6 +317,260 @@ class TestMyCardViewView:
         assert response.status_code == 403
 
 
+@pytest.mark.django_db
+class TestContactRequestExportView:
+    def test_contact_request_export_view_return_403_for_anonymous_user(self):
+        client = Client()
+        response = client.get(reverse("export_contact_requests"))
+        assert response.status_code == 403
+
+    def test_contact_request_export_view_stream_vcards_of_received_requests(
+        self,
+        client: Client,
+        authenticated_user: CustomUser,
+        contact_request_4th_step: ContactRequest,
+    ):
+        ContactRequest.objects.create(
+            lead=authenticated_user, phone_number="+48374958767", form_step=2
+        )
+        ContactRequest.objects.create(
+            lead=authenticated_user,
+            phone_number="+48253917465",
+            name_and_surname="Jan Kowalski",
+            company_or_contact_place="Firma; Sp. z o.o.",
+            contact_date=date(2024, 6, 12),
+            contact_topic="oferta",
+            form_step=4,
+        )
+        response = client.get(reverse("export_contact_requests"))
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "text/vcard"
+        content = b"".join(response.streaming_content).decode()
+        assert content.count("BEGIN:VCARD") == 2
+        assert "N:Kowalski;Jan;;;\nFN:Jan Kowalski\n" in content
+        assert "N:;;;;\nFN:+48374958767\n" in content
+        assert "ORG:Firma\\; Sp. z o.o.\n" in content
+        assert "NOTE:2024-06-12 - oferta\n" in content
+        assert str(contact_request_4th_step.phone_number) not in content
+
+    def test_contact_request_export_view_stream_csv_and_ndjson(
+        self, client: Client, authenticated_user: CustomUser
+    ):
+        ContactRequest.objects.create(
+            lead=authenticated_user,
+            phone_number="+48374958767",
+            email="usr1@gmail.com",
+            form_step=3,
+        )
+        csv_response = client.get(reverse("export_contact_requests"), {"format": "csv"})
+        ndjson_response = client.get(
+            reverse("export_contact_requests"), {"format": "ndjson"}
+        )
+        assert b"".join(csv_response.streaming_content).decode().splitlines() == [
+            "phone_number,name_and_surname,email,company_or_contact_place,"
+            "contact_date,contact_topic",
+            "+48374958767,,usr1@gmail.com,,,",
+        ]
+        assert json.loads(b"".join(ndjson_response.streaming_content)) == {
+            "phone_number": "+48374958767",
+            "name_and_surname": None,
+            "email": "usr1@gmail.com",
+            "company_or_contact_place": None,
+            "contact_date": None,
+            "contact_topic": None,
+        }
+
+    def test_contact_request_export_view_neutralize_csv_formulas(
+        self, client: Client, authenticated_user: CustomUser
+    ):
+        ContactRequest.objects.create(
+            lead=authenticated_user,
+            phone_number="+48374958767",
+            name_and_surname="-2+3",
+            company_or_contact_place="@SUM(A1:A9)",
+            contact_topic='=HYPERLINK("http://example.com","oferta")',
+            form_step=4,
+        )
+        csv_response = client.get(reverse("export_contact_requests"), {"format": "csv"})
+        ndjson_response = client.get(
+            reverse("export_contact_requests"), {"format": "ndjson"}
+        )
+        rows = list(
+            csv.reader(b"".join(csv_response.streaming_content).decode().splitlines())
+        )
+        assert rows[1] == [
+            "+48374958767",
+            "'-2+3",
+            "",
+            "'@SUM(A1:A9)",
+            "",
+            '\'=HYPERLINK("http://example.com","oferta")',
+        ]
+        assert (
+            json.loads(b"".join(ndjson_response.streaming_content))["contact_topic"]
+            == '=HYPERLINK("http://example.com","oferta")'
+        )
+
+    def test_contact_request_export_view_return_400_for_unsupported_format(
+        self, client: Client
+    ):
+        response = client.get(reverse("export_contact_requests"), {"format": "xml"})
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestCardVCardView:
+    def test_card_vcard_view_return_vcard_with_validators(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        response = client.get(
+            reverse("card_vcard", kwargs={"card_id": business_card.id})
+        )
+        content = b"".join(response.streaming_content)
+        business_card.refresh_from_db()
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/vcard"
+        assert "attachment" in response["Content-Disposition"]
+        assert business_card.vcard_hash == hashlib.sha256(content).hexdigest()
+        assert response["ETag"] == f'"{business_card.vcard_hash}"'
+        assert response["Last-Modified"] == http_date(
+            business_card.vcard_updated_at.timestamp()
+        )
+
+    @pytest.mark.parametrize("vcard_hash", ["", "0" * 64])
+    def test_card_vcard_view_return_404_if_vcard_file_is_missing(
+        self, business_card: BusinessCard, vcard_hash: str
+    ):
+        BusinessCard.objects.filter(id=business_card.id).update(
+            vcard_hash=vcard_hash, vcard_updated_at=timezone.now()
+        )
+        business_card.vcard.storage.delete(business_card.vcard.name)
+        response = Client().get(
+            reverse("card_vcard", kwargs={"card_id": business_card.id})
+        )
+        assert response.status_code == 404
+
+    def test_card_vcard_view_return_304_if_etag_or_date_matches(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        url = reverse("card_vcard", kwargs={"card_id": business_card.id})
+        first_response = client.get(url)
+        etag_response = client.get(url, HTTP_IF_NONE_MATCH=first_response["ETag"])
+        date_response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=first_response["Last-Modified"]
+        )
+        assert etag_response.status_code == 304
+        assert date_response.status_code == 304
+        assert etag_response["ETag"] == first_response["ETag"]
+
+    def test_card_vcard_view_delegate_file_to_web_server(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        with patch.object(settings, "CARDS_SENDFILE_BACKEND", "x-accel-redirect"):
+            response = client.get(
+                reverse("card_vcard", kwargs={"card_id": business_card.id})
+            )
+        assert response.status_code == 200
+        assert response.content == b""
+        assert response["X-Accel-Redirect"] == (
+            f"{settings.CARDS_SENDFILE_ACCEL_PREFIX}{business_card.vcard.name}"
+        )
+
+    def test_card_vcard_view_return_404_for_unknown_card(self):
+        client = Client()
+        response = client.get(reverse("card_vcard", kwargs={"card_id": uuid.uuid4()}))
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestCardQRCodeView:
+    def test_card_qr_code_view_return_png_with_caching_headers(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        response = client.get(reverse("card_qr", kwargs={"card_id": business_card.id}))
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/png"
+        assert response.content.startswith(b"\x89PNG")
+        assert response["ETag"].startswith('"')
+        assert "immutable" not in response["Cache-Control"]
+        assert f"max-age={settings.CARDS_QR_MAX_AGE}" in response["Cache-Control"]
+
+    def test_card_qr_code_view_return_304_if_etag_matches(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        url = reverse("card_qr", kwargs={"card_id": business_card.id})
+        etag = client.get(url)["ETag"]
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    def test_card_qr_code_view_return_svg_when_requested(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        response = client.get(
+            reverse("card_qr", kwargs={"card_id": business_card.id}), {"format": "svg"}
+        )
+        assert response.status_code == 200
+        assert response["Content-Type"] == "image/svg+xml"
+        assert response.content.startswith(b"<svg")
+
+    def test_card_qr_code_view_return_400_for_unsupported_size(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        response = client.get(
+            reverse("card_qr", kwargs={"card_id": business_card.id}), {"size": "100"}
+        )
+        assert response.status_code == 400
+
+    def test_card_qr_code_view_return_503_when_image_processing_times_out(
+        self, business_card: BusinessCard
+    ):
+        with patch(
+            "cards.services.run_cpu_bound",
+            side_effect=ExecutorBusyError("Image processing timed out."),
+        ):
+            response = Client().get(
+                reverse("card_qr", kwargs={"card_id": business_card.id})
+            )
+        assert response.status_code == 503
+        assert response["Retry-After"] == str(settings.CARDS_IMAGE_EXECUTOR_RETRY_AFTER)
+
+    def test_card_qr_code_view_rerender_after_domain_change(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        url = reverse("card_qr", kwargs={"card_id": business_card.id})
+        old_response = client.get(url)
+        with patch.object(settings, "DOMAIN", "https://cards.example.com/"):
+            new_response = client.get(url, HTTP_IF_NONE_MATCH=old_response["ETag"])
+        assert new_response.status_code == 200
+        assert new_response["ETag"] != old_response["ETag"]
+        assert new_response.content != old_response.content
+
+    def test_card_qr_code_view_return_404_after_card_deleted(
+        self, business_card: BusinessCard
+    ):
+        client = Client()
+        url = reverse("card_qr", kwargs={"card_id": business_card.id})
+        assert client.get(url).status_code == 200
+        business_card.delete()
+        assert client.get(url).status_code == 404
+
+    def test_card_qr_code_view_return_404_for_unknown_card(self):
+        client = Client()
+        response = client.get(reverse("card_qr", kwargs={"card_id": uuid.uuid4()}))
+        assert response.status_code == 404
+
+
 @pytest.mark.django_db
 class TestContactRequestFirstStepView:
     def test_contact_request_first_step_view_return_200_for_anonymous_user(
@@ -296,6 +583,22 @@ class TestContactRequestFirstStepView:
         )
         assert response.status_code == 200
 
+    def test_contact_request_first_step_view_render_photo_srcset(
+        self, business_card: BusinessCard
+    ):
+        business_card.photo_thumbnails = {
+            "jpeg": {"96": "thumbnails/a.jpg", "192": "thumbnails/b.jpg"},
+            "webp": {"96": "thumbnails/a.webp"},
+        }
+        business_card.save()
+        client = Client()
+        response = client.get(
+            reverse("upload_phone_num", kwargs={"card_id": business_card.id})
+        )
+        assert response.status_code == 200
+        assert b"thumbnails/a.jpg 96w, /media/thumbnails/b.jpg 192w" in response.content
+        assert b'type="image/webp"' in response.content
+
     def test_contact_request_first_step_view_return_302_when_anonymous_user_post_phone_number(
         self, business_card: BusinessCard, request_mocker
     ):
@@ -317,6 +620,37 @@ class TestContactRequestFirstStepView:
             + f"?contact_request_id={created_contact.id}"
         )
 
+    def test_contact_request_first_step_view_enqueue_phone_instead_of_calling_ceremeo(
+        self, business_card: BusinessCard, request_mocker
+    ):
+        client = Client()
+        data = {"phone_number": "+48564738467"}
+        request_mocker.post(settings.CEREMEO_URL, status_code=500)
+        response = client.post(
+            reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+            data=data,
+            format="json",
+        )
+        assert response.status_code == 302
+        assert not request_mocker.called
+        created_contact = ContactRequest.objects.get(phone_number=data["phone_number"])
+        delivery = CeremeoOutbox.objects.get(contact_request=created_contact)
+        assert delivery.payload == {"phone": data["phone_number"]}
+
+    def test_contact_request_first_step_view_post_phone_number_within_query_budget(
+        self, business_card: BusinessCard, django_assert_num_queries
+    ):
+        client = Client()
+        data = {"phone_number": "+48564738467"}
+        # card with lead, duplicate check, savepoint, contact, outbox row, release
+        with django_assert_num_queries(6):
+            response = client.post(
+                reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+                data=data,
+                format="json",
+            )
+        assert response.status_code == 302
+
     def test_contact_request_first_step_view_return_302_when_authenticated_user_post_phone_number(
         self,
         client: Client,
@@ -364,6 +698,41 @@ class TestContactRequestFirstStepView:
         )
         assert response.status_code == 400
 
+    def test_contact_request_first_step_view_enqueue_every_contact_of_uploaded_vcard(
+        self, business_card: BusinessCard
+    ):
+        vcard_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "test_data",
+            "test_vcards",
+            "multi_contact_vcard.vcf",
+        )
+        with open(vcard_path, "rb") as vcard:
+            response = Client().post(
+                reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+                data={"vcard": vcard},
+            )
+        assert response.status_code == 200
+        assert response.context["contacts_received"] == 2
+        assert CeremeoOutbox.objects.count() == 2
+        assert not ContactRequest.objects.exists()
+
+    def test_contact_request_first_step_view_return_400_when_vcard_cannot_be_decoded(
+        self, business_card: BusinessCard
+    ):
+        vcard = SimpleUploadedFile(
+            "broken.vcf",
+            b"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:Jan\r\n"
+            b"TEL;ENCODING=b:abc\r\nEND:VCARD\r\n",
+            "text/vcard",
+        )
+        response = Client().post(
+            reverse("upload_phone_num", kwargs={"card_id": business_card.id}),
+            data={"vcard": vcard},
+        )
+        assert response.status_code == 400
+        assert not CeremeoOutbox.objects.exists()
+
 
 @pytest.mark.django_db
 class TestContactRequestSecondStepView:
@@ -0,0 +1,259 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+
+from django.http import FileResponse, HttpRequest, HttpResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from BusinessApp import settings
+
+TIMING_PHASES = ("db", "ceremeo", "image", "template")
+
+_request_timings: ContextVar[Optional[Counter]] = ContextVar(
+    "cards_request_timings", default=None
+)
+_metrics_lock = threading.Lock()
+_requests: Counter = Counter()
+_duration_buckets: defaultdict[str, list[int]] = defaultdict(
+    lambda: [0] * (len(settings.CARDS_METRICS_DURATION_BUCKETS) + 1)
+)
+_duration_sums: Counter = Counter()
+_phase_seconds: Counter = Counter()
+_db_queries: Counter = Counter()
+
+
+@contextmanager
+def track_request_timings() -> Iterator[Counter]:
+    timings = Counter()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings["db"] += time.perf_counter() - start
+        timings["db_queries"] += 1
+
+
+def get_view_label(request: HttpRequest) -> str:
+    resolver_match = getattr(request, "resolver_match", None)
+    if resolver_match is None or resolver_match.url_name is None:
+        return "unmatched"
+    return resolver_match.url_name
+
+
+def observe_request(
+    view: str, method: str, status: int, duration: float, timings: Counter
+) -> None:
+    bucket = bisect_left(settings.CARDS_METRICS_DURATION_BUCKETS, duration)
+    with _metrics_lock:
+        _requests[view, method, status] += 1
+        _duration_buckets[view][bucket] += 1
+        _duration_sums[view] += duration
+        _db_queries[view] += timings["db_queries"]
+        for phase in TIMING_PHASES:
+            _phase_seconds[view, phase] += timings[phase]
+
+
+def format_server_timing(duration: float, timings: Counter) -> str:
+    metrics = [
+        f"total;dur={duration * 1000:.2f}",
+        f'db;dur={timings["db"] * 1000:.2f};desc="{timings["db_queries"]} queries"',
+    ]
+    for phase in TIMING_PHASES[1:]:
+        if timings[phase]:
+            metrics.append(f"{phase};dur={timings[phase] * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+def observe_request_timing(
+    request: HttpRequest, response: HttpResponse, start: float, timings: Counter
+) -> float:
+    duration = time.perf_counter() - start
+    observe_request(
+        view=get_view_label(request),
+        method=request.method,
+        status=response.status_code,
+        duration=duration,
+        timings=timings,
+    )
+    return duration
+
+
+def time_streaming_content(
+    content: Iterator[bytes],
+    request: HttpRequest,
+    response: HttpResponse,
+    start: float,
+    timings: Counter,
+) -> Iterator[bytes]:
+    try:
+        iterator = iter(content)
+        while True:
+            token = _request_timings.set(timings)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _request_timings.reset(token)
+            yield chunk
+    finally:
+        observe_request_timing(request, response, start, timings)
+
+
+async def atime_streaming_content(
+    content: AsyncIterator[bytes],
+    request: HttpRequest,
+    response: HttpResponse,
+    start: float,
+    timings: Counter,
+) -> AsyncIterator[bytes]:
+    try:
+        iterator = aiter(content)
+        while True:
+            token = _request_timings.set(timings)
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                _request_timings.reset(token)
+            yield chunk
+    finally:
+        observe_request_timing(request, response, start, timings)
+
+
+def finish_request_timing(
+    request: HttpRequest, response: HttpResponse, start: float, timings: Counter
+) -> HttpResponse:
+    if response.streaming and not isinstance(response, FileResponse):
+        time_content = (
+            atime_streaming_content if response.is_async else time_streaming_content
+        )
+        response.streaming_content = time_content(
+            response.streaming_content, request, response, start, timings
+        )
+        return response
+    duration = observe_request_timing(request, response, start, timings)
+    if settings.CARDS_SERVER_TIMING:
+        response["Server-Timing"] = format_server_timing(duration, timings)
+    return response
+
+
+def clear_request_metrics() -> None:
+    with _metrics_lock:
+        _requests.clear()
+        _duration_buckets.clear()
+        _duration_sums.clear()
+        _phase_seconds.clear()
+        _db_queries.clear()
+
+
+def format_metric(name: str, labels: dict[str, any], value: float) -> str:
+    label_values = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    return f"{name}{{{label_values}}} {value:g}"
+
+
+def render_metrics(card_projection_stats: dict[str, int]) -> str:
+    lines = ["# TYPE cards_requests_total counter"]
+    with _metrics_lock:
+        for (view, method, status), count in sorted(_requests.items()):
+            lines.append(
+                format_metric(
+                    "cards_requests_total",
+                    {"view": view, "method": method, "status": status},
+                    count,
+                )
+            )
+
+        lines.append("# TYPE cards_request_duration_seconds histogram")
+        for view, buckets in sorted(_duration_buckets.items()):
+            upper_bounds = [*settings.CARDS_METRICS_DURATION_BUCKETS, "+Inf"]
+            cumulative = 0
+            for upper_bound, count in zip(upper_bounds, buckets):
+                cumulative += count
+                lines.append(
+                    format_metric(
+                        "cards_request_duration_seconds_bucket",
+                        {"view": view, "le": upper_bound},
+                        cumulative,
+                    )
+                )
+            lines.append(
+                format_metric(
+                    "cards_request_duration_seconds_sum",
+                    {"view": view},
+                    _duration_sums[view],
+                )
+            )
+            lines.append(
+                format_metric(
+                    "cards_request_duration_seconds_count", {"view": view}, cumulative
+                )
+            )
+
+        lines.append("# TYPE cards_request_phase_seconds_total counter")
+        for (view, phase), seconds in sorted(_phase_seconds.items()):
+            lines.append(
+                format_metric(
+                    "cards_request_phase_seconds_total",
+                    {"view": view, "phase": phase},
+                    seconds,
+                )
+            )
+
+        lines.append("# TYPE cards_db_queries_total counter")
+        for view, count in sorted(_db_queries.items()):
+            lines.append(format_metric("cards_db_queries_total", {"view": view}, count))
+
+    lines.append("# TYPE cards_card_projection_events_total counter")
+    for event, count in card_projection_stats.items():
+        lines.append(
+            format_metric("cards_card_projection_events_total", {"event": event}, count)
+        )
+    return "\n".join(lines) + "\n"
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None) -> str:
+        with timed("template"):
+            return super().render(context=context, request=request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code: str) -> TimedTemplate:
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,68 @@
+from typing import Optional
+
+from django.core.files.uploadhandler import FileUploadHandler
+from PIL import ImageFile
+
+from BusinessApp import settings
+
+IMAGE_HEADER_LIMIT = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ) -> None:
+        if content_length > settings.CARDS_UPLOAD_MAX_REQUEST_SIZE:
+            raise UploadTooLarge(
+                f"Request body cannot be larger than "
+                f"{settings.CARDS_UPLOAD_MAX_REQUEST_SIZE // 1024} KB."
+            )
+
+    def new_file(self, field_name: str, *args, **kwargs) -> None:
+        super().new_file(field_name, *args, **kwargs)
+        self.limit = settings.CARDS_UPLOAD_FIELD_LIMITS.get(
+            field_name, min(settings.CARDS_UPLOAD_FIELD_LIMITS.values())
+        )
+        self.received = 0
+        self.image_parser: Optional[ImageFile.Parser] = (
+            ImageFile.Parser()
+            if field_name in settings.CARDS_UPLOAD_IMAGE_FIELDS
+            else None
+        )
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            raise UploadTooLarge(
+                f"{self.field_name} cannot be larger than {self.limit // 1024} KB."
+            )
+        if self.image_parser is not None:
+            self.check_image_dimensions(raw_data)
+        return raw_data
+
+    def check_image_dimensions(self, raw_data: bytes) -> None:
+        try:
+            self.image_parser.feed(raw_data)
+        except Exception:
+            self.image_parser = None
+            return
+        if self.image_parser.image is None:
+            if self.received > IMAGE_HEADER_LIMIT:
+                self.image_parser = None
+            return
+
+        max_width, max_height = settings.CARDS_UPLOAD_MAX_IMAGE_DIMENSIONS
+        width, height = self.image_parser.image.size
+        self.image_parser = None
+        if width > max_width or height > max_height:
+            raise UploadTooLarge(
+                f"{self.field_name} cannot be larger than "
+                f"{max_width}x{max_height} pixels."
+            )
+
+    def file_complete(self, file_size: int) -> None:
+        return None
@@ -2,22 +2,51 @@ from django.conf.urls.static import static
 from django.urls import path
 
 from BusinessApp import settings
+from cards.middleware import limit_uploads
 from cards.views import (
     CreateCardView,
     MyCardView,
+    CardQRCodeView,
+    CardVCardView,
+    ContactRequestExportView,
     ContactRequestFirstStepView,
     ContactRequestSecondStepView,
     ContactRequestThirdStepView,
     CompletedContactRequestView,
+    MetricsView,
 )
+from cards.async_views import (
+    AsyncContactRequestExportView,
+    AsyncContactRequestFirstStepView,
+    AsyncContactRequestSecondStepView,
+    AsyncContactRequestThirdStepView,
+    AsyncCompletedContactRequestView,
+)
+
+if settings.CARDS_ASYNC_FUNNEL:
+    ContactRequestFirstStepView = AsyncContactRequestFirstStepView
+    ContactRequestSecondStepView = AsyncContactRequestSecondStepView
+    ContactRequestThirdStepView = AsyncContactRequestThirdStepView
+    CompletedContactRequestView = AsyncCompletedContactRequestView
+    ContactRequestExportView = AsyncContactRequestExportView
 
 urlpatterns = (
     [
-        path("create_card/", CreateCardView.as_view(), name="create_card"),
+        path(
+            "create_card/", limit_uploads(CreateCardView.as_view()), name="create_card"
+        ),
         path("my_card/", MyCardView.as_view(), name="card_info"),
+        path("metrics/", MetricsView.as_view(), name="metrics"),
+        path(
+            "my_card/contact_requests/export/",
+            ContactRequestExportView.as_view(),
+            name="export_contact_requests",
+        ),
+        path("card/<uuid:card_id>/qr/", CardQRCodeView.as_view(), name="card_qr"),
+        path("card/<uuid:card_id>/vcard/", CardVCardView.as_view(), name="card_vcard"),
         path(
             "contact_request/<uuid:card_id>/phone_number/",
-            ContactRequestFirstStepView.as_view(),
+            limit_uploads(ContactRequestFirstStepView.as_view()),
             name="upload_phone_num",
         ),
         path(
@@ -1,4 +1,3 @@
-import magic
 from datetime import date, timedelta
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import InMemoryUploadedFile
@@ -7,16 +6,16 @@ from PIL import Image
 from django.utils.timezone import now
 
 from BusinessApp import settings
+from cards.images import get_image_ingest
 from cards.models import BusinessCard, ContactRequest
+from cards.sniffing import read_file_header, sniff_mime_type
 
 
 def validate_image_format(uploaded_image: InMemoryUploadedFile) -> None:
     if uploaded_image is None:
         raise ValidationError("No image provided.")
 
-    image_bytes = uploaded_image.read()
-    mime = magic.Magic(mime=True)
-    mime_type = mime.from_buffer(image_bytes[:2048])
+    mime_type = sniff_mime_type(get_image_ingest(uploaded_image).header)
 
     if not any(
         mime_type.startswith(content_type)
@@ -35,9 +34,7 @@ def validate_vcard_format(uploaded_vcard: InMemoryUploadedFile) -> None:
     if uploaded_vcard is None:
         raise ValidationError("No vcard provided.")
 
-    image_bytes = uploaded_vcard.read()
-    mime = magic.Magic(mime=True)
-    mime_type = mime.from_buffer(image_bytes[:2048])
+    mime_type = sniff_mime_type(read_file_header(uploaded_vcard))
 
     if not any(
         mime_type.startswith(content_type)
@@ -50,6 +47,14 @@ def validate_vcard_format(uploaded_vcard: InMemoryUploadedFile) -> None:
         raise ValidationError("Invalid vcard extension.")
 
 
+def validate_vcard_size(uploaded_vcard: InMemoryUploadedFile) -> None:
+    if uploaded_vcard.size > settings.CARDS_VCARD_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            f"vCard file cannot be larger than "
+            f"{settings.CARDS_VCARD_MAX_UPLOAD_SIZE // 1024} KB."
+        )
+
+
 def validate_image_size(uploaded_image: InMemoryUploadedFile) -> Image:
     min_width = 100
     min_height = 100
@@ -59,8 +64,7 @@ def validate_image_size(uploaded_image: InMemoryUploadedFile) -> Image:
     if uploaded_image is None:
         raise ValidationError("No image provided.")
 
-    image = Image.open(uploaded_image)
-    width, height = image.size
+    width, height = get_image_ingest(uploaded_image).size
 
     if width > max_width or height > max_height:
         raise ValidationError(
@@ -73,9 +77,17 @@ def validate_image_size(uploaded_image: InMemoryUploadedFile) -> Image:
         )
 
 
+def validate_image_decodes(uploaded_image: InMemoryUploadedFile) -> None:
+    try:
+        get_image_ingest(uploaded_image).decode()
+    except OSError:
+        raise ValidationError("Photo could not be decoded.")
+
+
 def validate_user_photo(uploaded_image: InMemoryUploadedFile) -> None:
     validate_image_format(uploaded_image=uploaded_image)
     validate_image_size(uploaded_image=uploaded_image)
+    validate_image_decodes(uploaded_image=uploaded_image)
 
 
 def validate_business_card_duplication(user: User) -> None:
@@ -90,13 +102,12 @@ def validate_vcard_data(vcard_data: dict) -> None:
         if key not in vcard_data:
             raise ValidationError(f"Missing required key: {key}")
 
-    if not vcard_data["phone"].startswith("+48"):
+    if not (vcard_data["phone"] or "").startswith("+48"):
         raise ValidationError("Phone number must start with '+48'")
 
 
 def validate_phone_number_for_contact_request(phone_number: str) -> None:
-    contact_request = ContactRequest.objects.filter(phone_number=phone_number)
-    if contact_request:
+    if ContactRequest.objects.filter(phone_number=phone_number).exists():
         raise ValidationError("You cannot create contact request for your own card.")
 
 
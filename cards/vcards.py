@@ -0,0 +1,151 @@
+from typing import Iterable, Iterator, Optional
+
+import vobject
+from vobject.icalendar import stringToTextValues
+from vobject.vcard import splitFields
+
+SKIPPED_PROPERTIES = {"PHOTO", "LOGO", "SOUND", "KEY"}
+EXTRACTED_PROPERTIES = {"TEL", "N", "EMAIL", "ORG"}
+UNSUPPORTED_PARAMETERS = ("QUOTED-PRINTABLE", "BASE64", "ENCODING", "CHARSET")
+
+
+class VCardFastPathError(Exception):
+    pass
+
+
+def get_vcard_component_fields(vcard: vobject.base.Component) -> dict[str, any]:
+    name = vcard.n.value if "n" in vcard.contents else None
+    return {
+        "tel": vcard.tel.value if "tel" in vcard.contents else None,
+        "family": name.family if name else None,
+        "given": name.given if name else None,
+        "email": vcard.email.value if "email" in vcard.contents else None,
+        "org": vcard.org.value if "org" in vcard.contents else None,
+    }
+
+
+class LineStream:
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.lines = iter(lines)
+
+    def readline(self) -> str:
+        return next(self.lines, "")
+
+
+def read_vcard_fields(lines: Iterable[str]) -> Iterator[dict[str, any]]:
+    for vcard in vobject.readComponents(LineStream(lines), allowQP=True):
+        if vcard.name == "VCARD":
+            yield get_vcard_component_fields(vcard)
+
+
+def split_content_line(line: str) -> tuple[str, str, str]:
+    colon = line.find(":")
+    if colon == -1:
+        raise VCardFastPathError(f"Content line without a value: {line[:50]}")
+    name_and_parameters = line[:colon]
+    name, _, parameters = name_and_parameters.partition(";")
+    return (
+        name.rpartition(".")[2].strip().upper(),
+        parameters.upper(),
+        line[colon + 1 :],
+    )
+
+
+def iter_logical_lines(lines: Iterable[str]) -> Iterator[tuple[str, list[str]]]:
+    logical_line = None
+    physical_lines = []
+    skipping = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            if logical_line is not None:
+                yield logical_line, physical_lines
+            logical_line, physical_lines, skipping = None, [], False
+        elif line[0] in " \t" and (logical_line is not None or skipping):
+            if not skipping:
+                logical_line += line[1:]
+                physical_lines.append(line)
+        else:
+            if logical_line is not None:
+                yield logical_line, physical_lines
+            logical_line, physical_lines, skipping = None, [], False
+            colon = line.find(":")
+            name = line[: colon if colon != -1 else len(line)].partition(";")[0]
+            if name.rpartition(".")[2].strip().upper() in SKIPPED_PROPERTIES:
+                skipping = True
+            else:
+                logical_line, physical_lines = line, [line]
+    if logical_line is not None:
+        yield logical_line, physical_lines
+
+
+def decode_vcard_fields(properties: dict[str, str]) -> dict[str, any]:
+    name = splitFields(properties["N"]) if "N" in properties else None
+    if name is not None:
+        name += [""] * (2 - len(name))
+    return {
+        "tel": (
+            stringToTextValues(properties["TEL"])[0] if "TEL" in properties else None
+        ),
+        "family": name[0] if name else None,
+        "given": name[1] if name else None,
+        "email": (
+            stringToTextValues(properties["EMAIL"])[0]
+            if "EMAIL" in properties
+            else None
+        ),
+        "org": splitFields(properties["ORG"]) if "ORG" in properties else None,
+    }
+
+
+def extract_vcard_fields(lines: Iterable[str]) -> Iterator[dict[str, any]]:
+    properties: Optional[dict[str, str]] = None
+    raw_lines: list[str] = []
+    unsupported = False
+    depth = 0
+    skipped_depth = 0
+    for line, physical_lines in iter_logical_lines(lines):
+        if properties is None:
+            name, _, value = split_content_line(line)
+            component = value.strip().upper()
+            if skipped_depth:
+                if name in ("BEGIN", "END"):
+                    skipped_depth += 1 if name == "BEGIN" else -1
+                continue
+            if name != "BEGIN":
+                raise VCardFastPathError(f"Unexpected line outside a vCard: {name}")
+            if component != "VCARD":
+                skipped_depth = 1
+                continue
+            properties, raw_lines, unsupported = {}, list(physical_lines), False
+            continue
+
+        raw_lines.extend(physical_lines)
+        if ":" not in line:
+            unsupported = True
+            continue
+        name, parameters, value = split_content_line(line)
+        if name == "BEGIN":
+            depth += 1
+            unsupported = True
+        elif name == "END" and depth:
+            depth -= 1
+        elif name == "END":
+            if value.strip().upper() != "VCARD":
+                raise VCardFastPathError(f"Unexpected END:{value} in a vCard")
+            if unsupported:
+                vcard = vobject.readOne("\n".join(raw_lines), allowQP=True)
+                yield get_vcard_component_fields(vcard)
+            else:
+                yield decode_vcard_fields(properties)
+            properties = None
+        elif "QUOTED-PRINTABLE" in parameters:
+            unsupported = True
+        elif name in EXTRACTED_PROPERTIES:
+            if '"' in parameters or any(
+                parameter in parameters for parameter in UNSUPPORTED_PARAMETERS
+            ):
+                unsupported = True
+            properties.setdefault(name, value)
+    if properties is not None or skipped_depth:
+        raise VCardFastPathError("vCard was never closed")
@@ -1,43 +1,72 @@
 import uuid
+from typing import Optional
 
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.http import (
+    FileResponse,
+    Http404,
     HttpRequest,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
     HttpResponseRedirect,
+    StreamingHttpResponse,
 )
 from django.shortcuts import render, get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
 from django.views import View
 
-from cards.models import BusinessCard, ContactRequest
+from BusinessApp import settings
+from cards.executors import ExecutorBusyError
+from cards.models import BusinessCard
 from cards.services import (
     create_business_card,
     get_user_card_qr_url,
     get_user_card_url,
+    get_card_qr_code,
+    stream_contact_requests_export,
+    refresh_business_card_vcard_hash,
     get_business_card,
-    create_contact_request,
-    send_data_to_ceremeo_api,
-    send_parsed_vcard_data_to_ceremeo,
+    submit_first_step_contact_request,
+    enqueue_parsed_vcard_data,
     redirect_based_on_request_contact_state,
     get_contact_request,
+    delete_contact_request,
     get_phone_number_and_vcard_from_request_data,
     convert_request_data_to_ceremeo_format_second_step,
-    update_contact_request,
+    advance_contact_request,
     convert_request_data_to_ceremeo_format_third_step,
     get_random_meme,
 )
+from cards.funnel import (
+    get_funnel_state,
+    set_funnel_state,
+    clear_funnel_state,
+    redirect_to_contact_request_step,
+    route_funnel_state,
+    get_posted_contact_request_id,
+)
+from cards.projections import get_card_projection, get_card_projection_stats
+from cards.timing import render_metrics
 from cards.forms import (
     BusinessCardForm,
+    QRCodeForm,
     FirstStepContactForm,
     SecondStepContactForm,
     ThirdStepContactForm,
 )
 
 
+def image_processing_unavailable(error: ExecutorBusyError) -> HttpResponse:
+    response = HttpResponse(str(error), status=503)
+    response["Retry-After"] = str(settings.CARDS_IMAGE_EXECUTOR_RETRY_AFTER)
+    return response
+
+
 class CreateCardView(View):
     def get(self, request: HttpRequest) -> HttpResponse:
         if not request.user.is_authenticated:
@@ -53,6 +82,8 @@ class CreateCardView(View):
                 return HttpResponseRedirect(reverse("card_info"))
             except ValidationError as e:
                 return HttpResponseBadRequest(e.message)
+            except ExecutorBusyError as e:
+                return image_processing_unavailable(e)
         return render(request, "form_validation_error.html", {"form": form}, status=400)
 
 
@@ -68,103 +99,197 @@ class MyCardView(View):
         business_card = get_business_card(user_id=request.user.id)
         context = {
             "card_url": get_user_card_url(card_id=business_card.id),
-            "qr_code": get_user_card_qr_url(user=request.user),
+            "qr_code": get_user_card_qr_url(card_id=business_card.id),
         }
         return render(request, "user_card_info.html", context)
 
 
+class CardQRCodeView(View):
+    def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        form = QRCodeForm(request.GET)
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+        image_format = form.cleaned_data["format"] or "png"
+        try:
+            content, etag = get_card_qr_code(
+                card_id=card_id,
+                image_format=image_format,
+                size=form.cleaned_data["size"],
+                optimize=form.cleaned_data["optimize"],
+            )
+        except ExecutorBusyError as e:
+            return image_processing_unavailable(e)
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            response=HttpResponse(
+                content, content_type=settings.CARDS_QR_FORMATS[image_format]
+            ),
+        )
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.CARDS_QR_MAX_AGE)
+        return response
+
+
+class ContactRequestExportView(View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        if not request.user.is_authenticated:
+            return HttpResponseForbidden("You must be logged in.")
+        export_format = request.GET.get("format", "vcf")
+        if export_format not in settings.CARDS_EXPORT_FORMATS:
+            return HttpResponseBadRequest("Unsupported export format.")
+        return StreamingHttpResponse(
+            stream_contact_requests_export(
+                lead=request.user, export_format=export_format
+            ),
+            content_type=settings.CARDS_EXPORT_FORMATS[export_format],
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="contact_requests.{export_format}"'
+                )
+            },
+        )
+
+
+def build_sendfile_response(
+    stored_file, filename: str, content_type: str
+) -> HttpResponse:
+    if settings.CARDS_SENDFILE_BACKEND == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = (
+            f"{settings.CARDS_SENDFILE_ACCEL_PREFIX}{stored_file.name}"
+        )
+    elif settings.CARDS_SENDFILE_BACKEND == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = stored_file.path
+    else:
+        return FileResponse(
+            stored_file.open("rb"),
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+class CardVCardView(View):
+    def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        business_card = get_object_or_404(
+            BusinessCard.objects.only("id", "vcard", "vcard_hash", "vcard_updated_at"),
+            id=card_id,
+        )
+        if not business_card.vcard:
+            raise Http404("Business card has no vCard.")
+        if not business_card.vcard_hash:
+            try:
+                refresh_business_card_vcard_hash(business_card)
+            except OSError:
+                raise Http404("Business card vCard file is missing.")
+
+        etag = quote_etag(business_card.vcard_hash)
+        last_modified = int(business_card.vcard_updated_at.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            try:
+                response = build_sendfile_response(
+                    business_card.vcard,
+                    filename=f"{business_card.id}.vcf",
+                    content_type="text/vcard",
+                )
+            except OSError:
+                raise Http404("Business card vCard file is missing.")
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=settings.CARDS_VCARD_MAX_AGE)
+        return response
+
+
+def get_contact_request_id_for_step(
+    request: HttpRequest, card_id: uuid.UUID, step_url: str
+) -> tuple[Optional[str], Optional[HttpResponseRedirect]]:
+    funnel_state = get_funnel_state(request=request, card_id=card_id)
+    if funnel_state is not None:
+        return funnel_state.contact_request_id, route_funnel_state(
+            funnel_state, card_id, step_url
+        )
+
+    contact_request_id = request.GET.get("contact_request_id")
+    if contact_request_id is None:
+        return None, redirect_to_contact_request_step("upload_phone_num", card_id, None)
+
+    contact_request = get_contact_request(contact_id=contact_request_id)
+    if contact_request is None:
+        return None, redirect_to_contact_request_step("upload_phone_num", card_id, None)
+
+    redirect_url = redirect_based_on_request_contact_state(contact_request)
+    if redirect_url != step_url:
+        return None, redirect_to_contact_request_step(
+            redirect_url, card_id, contact_request.id
+        )
+    return contact_request_id, None
+
+
 class ContactRequestFirstStepView(View):
     def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
-        business_card = get_object_or_404(BusinessCard, id=card_id)
+        card_projection = get_card_projection(card_id=card_id)
         form = FirstStepContactForm()
-        context = {
-            "name_and_surname": business_card.name_and_surname,
-            "company": business_card.company,
-            "lead_photo": business_card.user_photo,
-            "form": form,
-        }
+        context = {"card_id": card_id, **card_projection, "form": form}
         return render(request, "first_step_form.html", context)
 
-    def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponseRedirect:
-        business_card = get_object_or_404(BusinessCard, id=card_id)
+    def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
+        business_card = get_object_or_404(
+            BusinessCard.objects.select_related("user"), id=card_id
+        )
         form = FirstStepContactForm(request.POST, request.FILES)
-        created_contact_request = None
-        redirect_url_name = ""
-
         if form.is_valid():
             phone_number, vcard = get_phone_number_and_vcard_from_request_data(
                 data=form.cleaned_data
             )
 
-            contact_request = ContactRequest.objects.filter(phone_number=phone_number)
-            if contact_request:
-                redirect_url = redirect_based_on_request_contact_state(contact_request)
-                if redirect_url:
-                    return HttpResponseRedirect(
-                        reverse(redirect_url, kwargs={"card_id": card_id})
-                        + f"?contact_request_id={contact_request.id}"
-                    )
             if phone_number:
-                phone, created_contact_request = create_contact_request(
+                created_contact_request = submit_first_step_contact_request(
                     data=form.cleaned_data,
                     requestor=request.user,
                     lead=business_card.user,
                 )
-                error_message = send_data_to_ceremeo_api(data=phone)
-                if error_message is None:
-                    created_contact_request.form_step = 2
-                    created_contact_request.save()
-                redirect_url_name = "requestor_info"
-            else:
-                error_message = send_parsed_vcard_data_to_ceremeo(vcard=vcard)
-                redirect_url_name = "contact_prefs"
+                response = redirect_to_contact_request_step(
+                    "requestor_info", card_id, created_contact_request.id
+                )
+                return set_funnel_state(
+                    request, response, card_id, created_contact_request.id, step=2
+                )
 
-            if error_message:
+            try:
+                deliveries = enqueue_parsed_vcard_data(vcard=vcard)
+            except ValidationError as e:
+                form.add_error("vcard", e)
+            else:
                 return render(
                     request,
-                    "ceremeo_error.html",
-                    {"error_message": error_message},
-                    status=500,
+                    "finish_meme.html",
+                    {
+                        "card_id": card_id,
+                        "contacts_received": len(deliveries),
+                        "random_meme": get_random_meme(),
+                        **get_card_projection(card_id=card_id),
+                    },
                 )
 
-        if created_contact_request:
-            return HttpResponseRedirect(
-                reverse(redirect_url_name, kwargs={"card_id": card_id})
-                + f"?contact_request_id={created_contact_request.id}"
-            )
-        else:
-            return render(
-                request, "form_validation_error.html", {"form": form}, status=400
-            )
+        return render(request, "form_validation_error.html", {"form": form}, status=400)
 
 
 class ContactRequestSecondStepView(View):
     def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponseRedirect:
-        contact_request_id = request.GET.get("contact_request_id")
-        if contact_request_id is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        contact_request = get_contact_request(contact_id=contact_request_id)
-        if contact_request is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        redirect_url = redirect_based_on_request_contact_state(contact_request)
-
-        if redirect_url != "requestor_info":
-            if redirect_url == "upload_phone_num":
-                return HttpResponseRedirect(
-                    reverse(redirect_url, kwargs={"card_id": card_id})
-                )
-            return HttpResponseRedirect(
-                reverse(redirect_url, kwargs={"card_id": card_id})
-                + f"?contact_request_id={contact_request.id}"
-            )
+        contact_request_id, redirect = get_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="requestor_info"
+        )
+        if redirect is not None:
+            return redirect
 
-        business_card = get_object_or_404(BusinessCard, id=card_id)
+        card_projection = get_card_projection(card_id=card_id)
         form = SecondStepContactForm()
         return render(
             request,
@@ -173,69 +298,50 @@ class ContactRequestSecondStepView(View):
                 "form": form,
                 "card_id": card_id,
                 "contact_request_id": contact_request_id,
-                "lead_photo": business_card.user_photo,
+                **card_projection,
             },
         )
 
     def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponseRedirect:
-        contact_request_id = request.POST.get("contact_request_id")
-        if contact_request_id is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
+        contact_request_id, redirect = get_posted_contact_request_id(
+            request=request, card_id=card_id, step_url="requestor_info"
+        )
+        if redirect is not None:
+            return redirect
         form = SecondStepContactForm(request.POST)
         if form.is_valid():
             contact_request = get_contact_request(contact_id=contact_request_id)
+            if contact_request is None:
+                return redirect_to_contact_request_step(
+                    "upload_phone_num", card_id, None
+                )
             data_to_ceremeo = convert_request_data_to_ceremeo_format_second_step(
                 data=form.cleaned_data, phone=contact_request.phone_number
             )
-            error_message = send_data_to_ceremeo_api(data=data_to_ceremeo)
-            if error_message is None:
-                update_contact_request(
-                    data=form.cleaned_data, contact_request=contact_request, step=3
-                )
-            redirect_url = "contact_prefs"
-            if error_message:
-                return render(
-                    request,
-                    "ceremeo_error.html",
-                    {"error_message": error_message},
-                    status=500,
-                )
-            return HttpResponseRedirect(
-                reverse(redirect_url, kwargs={"card_id": card_id})
-                + f"?contact_request_id={contact_request.id}"
+            advance_contact_request(
+                contact_request=contact_request,
+                data=form.cleaned_data,
+                ceremeo_data=data_to_ceremeo,
+                step=3,
+            )
+            response = redirect_to_contact_request_step(
+                "contact_prefs", card_id, contact_request.id
+            )
+            return set_funnel_state(
+                request, response, card_id, contact_request.id, step=3
             )
         return render(request, "form_validation_error.html", {"form": form}, status=400)
 
 
 class ContactRequestThirdStepView(View):
     def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponse:
-        contact_request_id = request.GET.get("contact_request_id")
-        if contact_request_id is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        contact_request = get_contact_request(contact_id=contact_request_id)
-        if contact_request is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        redirect_url = redirect_based_on_request_contact_state(contact_request)
-
-        if redirect_url != "contact_prefs":
-            if redirect_url == "upload_phone_num":
-                return HttpResponseRedirect(
-                    reverse(redirect_url, kwargs={"card_id": card_id})
-                )
-            return HttpResponseRedirect(
-                reverse(redirect_url, kwargs={"card_id": card_id})
-                + f"?contact_request_id={contact_request.id}"
-            )
+        contact_request_id, redirect = get_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="contact_prefs"
+        )
+        if redirect is not None:
+            return redirect
 
-        business_card = get_object_or_404(BusinessCard, id=card_id)
+        card_projection = get_card_projection(card_id=card_id)
         form = ThirdStepContactForm()
         return render(
             request,
@@ -244,78 +350,81 @@ class ContactRequestThirdStepView(View):
                 "form": form,
                 "card_id": card_id,
                 "contact_request_id": contact_request_id,
-                "lead_photo": business_card.user_photo,
+                **card_projection,
             },
         )
 
     def post(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponseRedirect:
-        contact_request_id = request.POST.get("contact_request_id")
-        if contact_request_id is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
+        contact_request_id, redirect = get_posted_contact_request_id(
+            request=request, card_id=card_id, step_url="contact_prefs"
+        )
+        if redirect is not None:
+            return redirect
         form = ThirdStepContactForm(request.POST)
         if form.is_valid():
             contact_request = get_contact_request(contact_id=contact_request_id)
+            if contact_request is None:
+                return redirect_to_contact_request_step(
+                    "upload_phone_num", card_id, None
+                )
             ceremeo_data = convert_request_data_to_ceremeo_format_third_step(
                 data=form.cleaned_data, phone=contact_request.phone_number
             )
-            error_message = send_data_to_ceremeo_api(data=ceremeo_data)
-            if error_message is None:
-                update_contact_request(
-                    data=form.cleaned_data, contact_request=contact_request, step=4
-                )
-            redirect_url = "finish_meme"
-            if error_message:
-                return render(
-                    request,
-                    "ceremeo_error.html",
-                    {"error_message": error_message},
-                    status=500,
-                )
-            return HttpResponseRedirect(
-                reverse(redirect_url, kwargs={"card_id": card_id})
-                + f"?contact_request_id={contact_request.id}"
+            advance_contact_request(
+                contact_request=contact_request,
+                data=form.cleaned_data,
+                ceremeo_data=ceremeo_data,
+                step=4,
+            )
+            response = redirect_to_contact_request_step(
+                "finish_meme", card_id, contact_request.id
+            )
+            return set_funnel_state(
+                request, response, card_id, contact_request.id, step=4
             )
         return render(request, "form_validation_error.html", {"form": form}, status=400)
 
 
 class CompletedContactRequestView(View):
     def get(self, request: HttpRequest, card_id: uuid.UUID) -> HttpResponseRedirect:
-        contact_request_id = request.GET.get("contact_request_id")
-        if contact_request_id is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        contact_request = get_contact_request(contact_id=contact_request_id)
-        if contact_request is None:
-            return HttpResponseRedirect(
-                reverse("upload_phone_num", kwargs={"card_id": card_id})
-            )
-
-        redirect_url = redirect_based_on_request_contact_state(contact_request)
+        contact_request_id, redirect = get_contact_request_id_for_step(
+            request=request, card_id=card_id, step_url="finish_meme"
+        )
+        if redirect is not None:
+            return redirect
 
-        if redirect_url != "finish_meme":
-            if redirect_url == "upload_phone_num":
-                return HttpResponseRedirect(
-                    reverse(redirect_url, kwargs={"card_id": card_id})
-                )
-            return HttpResponseRedirect(
-                reverse(redirect_url, kwargs={"card_id": card_id})
-                + f"?contact_request_id={contact_request.id}"
-            )
-        contact_request.delete()
-        business_card = get_object_or_404(BusinessCard, id=card_id)
+        delete_contact_request(contact_id=contact_request_id)
+        card_projection = get_card_projection(card_id=card_id)
         random_meme = get_random_meme()
 
-        return render(
+        response = render(
             request,
             "finish_meme.html",
             {
                 "card_id": card_id,
                 "contact_request_id": contact_request_id,
                 "random_meme": random_meme,
-                "lead_photo": business_card.user_photo,
+                **card_projection,
             },
         )
+        return clear_funnel_state(response, card_id)
+
+
+def is_metrics_client(request: HttpRequest) -> bool:
+    if settings.CARDS_METRICS_TOKEN:
+        authorization = request.headers.get("Authorization", "")
+        if constant_time_compare(
+            authorization, f"Bearer {settings.CARDS_METRICS_TOKEN}"
+        ):
+            return True
+    return request.META.get("REMOTE_ADDR") in settings.CARDS_METRICS_ALLOWED_IPS
+
+
+class MetricsView(View):
+    def get(self, request: HttpRequest) -> HttpResponse:
+        if not is_metrics_client(request):
+            raise Http404
+        return HttpResponse(
+            render_metrics(card_projection_stats=get_card_projection_stats()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )